@@ -33,18 +33,29 @@ The statistics functions are divided up into separate modules:
     ==================  =============================================
     stats               Basic calculator statistics.
     stats.co            Coroutine versions of selected functions.
+    stats.group         Statistics of groups of records in one pass.
+    stats.instrument    Opt-in timing of calls, for profiling.
     stats.multivar      Multivariate (multiple variable) statistics.
     stats.order         Order statistics.
+    stats.resample      Bootstrap and jackknife resampling.
+    stats.sample        Samples which cache statistics of their data.
     stats.univar        Univariate (single variable) statistics.
     stats.vectorize     Utilities for vectorizing functions.
 
-For further details, see the individual modules.
+For further details, see the individual modules. Sub-modules are loaded
+the first time they are used, so ``import stats`` is enough to use any of
+them:
+
+>>> import stats
+>>> stats.order.median([3, 1, 2])
+2
 
 
-The ``stats`` module provides nine statistics functions:
+The ``stats`` module provides eleven statistics functions:
 
     Function        Description
     ==============  =============================================
+    argminmax       Positions of the minimum and maximum.
     mean*           Arithmetic mean (average) of data.
     minmax          Minimum and maximum of the arguments.
     product*        Product of data.
@@ -58,13 +69,14 @@ The ``stats`` module provides nine statistics functions:
 
 Functions marked with * can operate on columnar data (see below).
 
-The module also includes two public utility functions plus an exception
-class used for some statistical errors:
+The module also includes three public utilities plus an exception class
+used for some statistical errors:
 
     Name            Description
     ==============  =============================================
     add_partial     Utility for performing high-precision sums.
     coroutine       Utility for initialising coroutines.
+    dropna          Wrapper skipping and counting missing values.
     StatsError      Subclass of ValueError.
 
 
@@ -95,6 +107,17 @@ marked with * can operate on data in columns:
 >>> stats.variance(data)  #doctest: +ELLIPSIS
 [1.0, 0.0, 1.0, 9.333333333333...]
 
+Data which is already stored by column (column-major) can be given either
+as a list of columns wrapped in ``stats.vectorize.Columns``, or as a mapping
+of column names to columns wrapped in ``stats.vectorize.NamedColumns``.
+Each column is processed separately without transposing the data:
+
+>>> stats.sum(stats.vectorize.Columns([[0, 1, 2], [1, 1, 1]]))
+[3, 3]
+>>> columns = stats.vectorize.NamedColumns(a=[0, 1, 2], b=[1, 1, 1])
+>>> stats.sum(columns) == {'a': 3, 'b': 3}
+True
+
 For further details, see the individual functions.
 
 """
@@ -106,13 +129,13 @@ __author__ = "Steven D'Aprano"
 __author_email__ = "steve+python@pearwood.info"
 
 
-__all__ = [ 'add_partial', 'coroutine', 'mean', 'minmax', 'product',
-            'pstdev', 'pvariance', 'running_sum', 'StatsError', 'stdev',
-            'sum', 'variance',
+__all__ = [ 'add_partial', 'argminmax', 'coroutine', 'dropna', 'mean',
+            'minmax', 'product', 'pstdev', 'pvariance', 'running_sum',
+            'StatsError', 'stdev', 'sum', 'variance',
           ]
 
 
-import collections
+import array
 import functools
 import itertools
 import math
@@ -120,9 +143,30 @@ import operator
 
 from builtins import sum as _sum
 
+try:
+    from collections.abc import Sequence
+except ImportError:  # Python 3.2 and older.
+    from collections import Sequence
+
 import stats.vectorize as v
 
 
+# Sub-modules which are imported on first attribute access, rather than
+# when stats itself is imported.
+_SUBMODULES = frozenset(['co', 'group', 'instrument', 'multivar', 'order',
+                         'resample', 'sample', 'univar', 'utils'])
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        import importlib
+        return importlib.import_module('stats.' + name)
+    raise AttributeError("module 'stats' has no attribute %r" % name)
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
+
+
 
 # === Exceptions ===
 
@@ -208,6 +252,96 @@ class _countiter:
         return self
 
 
+def _is_missing(x):
+    """Return True if x is a missing value: None, a NAN, or a row (tuple
+    or list) containing a missing value.
+
+    >>> _is_missing(float('nan')), _is_missing(None), _is_missing(0.0)
+    (True, True, False)
+    >>> _is_missing((1.0, None))
+    True
+
+    """
+    if x is None:
+        return True
+    if isinstance(x, (tuple, list)):
+        return any(map(_is_missing, x))
+    # Only NANs are unequal to themselves.
+    return x != x
+
+
+class dropna:
+    """dropna(iterable) -> iterable of the values which aren't missing
+
+    Wrap data containing missing values, None or NANs, so that they are
+    skipped by the statistics functions, and count how many were skipped:
+
+    >>> data = dropna([2.0, None, 4.5, float('nan'), 1.0])
+    >>> mean(data)
+    2.5
+    >>> data.skipped
+    2
+
+    Items which are rows, such as (x, y) pairs, are skipped if any of their
+    values are missing, so that multivariate statistics use the complete
+    rows only (pairwise-complete data).
+
+    The values are filtered as they are read, without making a copy of the
+    data. If the data is a sequence, each pass over the wrapper is a pass
+    over the data, so functions which need two passes (e.g. ``variance``)
+    don't need to copy it either. ``skipped`` counts the missing values
+    seen by the most recent pass.
+
+    The functions with a ``skipna`` argument, such as ``mean`` and
+    ``minmax``, wrap their data in ``dropna`` when ``skipna`` is true.
+    """
+
+    def __init__(self, iterable):
+        if isinstance(iterable, dropna):
+            iterable = iterable.data
+        self.data = iterable
+        self.skipped = 0
+
+    def __repr__(self):
+        return '<%s of %r>' % (type(self).__name__, self.data)
+
+    def __iter__(self):
+        if iter(self.data) is not self.data:
+            # A fresh pass over the data, so start counting again.
+            self.skipped = 0
+        return itertools.filterfalse(self._skip, self.data)
+
+    def _skip(self, x):
+        if _is_missing(x):
+            self.skipped += 1
+            return True
+        return False
+
+    def reiterable(self):
+        """Return True if the data can be read more than once."""
+        return iter(self.data) is not self.data
+
+
+def _blocks(iterable, size=4096):
+    """Return an iterator over lists of up to size items of iterable.
+
+    >>> list(_blocks(iter('abcde'), 2))
+    [['a', 'b'], ['c', 'd'], ['e']]
+
+    """
+    it = iter(iterable)
+    return iter(lambda: list(itertools.islice(it, size)), [])
+
+
+def _numpy():
+    """Return the numpy module if it is available, otherwise None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
 def _is_numeric(obj):
     """Return True if obj is a number, otherwise False.
 
@@ -291,7 +425,15 @@ class _Adder:
         return type(self)(partials)
 
     def value(self):
-        return _sum(self.partials)
+        partials = self.partials
+        if all(type(x) is float for x in partials):
+            # Round the exact sum correctly, so that the result agrees with
+            # math.fsum of the same values (used for arrays).
+            try:
+                return math.fsum(partials)
+            except OverflowError:
+                pass
+        return _sum(partials)
 
 
 _add = functools.partial(v.apply_op, _Adder.add)
@@ -309,9 +451,41 @@ def _len_sum(iterable, func=None):
     items of data. If func is None (the default)), use just the sum of items
     of data.
     """
-    # Special case for speed.
-    if isinstance(iterable, list):
+    # Special cases for speed.
+    if isinstance(iterable, dropna) and isinstance(iterable.data, array.array):
+        data = iterable.data
+        if data.typecode not in 'fd':
+            # Arrays of ints can't hold missing values.
+            iterable.skipped = 0
+            iterable = data
+        elif func is None:
+            # The only missing values an array can hold are NANs, which
+            # are the only values unequal to themselves, so they can be
+            # skipped and counted in C.
+            present = functools.partial(map, operator.eq, data, data)
+            n = _sum(present())
+            try:
+                total = math.fsum(itertools.compress(data, present()))
+            except (ValueError, OverflowError):
+                pass
+            else:
+                iterable.skipped = len(data) - n
+                return (n, total)
+    if func is None and isinstance(iterable, array.array):
+        # Arrays can only hold plain ints or floats.
+        if iterable.typecode not in 'fd':
+            return (len(iterable), _sum(iterable))
+        try:
+            return (len(iterable), math.fsum(iterable))
+        except (ValueError, OverflowError):
+            # Infinities of opposite sign or intermediate overflow; fall
+            # back on the general case to handle them.
+            pass
+    if isinstance(iterable, (list, array.array)):
         n = len(iterable)
+    elif isinstance(iterable, dropna) and isinstance(iterable.data, list):
+        # Counted after the pass, from the number of items skipped.
+        n = None
     else:
         n = None
         iterable = _countiter(iterable)
@@ -320,7 +494,10 @@ def _len_sum(iterable, func=None):
     else:
         total = _fsum(func(x) for x in iterable)
     if n is None:
-        n = iterable.count
+        if isinstance(iterable, dropna):
+            n = len(iterable.data) - iterable.skipped
+        else:
+            n = iterable.count
     if isinstance(total, list):
         total = [t.value() for t in total]
     else:
@@ -328,12 +505,77 @@ def _len_sum(iterable, func=None):
     return (n, total)
 
 
+_INF = float('inf')
+
+def _frexp(x):
+    # math.frexp, extended to ints too large to convert to float.
+    try:
+        return math.frexp(x)
+    except OverflowError:
+        if not isinstance(x, int):
+            raise
+        e = x.bit_length()
+        return (x/(1 << e), e)
+
+
+def _scaled_product(blocks, signed=True):
+    """Return (n, m, e) where the product of the n numbers in blocks (an
+    iterable of lists of at most 1000 numbers) is m*2**e.
+
+    >>> _scaled_product([[1e200, 1e200, 1e-300]])
+    (3, 0.5714936956411375, 333)
+
+    The mantissa m and exponent e are tracked separately, so that long
+    products neither overflow nor underflow. Apart from that, m is rounded
+    exactly as the plain product of floats would be, since scaling by a
+    power of two is exact. If signed is false, m is a NAN if any of the
+    numbers are negative.
+    """
+    n, m, e = 0, 1.0, 0
+    mul, frexp = operator.mul, math.frexp
+    mantissa, exponent = operator.itemgetter(0), operator.itemgetter(1)
+    for block in blocks:
+        size = len(block)
+        n += size
+        if not block:
+            continue
+        lo, hi = min(block), max(block)
+        if 0 < lo and hi < _INF:
+            # The product of runs of positive numbers between 2**-b and
+            # 2**b, where b*run <= 1000, can't overflow or underflow, so
+            # they can be multiplied directly, renormalising after each.
+            bits = max(math.log2(hi), -math.log2(lo), 1.0)
+            run = int(1000/bits)
+            if run >= 16:
+                for i in range(0, size, run):
+                    chunk = block if run >= size else block[i:i+run]
+                    m, k = frexp(functools.reduce(mul, chunk, m))
+                    e += k
+                continue
+        try:
+            pairs = list(map(frexp, block))
+        except OverflowError:
+            pairs = list(map(_frexp, block))
+        if not signed and min(map(mantissa, pairs)) < 0:
+            m = float('nan')
+        # Every mantissa is at least 0.5 in magnitude, so the product of a
+        # block of them can't underflow.
+        m = functools.reduce(mul, map(mantissa, pairs), m)
+        e += _sum(map(exponent, pairs))
+        m, k = frexp(m)
+        e += k
+    return (n, m, e)
+
+
 def _std_moment(data, m, s, r):
     """Return the length and standardised moment of order r = 1...4."""
     assert r in (1, 2, 3, 4), "private function not intended for r != 1...4"
     if m is None or s is None:
         # We need multiple passes over the data, so make sure we can.
-        if not isinstance(data, list):
+        # Sequences with missing values are filtered on each pass, rather
+        # than copied.
+        if not (isinstance(data, (list, array.array)) or
+                isinstance(data, dropna) and data.reiterable()):
             data = list(data)
         if m is None: m = mean(data)
         if s is None: s = pstdev(data, m)
@@ -352,7 +594,18 @@ def _std_moment(data, m, s, r):
     else:
         args = (m, s, r)
         f = lambda x, m, s, r: ((x-m)/s)**r
-    n, total = _len_sum(v.apply(f, x, *args) for x in data)
+    base = data.data if isinstance(data, dropna) else data
+    if isinstance(base, array.array) and all(
+            type(a) in (int, float) for a in args):
+        # Special case for speed: an array of numbers and numeric arguments
+        # can only give floats, which can be summed quickly.
+        n, total = _len_sum(array.array('d', [f(x, *args) for x in data]))
+    elif (isinstance(base, list) and base and base[0] is not None
+            and not v.isiterable(base[0])):
+        # A single column of data doesn't need vectorized function calls.
+        n, total = _len_sum([f(x, *args) for x in data])
+    else:
+        n, total = _len_sum(v.apply(f, x, *args) for x in data)
     return (n, total)
     # FIXME the above may not be accurate enough for 2nd moments (x-m)**2
     # A more accurate algorithm is the compensated version:
@@ -363,7 +616,8 @@ def _std_moment(data, m, s, r):
 
 # === Sums and products ===
 
-def sum(data, start=0):
+@v.columnar
+def sum(data, start=0, *, skipna=False):
     """sum(iterable_of_numbers [, start]) -> sum of numbers
     sum(iterable_of_rows [, start]) -> sums of columns
 
@@ -401,9 +655,18 @@ def sum(data, start=0):
     >>> sum([1, 1e100, 1, -1e100] * 10000)  # The built-in sum returns zero.
     20000.0
 
+    If keyword-only argument ``skipna`` is true, missing values (None and
+    NANs) are skipped, as are rows with missing values:
+
+    >>> sum([1.5, None, 2.0, float('nan')], skipna=True)
+    3.5
+
+    To count the values skipped, wrap the data in ``dropna`` instead.
     """
     if isinstance(data, str):
         raise TypeError('data argument cannot be a string')
+    if skipna:
+        data = dropna(data)
     # Calculate the length and sum of data.
     count, total = _len_sum(data)
     if not count:
@@ -518,15 +781,35 @@ def product(data, start=1):
     """
     if isinstance(data, str):
         raise TypeError('data argument cannot be a string')
+    blocks = _blocks(data, 1000)
+    first = next(blocks, [])
+    types = set(map(type, first))
+    if float in types and types <= {float, int}:
+        # Floats are multiplied with the mantissas and exponents kept
+        # apart, so that the product doesn't overflow or underflow before
+        # the end. Ints alone are multiplied exactly, below.
+        n, m, e = _scaled_product(itertools.chain([first], blocks))
+        if type(start) in (float, int):
+            fm, fe = _frexp(start)
+            m, e = m*fm, e + fe
+            start = 1
+        try:
+            total = math.ldexp(m, e)
+        except OverflowError:
+            total = math.copysign(float('inf'), m)
+        return v.mul(start, total)
+    data = itertools.chain(first, itertools.chain.from_iterable(blocks))
     return v.prod(data, start)
     # Note: do *not* be tempted to do something clever with logarithms:
     #   math.exp(sum([math.log(x) for x in data], start))
-    # is FAR less accurate than naive multiplication.
+    # is FAR less accurate than naive multiplication, which is what the
+    # scaled product does.
 
 
 # === Basic univariate statistics ===
 
-def mean(data):
+@v.columnar
+def mean(data, *, skipna=False):
     """mean(iterable_of_numbers) -> arithmetic mean of numbers
     mean(iterable_of_rows) -> arithmetic means of columns
 
@@ -558,14 +841,20 @@ def mean(data):
     However, the mean is strongly effected by outliers and is not a robust
     estimator for central location: the mean is not necessarily a typical
     example of the data points.
+
+    If keyword-only argument ``skipna`` is true, missing values (None and
+    NANs) are skipped, as for ``sum``.
     """
+    if skipna:
+        data = dropna(data)
     count, total = _len_sum(data)
     if not count:
         raise StatsError('mean of empty sequence is not defined')
     return v.div(total, count)
 
 
-def variance(data, m=None):
+@v.columnar
+def variance(data, m=None, *, skipna=False):
     """variance(iterable_of_numbers [, m]) -> sample variance of numbers
     variance(iterable_of_rows [, m]) -> sample variance of columns
 
@@ -617,12 +906,20 @@ def variance(data, m=None):
     If ``m`` is given for such columnar data, it must be either a single
     number, or a sequence with the same number of columns as the data.
 
+    If keyword-only argument ``skipna`` is true, missing values (None and
+    NANs) are skipped, as for ``sum``. Sequences are read twice rather than
+    copied without the missing values:
+
+    >>> variance([1.0, None, 2.0, float('nan'), 4.0, 5.0], skipna=True)
+    3.3333333333333335
+
     See also ``pvariance``.
     """
-    return _variance(data, m, 1)
+    return _variance(data, m, 1, skipna)
 
 
-def stdev(data, m=None):
+@v.columnar
+def stdev(data, m=None, *, skipna=False):
     """stdev(iterable_of_numbers [, m]) -> standard deviation of numbers
     stdev(iterable_of_rows [, m]) -> standard deviation of columns
 
@@ -630,7 +927,8 @@ def stdev(data, m=None):
     of the given numbers or columns. The standard deviation is the square
     root of the variance.
 
-    Optional argument ``m`` has the same meaning as for ``variance``.
+    Optional arguments ``m`` and ``skipna`` have the same meaning as for
+    ``variance``.
 
     >>> stdev([1.5, 2.5, 2.5, 2.75, 3.25, 4.75])  #doctest: +ELLIPSIS
     1.08108741552...
@@ -646,11 +944,12 @@ def stdev(data, m=None):
     Note that although ``variance`` is an unbiased estimate for the
     population variance, ``stdev`` itself is *not* unbiased.
     """
-    svar = variance(data, m)
+    svar = variance(data, m, skipna=skipna)
     return v.sqrt(svar)
 
 
-def pvariance(data, m=None):
+@v.columnar
+def pvariance(data, m=None, *, skipna=False):
     """pvariance(iterable_of_numbers [, m]) -> population variance of numbers
     pvariance(iterable_of_rows [, m]) -> population variance of columns
 
@@ -690,11 +989,14 @@ def pvariance(data, m=None):
     optional second argument ``m``. For columnar data, ``m`` must be either
     a single number, or it must contain the same number of columns as the
     data.
+
+    Keyword-only argument ``skipna`` is as for ``variance``.
     """
-    return _variance(data, m, 0)
+    return _variance(data, m, 0, skipna)
 
 
-def pstdev(data, m=None):
+@v.columnar
+def pstdev(data, m=None, *, skipna=False):
     """pstdev(iterable_of_numbers [, m]) -> population std dev of numbers
     pstdev(iterable_of_rows [, m]) -> population std dev of columns
 
@@ -702,7 +1004,8 @@ def pstdev(data, m=None):
     of the given numbers or columns. The standard deviation is the square
     root of the variance.
 
-    Optional argument ``m`` has the same meaning as for ``pvariance``.
+    Optional arguments ``m`` and ``skipna`` have the same meaning as for
+    ``pvariance``.
 
     >>> pstdev([1.5, 2.5, 2.5, 2.75, 3.25, 4.75])  #doctest: +ELLIPSIS
     0.986893273527...
@@ -716,13 +1019,21 @@ def pstdev(data, m=None):
     [0.707106781186..., 1.22474487139..., 1.58113883008...]
 
     """
-    pvar = pvariance(data, m)
+    pvar = pvariance(data, m, skipna=skipna)
     return v.sqrt(pvar)
 
 
-def _variance(data, m, p):
+def _variance(data, m, p, skipna=False):
     """Return an estimate of variance with N-p degrees of freedom."""
+    if skipna:
+        data = dropna(data)
     n, ss = _std_moment(data, m, 1, 2)
+    return _variance_from(n, ss, p)
+
+
+def _variance_from(n, ss, p):
+    """Return the variance with N-p degrees of freedom from the length and
+    sum of squared deviations of the data."""
     assert n >= 0
     if n <= p:
         raise StatsError(
@@ -733,8 +1044,8 @@ def _variance(data, m, p):
 
 
 def minmax(*values, **kw):
-    """minmax(iterable [, key=func]) -> (minimum, maximum)
-    minmax(a, b, c, ... [, key=func]) -> (minimum, maximum)
+    """minmax(iterable [, key=func, skipna=False]) -> (minimum, maximum)
+    minmax(a, b, c, ... [, key=func, skipna=False]) -> (minimum, maximum)
 
     With a single iterable argument, return a two-tuple of its smallest and
     largest items. With two or more arguments, return the smallest and
@@ -752,14 +1063,23 @@ def minmax(*values, **kw):
     >>> minmax('aaa', 'bbbb', 'c', 'dd', key=len)
     ('c', 'bbbb')
 
+    If the keyword-only argument ``skipna`` is true, missing values (None
+    and NANs) are skipped:
+
+    >>> minmax([2.5, None, -1.0, float('nan'), 4.0], skipna=True)
+    (-1.0, 4.0)
+
     """
     if len(values) == 0:
         raise TypeError('minmax expected at least one argument, but got none')
     elif len(values) == 1:
         values = values[0]
+    if kw.pop('skipna', False):
+        values = dropna(values)
     if list(kw.keys()) not in ([], ['key']):
         raise TypeError('minmax received an unexpected keyword argument')
-    if isinstance(values, collections.Sequence):
+    if isinstance(values, Sequence) or (
+            isinstance(values, dropna) and values.reiterable()):
         # For speed, fall back on built-in min and max functions when
         # data is a sequence and can be safely iterated over twice.
         # TODO this could be unnecessary if this were re-written in C.
@@ -768,48 +1088,92 @@ def minmax(*values, **kw):
         # The number of comparisons is N-1 for both min() and max(), so the
         # total used here is 2N-2, but performed in fast C.
     else:
-        # Iterator argument, so fall back on a slow pure-Python solution
-        # that calculates the min and max lazily. Even if values is huge,
-        # this should work.
-        # Note that the number of comparisons is 3*ceil(N/2), which is
-        # approximately 50% fewer than used by separate calls to min & max.
+        # Iterator argument. Read it a block at a time, and find the
+        # smallest and largest items of each block with the built-in min
+        # and max, so that the per-item work runs in C.
         key = kw.get('key')
-        if key is not None:
-            it = ((key(value), value) for value in values)
-        else:
-            it = ((value, value) for value in values)
-        try:
-            keyed_min, minimum = next(it)
-        except StopIteration:
-            # Don't directly raise an exception inside the except block,
-            # as that exposes the StopIteration to the caller. That's an
-            # implementation detail that should be avoided. See PEP 3134
-            # http://www.python.org/dev/peps/pep-3134/
-            # and specifically the open issue "Suppressing context".
-            empty = True
-        else:
-            empty = False
-        if empty:
+        blocks = _blocks(values)
+        block = next(blocks, None)
+        if block is None:
             raise ValueError('minmax argument is empty')
-        keyed_max, maximum = keyed_min, minimum
-        try:
-            while True:
-                a = next(it)
-                try:
-                    b = next(it)
-                except StopIteration:
-                    b = a
-                if a[0] > b[0]:
-                    a, b = b, a
-                if a[0] < keyed_min:
-                    keyed_min, minimum = a
-                if b[0] > keyed_max:
-                    keyed_max, maximum = b
-        except StopIteration:
-            pass
+        minimum = min(block, **kw)
+        maximum = max(block, **kw)
+        if key is None:
+            keyed_min, keyed_max = minimum, maximum
+        else:
+            keyed_min, keyed_max = key(minimum), key(maximum)
+        for block in blocks:
+            a = min(block, **kw)
+            b = max(block, **kw)
+            if key is None:
+                keyed_a, keyed_b = a, b
+            else:
+                keyed_a, keyed_b = key(a), key(b)
+            # Strict comparisons keep the first of equal items, like the
+            # built-ins do.
+            if keyed_a < keyed_min:
+                keyed_min, minimum = keyed_a, a
+            if keyed_b > keyed_max:
+                keyed_max, maximum = keyed_b, b
     return (minimum, maximum)
 
 
+def argminmax(*values, **kw):
+    """argminmax(iterable [, key=func]) -> (index of minimum, index of maximum)
+    argminmax(a, b, c, ... [, key=func]) -> (index of minimum, index of maximum)
+
+    Return a two-tuple of the positions of the smallest and largest items,
+    where ``minmax`` returns the items themselves. If there are several
+    equal smallest or largest items, the first is used.
+
+    >>> argminmax([3, 2, 1, 6, 5, 4])
+    (2, 3)
+    >>> argminmax('aaa', 'bbbb', 'c', 'dd', key=len)
+    (2, 1)
+
+    As for ``minmax``, the data is read in a single pass, so it can be an
+    iterator, but the comparisons are done by the built-in ``min`` and
+    ``max``.
+    """
+    if len(values) == 0:
+        raise TypeError(
+            'argminmax expected at least one argument, but got none')
+    elif len(values) == 1:
+        values = values[0]
+    if list(kw.keys()) not in ([], ['key']):
+        raise TypeError('argminmax received an unexpected keyword argument')
+    key = kw.get('key')
+    if isinstance(values, Sequence):
+        blocks = [values]
+    else:
+        blocks = _blocks(values)
+    result = None
+    offset = 0
+    for block in blocks:
+        if not block:
+            continue
+        # Compare the indices of the block by its items, in C if possible.
+        if key is None:
+            keyof = block.__getitem__
+        else:
+            keyof = lambda i, get=block.__getitem__: key(get(i))
+        indices = range(len(block))
+        i = min(indices, key=keyof)
+        j = max(indices, key=keyof)
+        keyed_i, keyed_j = keyof(i), keyof(j)
+        if result is None:
+            result = [offset + i, keyed_i, offset + j, keyed_j]
+        else:
+            if keyed_i < result[1]:
+                result[:2] = offset + i, keyed_i
+            if keyed_j > result[3]:
+                result[2:] = offset + j, keyed_j
+        offset += len(block)
+    if result is None:
+        raise ValueError('argminmax argument is empty')
+    return (result[0], result[2])
+
+
 
 
 def average_deviation(data, m=None):
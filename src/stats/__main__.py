@@ -8,6 +8,7 @@ Run the stats package as if it were an executable module.
 
 Usage:
     $ python3 -m stats [options]
+    $ python3 -m stats COMMAND [options] FILE [FILE ...]
 
 Options:
     -h  --help      Print this help text.
@@ -28,6 +29,24 @@ To suppress output if all tests pass, pass the quiet flag:
 
     $ python3 -m stats -q
 
+The commands ``describe``, ``quantiles`` and ``corr`` summarise columns of
+numeric data read from CSV, TSV, text or raw float64 files:
+
+    $ python3 -m stats describe data.csv
+    $ python3 -m stats quantiles -p 0.1,0.5,0.9 --json data.csv
+
+The command ``bench`` times the package's public functions, and can save
+the results as JSON for comparison between versions:
+
+    $ python3 -m stats bench --quick -o results.json
+
+and ``compare`` reports any significant differences between two such
+files, exiting with status 1 if there are regressions:
+
+    $ python3 -m stats compare old.json results.json
+
+Run ``python3 -m stats COMMAND --help`` for details of each command.
+
 """
 import sys
 
@@ -51,10 +70,12 @@ def process_options():
 def self_test(verbose, quiet):
     assert not (verbose and quiet)
     import doctest
-    import stats, stats.co, stats.multivar, stats.order, \
-           stats.univar, stats.utils, stats.vectorize
-    modules = (stats, stats.co, stats.multivar, stats.order,
-               stats.univar, stats.utils, stats.vectorize,
+    import stats, stats.co, stats.group, stats.instrument, stats.multivar, \
+           stats.order, stats.resample, stats.sample, stats.univar, \
+           stats.utils, stats.vectorize
+    modules = (stats, stats.co, stats.group, stats.instrument, stats.multivar,
+               stats.order, stats.resample, stats.sample, stats.univar,
+               stats.utils, stats.vectorize,
                )
     failed = tried = 0
     for module in modules:
@@ -68,6 +89,9 @@ def self_test(verbose, quiet):
 
 
 if __name__ == '__main__' and __package__ is not None:
+    if sys.argv[1:2] and not sys.argv[1].startswith('-'):
+        from stats import _cli
+        sys.exit(_cli.main(sys.argv[1:]))
     verbose, quiet = process_options()
     sys.exit(self_test(verbose, quiet))
 
@@ -0,0 +1,667 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file __init__.py for the licence terms for this software.
+
+"""
+Performance benchmarks for the stats package, for ``python3 -m stats bench``.
+
+Every public function in ``stats``, ``stats.co``, ``stats.order``,
+``stats.univar`` and ``stats.multivar`` is timed over a range of data sizes
+and input kinds:
+
+    Input       Description
+    ==========  =============================================
+    list        list of floats
+    iterator    iterator over a list of floats
+    tuple       tuple of floats
+    array       array.array('d') of floats
+    decimal     list of Decimals
+    fraction    list of Fractions
+
+Functions which operate on columns of data are also timed in columnar mode,
+with rows of four columns, and in column-major mode (see
+``stats.vectorize.Columns``).
+
+The data is generated from a seeded random number generator, so it is the
+same on every run. Each benchmark is warmed up, then timed as a number of
+samples, each of which is the mean time per call over enough calls to last
+at least ``min_time`` seconds. The samples are written to a JSON file so
+that runs on different versions can be compared with
+``python3 -m stats compare``, which reports the ratio of the times with a
+bootstrap confidence interval and flags significant regressions.
+"""
+
+import array
+import collections
+import datetime
+import decimal
+import fractions
+import gc
+import itertools
+import json
+import math
+import platform
+import random
+import re
+import sys
+import time
+
+import stats
+import stats.co
+import stats.multivar
+import stats.order
+import stats.univar
+import stats.vectorize
+
+
+SIZES = (10, 100, 1000, 10**4, 10**5)
+INPUTS = ('list', 'iterator', 'tuple', 'array', 'decimal', 'fraction')
+MODES = ('scalar', 'rows', 'columns')
+# Decimal and Fraction arithmetic is slow, so they are only timed up to
+# this size by default.
+EXACT_LIMIT = 10**4
+# Number of columns for columnar and multivariate data.
+WIDTH = 4
+
+
+# A benchmark case: the qualified function name, the calling convention,
+# and any extra arguments. The calling conventions are:
+#
+#   data        func(data, *args)
+#   discrete    func(data, *args), with many repeated values
+#   xy          func(xdata, ydata)
+#   rows        func(rows), where each row has WIDTH values
+#   regression  func(rows), where each row is (x1, x2, y)
+#   stream      list(feed(func(*args), data))
+#   pairs       list(feed(func(*args), zip(xdata, ydata)))
+#   series      list(feed(func(*args), enumerate(data))), i.e. time series
+#   partials    func(x, partials) for each x in data
+#   const       func(*args), independent of the data size
+#
+Case = collections.namedtuple('Case', 'name kind args')
+
+CASES = [
+    Case('stats.add_partial', 'partials', ()),
+    Case('stats.argminmax', 'data', ()),
+    Case('stats.mean', 'data', ()),
+    Case('stats.minmax', 'data', ()),
+    Case('stats.product', 'data', ()),
+    Case('stats.pstdev', 'data', ()),
+    Case('stats.pvariance', 'data', ()),
+    Case('stats.running_sum', 'stream', ()),
+    Case('stats.stdev', 'data', ()),
+    Case('stats.sum', 'data', ()),
+    Case('stats.variance', 'data', ()),
+    Case('stats.co.circular_summary', 'stream', ()),
+    Case('stats.co.corr', 'pairs', ()),
+    Case('stats.co.ewma', 'stream', ()),
+    Case('stats.co.linr', 'pairs', ()),
+    Case('stats.co.mean', 'stream', ()),
+    Case('stats.co.minmax', 'stream', ()),
+    Case('stats.co.pstdev', 'stream', ()),
+    Case('stats.co.pvariance', 'stream', ()),
+    Case('stats.co.reservoir', 'stream', (100,)),
+    Case('stats.co.rollup', 'series', ((10, 100),)),
+    Case('stats.co.stdev', 'stream', ()),
+    Case('stats.co.sum', 'stream', ()),
+    Case('stats.co.variance', 'stream', ()),
+    Case('stats.order.decile', 'data', (7,)),
+    Case('stats.order.fivenum', 'data', ()),
+    Case('stats.order.iqr', 'data', ()),
+    Case('stats.order.mad', 'data', ()),
+    Case('stats.order.median', 'data', ()),
+    Case('stats.order.midhinge', 'data', ()),
+    Case('stats.order.midrange', 'data', ()),
+    Case('stats.order.minmax', 'data', ()),
+    Case('stats.order.percentile', 'data', (90,)),
+    Case('stats.order.qn', 'data', ()),
+    Case('stats.order.quantile', 'data', (0.9,)),
+    Case('stats.order.quartile_skewness', 'const', (1.0, 2.5, 3.5)),
+    Case('stats.order.quartiles', 'data', ()),
+    Case('stats.order.range', 'data', ()),
+    Case('stats.order.sn', 'data', ()),
+    Case('stats.order.trimean', 'data', ()),
+    Case('stats.univar.average_deviation', 'data', ()),
+    Case('stats.univar.circular_mean', 'data', ()),
+    Case('stats.univar.circular_summary', 'data', ()),
+    Case('stats.univar.geometric_mean', 'data', ()),
+    Case('stats.univar.harmonic_mean', 'data', ()),
+    Case('stats.univar.kurtosis', 'data', ()),
+    Case('stats.univar.mode', 'discrete', ()),
+    Case('stats.univar.moving_average', 'stream', ()),
+    Case('stats.univar.pearson_skewness', 'const', (2.5, 2.0, 1.5)),
+    Case('stats.univar.quadratic_mean', 'data', ()),
+    Case('stats.univar.skewness', 'data', ()),
+    Case('stats.univar.sterrkurtosis', 'const', (1000,)),
+    Case('stats.univar.sterrmean', 'const', (2.5, 1000)),
+    Case('stats.univar.sterrskewness', 'const', (1000,)),
+    Case('stats.univar.trimmed_mean', 'data', (0.1,)),
+    Case('stats.univar.winsorized_mean', 'data', (0.1,)),
+    Case('stats.univar.winsorized_variance', 'data', (0.1,)),
+    Case('stats.multivar.qcorr', 'xy', ()),
+    Case('stats.multivar.corr', 'xy', ()),
+    Case('stats.multivar.pcov', 'xy', ()),
+    Case('stats.multivar.cov', 'xy', ()),
+    Case('stats.multivar.errsumsq', 'xy', ()),
+    Case('stats.multivar.linr', 'xy', ()),
+    Case('stats.multivar.CoMoments', 'rows', ()),
+    Case('stats.multivar.corr_matrix', 'rows', ()),
+    Case('stats.multivar.cov_matrix', 'rows', ()),
+    Case('stats.multivar.pcov_matrix', 'rows', ()),
+    Case('stats.multivar.Regression', 'regression', ()),
+    Case('stats.multivar.mlinr', 'regression', ()),
+    Case('stats.multivar.kendall', 'xy', ()),
+    Case('stats.multivar.spearman', 'xy', ()),
+    ]
+
+# Public names which are not benchmarked, because they don't calculate
+# anything: decorators, exceptions and helpers.
+NOT_TIMED = frozenset(['stats.coroutine', 'stats.dropna', 'stats.StatsError',
+                       'stats.co.Bucket', 'stats.co.feed',
+                       'stats.co.Reservoir',
+                       'stats.univar.CircularSummary'])
+
+# Functions which also operate on columns of data.
+COLUMNAR = frozenset([
+    'stats.mean', 'stats.pstdev', 'stats.pvariance', 'stats.stdev',
+    'stats.sum', 'stats.variance', 'stats.univar.average_deviation',
+    'stats.univar.geometric_mean', 'stats.univar.harmonic_mean',
+    'stats.univar.kurtosis', 'stats.univar.quadratic_mean',
+    'stats.univar.skewness', 'stats.univar.trimmed_mean',
+    'stats.univar.winsorized_mean', 'stats.univar.winsorized_variance',
+    ])
+
+
+def resolve(name):
+    """Return the object with the qualified name given."""
+    module, attr = name.rsplit('.', 1)
+    return getattr(sys.modules[module], attr)
+
+
+# === Data ===
+
+def make_values(n, seed, kind='data'):
+    """Return a list of n random floats, the same for every run."""
+    rng = random.Random('%s-%d-%s' % (seed, n, kind))
+    if kind == 'discrete':
+        # Values 0...6 in equal numbers, except for an extra zero, so that
+        # the mode is always unique.
+        values = [float(i % 7) for i in range(n - 1)] + [0.0]
+        rng.shuffle(values)
+        return values
+    # Positive values suit every function, including geometric_mean.
+    return [rng.lognormvariate(1.0, 0.75) for _ in range(n)]
+
+
+def convert(values, kind):
+    """Return the list of floats values converted to the input kind."""
+    if kind in ('list', 'iterator'):
+        return values
+    if kind == 'tuple':
+        return tuple(values)
+    if kind == 'array':
+        return array.array('d', values)
+    if kind == 'decimal':
+        return [decimal.Decimal(x) for x in values]
+    if kind == 'fraction':
+        return [fractions.Fraction(x) for x in values]
+    raise ValueError('unknown input kind %r' % kind)
+
+
+def make_call(case, n, kind, mode, seed):
+    """Return a function of no arguments which runs one benchmark call.
+
+    Returns None if the combination of case, kind and mode doesn't apply.
+    """
+    func = resolve(case.name)
+    args = case.args
+    fresh = iter if kind == 'iterator' else lambda obj: obj
+    if mode != 'scalar':
+        if case.name not in COLUMNAR:
+            return None
+        columns = [convert(make_values(n, seed, 'col%d' % i), kind)
+                   for i in range(WIDTH)]
+        if mode == 'rows':
+            rows = list(zip(*columns))
+            return lambda: func(fresh(rows), *args)
+        if kind == 'iterator':
+            return None
+        data = stats.vectorize.Columns(columns)
+        return lambda: func(data, *args)
+    if case.kind == 'const':
+        return lambda: func(*args)
+    if case.kind in ('data', 'discrete', 'stream', 'series', 'partials'):
+        data = convert(make_values(n, seed, case.kind), kind)
+        if case.kind == 'stream':
+            feed = stats.co.feed
+            return lambda: list(feed(func(*args), fresh(data)))
+        if case.kind == 'series':
+            feed = stats.co.feed
+            return lambda: list(feed(func(*args), enumerate(data)))
+        if case.kind == 'partials':
+            def call():
+                partials = []
+                for x in fresh(data):
+                    func(x, partials)
+            return call
+        return lambda: func(fresh(data), *args)
+    if case.kind in ('xy', 'pairs'):
+        xdata = convert(make_values(n, seed, 'x'), kind)
+        ydata = convert(make_values(n, seed, 'y'), kind)
+        if case.kind == 'pairs':
+            feed = stats.co.feed
+            return lambda: list(feed(func(*args), zip(xdata, ydata)))
+        return lambda: func(fresh(xdata), fresh(ydata))
+    width = WIDTH if case.kind == 'rows' else 3
+    columns = [convert(make_values(n, seed, 'col%d' % i), kind)
+               for i in range(width)]
+    rows = list(zip(*columns))
+    if case.name == 'stats.multivar.Regression':
+        return lambda: func().update(fresh(rows))
+    return lambda: func(fresh(rows))
+
+
+# === Timing ===
+
+def _time(call, number, timer=time.perf_counter):
+    t = timer()
+    for _ in itertools.repeat(None, number):
+        call()
+    return timer() - t
+
+
+def measure(call, repeat=5, warmup=1, min_time=0.01):
+    """Return (number, samples) for benchmark call.
+
+    After ``warmup`` untimed calls, the number of calls per sample is
+    chosen so that each sample takes at least ``min_time`` seconds. Then
+    ``repeat`` samples are taken, each the mean time per call.
+    """
+    for _ in range(warmup):
+        call()
+    number = 1
+    while True:
+        t = _time(call, number)
+        if t >= min_time:
+            break
+        # Aim a little over min_time, at most multiplying by ten.
+        number *= min(10, max(2, int(1.2*min_time/max(t, 1e-9))))
+    samples = [t/number]
+    gcold = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat - 1):
+            samples.append(_time(call, number)/number)
+    finally:
+        if gcold:
+            gc.enable()
+    return number, samples
+
+
+def summarise(samples):
+    """Return a dict of summary statistics of timing samples."""
+    result = {'min': min(samples), 'median': stats.order.median(samples),
+              'mean': stats.mean(samples)}
+    result['stdev'] = stats.stdev(samples) if len(samples) > 1 else 0.0
+    return result
+
+
+def run(cases=None, sizes=SIZES, inputs=INPUTS, modes=MODES, repeat=5,
+        warmup=1, min_time=0.01, seed=0, exact_limit=EXACT_LIMIT,
+        progress=None):
+    """Run the benchmarks, returning a list of result dicts.
+
+    progress, if given, is called with each result as it is made.
+    """
+    if cases is None:
+        cases = CASES
+    results = []
+    for case in cases:
+        for mode in modes:
+            for kind in inputs:
+                for n in sizes:
+                    if case.kind == 'const' and n != sizes[0]:
+                        continue
+                    if kind in ('decimal', 'fraction') and n > exact_limit:
+                        continue
+                    call = make_call(case, n, kind, mode, seed)
+                    if call is None:
+                        continue
+                    result = {'function': case.name, 'input': kind,
+                              'mode': mode, 'size': n}
+                    try:
+                        number, samples = measure(
+                            call, repeat, warmup, min_time)
+                    except Exception as err:
+                        result['error'] = '%s: %s' % (type(err).__name__, err)
+                    else:
+                        result['number'] = number
+                        result['samples'] = samples
+                        result.update(summarise(samples))
+                    del call
+                    results.append(result)
+                    if progress is not None:
+                        progress(result)
+    return results
+
+
+def metadata(**settings):
+    """Return a dict describing the benchmark environment."""
+    meta = {
+        'stats_version': stats.__version__,
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'date': datetime.datetime.now().isoformat(),
+        }
+    meta.update(settings)
+    return meta
+
+
+def select(patterns):
+    """Return the cases whose names match any of the regular expressions."""
+    if not patterns:
+        return CASES
+    regexes = [re.compile(p) for p in patterns]
+    return [c for c in CASES if any(r.search(c.name) for r in regexes)]
+
+
+def _sizes(text):
+    return tuple(int(float(s)) for s in text.split(','))
+
+
+def add_arguments(parser):
+    """Add the benchmark options to argparse parser."""
+    parser.add_argument('-o', '--output', metavar='FILE',
+                        help='write the results as JSON to FILE')
+    parser.add_argument('-k', '--functions', action='append', metavar='REGEX',
+                        help='only time functions matching REGEX '
+                             '(may be repeated)')
+    parser.add_argument('--sizes', type=_sizes, default=SIZES,
+                        help='comma-separated data sizes, up to 1e7 '
+                             '(default: %s)' % ','.join(map(str, SIZES)))
+    parser.add_argument('--inputs', type=lambda s: tuple(s.split(',')),
+                        default=INPUTS,
+                        help='comma-separated input kinds '
+                             '(default: %s)' % ','.join(INPUTS))
+    parser.add_argument('--modes', type=lambda s: tuple(s.split(',')),
+                        default=MODES,
+                        help='comma-separated modes (default: %s)'
+                             % ','.join(MODES))
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='timing samples per benchmark (default: 5)')
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='untimed calls before timing (default: 1)')
+    parser.add_argument('--min-time', type=float, default=0.01,
+                        help='minimum seconds per sample (default: 0.01)')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='random seed for the data (default: 0)')
+    parser.add_argument('--exact-limit', type=int, default=EXACT_LIMIT,
+                        help='largest size for Decimal and Fraction input '
+                             '(default: %d)' % EXACT_LIMIT)
+    parser.add_argument('--quick', action='store_true',
+                        help='small sizes and few samples, as a smoke test')
+    parser.add_argument('--imports', action='store_true',
+                        help='time importing the package instead')
+
+
+def main(args):
+    """Run the benchmarks for parsed command line args."""
+    if args.imports:
+        return import_main(args)
+    if args.quick:
+        args.sizes, args.repeat, args.min_time = (10, 1000), 3, 0.002
+    for kind in args.inputs:
+        if kind not in INPUTS:
+            raise ValueError('unknown input kind %r' % kind)
+    for mode in args.modes:
+        if mode not in MODES:
+            raise ValueError('unknown mode %r' % mode)
+    cases = select(args.functions)
+
+    def progress(result):
+        if 'error' in result:
+            timing = result['error']
+        else:
+            timing = '%.3g s' % result['median']
+        print('%-34s %-8s %-7s %9d  %s' % (
+              result['function'], result['input'], result['mode'],
+              result['size'], timing))
+        sys.stdout.flush()
+
+    settings = dict(sizes=list(args.sizes), inputs=list(args.inputs),
+                    modes=list(args.modes), repeat=args.repeat,
+                    warmup=args.warmup, min_time=args.min_time,
+                    seed=args.seed, exact_limit=args.exact_limit)
+    results = run(cases, progress=progress, **settings)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': metadata(**settings), 'results': results},
+                      f, indent=1)
+    return 0
+
+
+
+# === Import times ===
+
+# Budgets for the time spent importing the stats package's own modules, in
+# microseconds, for each entry module. The standard library isn't counted
+# since its import time depends on the platform, but the entry modules must
+# not import any of LAZY_MODULES.
+IMPORT_BUDGETS = {
+    'stats': 3000,
+    'stats.co': 4000,
+    'stats.multivar': 5000,
+    'stats.order': 5000,
+    'stats.univar': 5000,
+    'stats._cli': 6000,
+    }
+LAZY_MODULES = ('decimal', 'fractions')
+
+
+def parse_importtime(text):
+    """Parse the output of ``python -X importtime``.
+
+    Returns a list of (module, self, cumulative) tuples, with times in
+    microseconds.
+
+    >>> parse_importtime('''import time: self [us] | cumulative | imported package
+    ... import time:       120 |        120 |   math
+    ... import time:       300 |        420 | stats''')
+    [('math', 120, 120), ('stats', 300, 420)]
+
+    """
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+        except (IndexError, ValueError):
+            pass  # The header line.
+    return rows
+
+
+def import_time(module, repeat=5):
+    """Time importing module, each time in a new interpreter.
+
+    Returns a dict with the minimum over repeat runs of the total import
+    time, and of the time spent in the stats package's own modules, in
+    microseconds, plus a sorted list of every module imported.
+    """
+    import compileall
+    import os
+    import subprocess
+    package = os.path.dirname(os.path.abspath(stats.__file__))
+    # Don't count the time to compile the source, if it has changed.
+    compileall.compile_dir(package, quiet=1)
+    root = os.path.dirname(package)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [root, env.get('PYTHONPATH')]))
+    command = [sys.executable, '-X', 'importtime', '-c', 'import ' + module]
+    totals, owns = [], []
+    for _ in range(repeat):
+        process = subprocess.run(command, env=env, stderr=subprocess.PIPE,
+                                 universal_newlines=True, check=True)
+        rows = parse_importtime(process.stderr)
+        totals.append(max(row[2] for row in rows if row[0] == module))
+        owns.append(sum(row[1] for row in rows
+                        if row[0] == 'stats' or row[0].startswith('stats.')))
+    return {'module': module, 'total': min(totals), 'own': min(owns),
+            'modules': sorted(set(row[0] for row in rows))}
+
+
+def import_main(args):
+    """Time the imports of the entry modules and print them as a table.
+
+    Returns 1 if any module is over its budget in IMPORT_BUDGETS, else 0.
+    The budgets are wall-clock times, so they are checked here rather than
+    in the test suite, where a loaded machine would make them flaky.
+    """
+    print('%-16s %10s %10s %10s' % ('module', 'total us', 'own us', 'budget'))
+    results = []
+    status = 0
+    for module, budget in sorted(IMPORT_BUDGETS.items()):
+        result = import_time(module, repeat=args.repeat)
+        results.append(result)
+        lazy = [name for name in LAZY_MODULES if name in result['modules']]
+        over = result['own'] > budget
+        if over:
+            status = 1
+        print('%-16s %10d %10d %10d%s%s' % (
+              module, result['total'], result['own'], budget,
+              '  OVER BUDGET' if over else '',
+              '  imports ' + ', '.join(lazy) if lazy else ''))
+    if args.output:
+        import json
+        with open(args.output, 'w') as f:
+            json.dump({'meta': metadata(repeat=args.repeat),
+                       'imports': results}, f, indent=1)
+    return status
+
+
+# === Comparing results ===
+
+def _key(result):
+    return (result['function'], result['input'], result['mode'],
+            result['size'])
+
+
+def _bootstrap(a, b, resamples, rng):
+    """Return bootstrap replicates of mean(b) - mean(a)."""
+    # This inner loop runs resamples times for every benchmark, so it
+    # uses plain float sums rather than the high-precision stats.mean.
+    fsum = math.fsum
+    choices = rng.choices
+    na, nb = len(a), len(b)
+    return [fsum(choices(b, k=nb))/nb - fsum(choices(a, k=na))/na
+            for _ in range(resamples)]
+
+
+def compare(old, new, threshold=0.05, confidence=0.95, resamples=1000,
+            seed=0):
+    """Compare two sets of benchmark results, old and new.
+
+    Returns a list of dicts, one for each benchmark timed successfully in
+    both old and new, with the ratio of new to old time per call and its
+    confidence interval. Ratios above 1 mean the new version is slower.
+
+    The ratio is estimated from the difference between the means of the
+    logarithms of the timing samples, with a bootstrap percentile
+    confidence interval. A benchmark is flagged as a regression if the
+    whole confidence interval lies above 1+threshold, and as an improvement
+    if it lies below 1/(1+threshold).
+    """
+    rng = random.Random(seed)
+    before = dict((_key(r), r) for r in old['results'] if 'samples' in r)
+    alpha = (1 - confidence)/2
+    quantile = stats.order.quantile
+    comparisons = []
+    for result in new['results']:
+        key = _key(result)
+        if 'samples' not in result or key not in before:
+            continue
+        a = [math.log(t) for t in before[key]['samples']]
+        b = [math.log(t) for t in result['samples']]
+        d = stats.mean(b) - stats.mean(a)
+        boot = _bootstrap(a, b, resamples, rng)
+        lo = quantile(boot, alpha, scheme=7)
+        hi = quantile(boot, 1 - alpha, scheme=7)
+        # Spread of the samples, as the standard deviation of log time
+        # (roughly the coefficient of variation).
+        spread = max(stats.stdev(s) if len(s) > 1 else 0.0 for s in (a, b))
+        if lo > math.log1p(threshold):
+            status = 'regression'
+        elif hi < -math.log1p(threshold):
+            status = 'improvement'
+        else:
+            status = ''
+        comparisons.append({
+            'function': key[0], 'input': key[1], 'mode': key[2],
+            'size': key[3], 'old': before[key]['median'],
+            'new': result['median'], 'ratio': math.exp(d),
+            'low': math.exp(lo), 'high': math.exp(hi), 'spread': spread,
+            'status': status,
+            })
+    return comparisons
+
+
+def format_comparisons(comparisons, changes_only=False):
+    """Return comparisons formatted as a text table."""
+    lines = ['%-34s %-8s %-7s %9s %10s %10s %7s  %-15s %s' % (
+             'function', 'input', 'mode', 'size', 'old', 'new', 'ratio',
+             'interval', '')]
+    for c in comparisons:
+        if changes_only and not c['status']:
+            continue
+        lines.append('%-34s %-8s %-7s %9d %10.3g %10.3g %7.3f  %-15s %s' % (
+            c['function'], c['input'], c['mode'], c['size'], c['old'],
+            c['new'], c['ratio'], '%.3f-%.3f' % (c['low'], c['high']),
+            c['status'].upper()))
+    return '\n'.join(lines)
+
+
+def add_compare_arguments(parser):
+    """Add the comparison options to argparse parser."""
+    parser.add_argument('old', metavar='OLD', help='baseline results (JSON)')
+    parser.add_argument('new', metavar='NEW', help='new results (JSON)')
+    parser.add_argument('-t', '--threshold', type=float, default=0.05,
+                        help='smallest slowdown to report, as a fraction '
+                             '(default: 0.05)')
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help='confidence level (default: 0.95)')
+    parser.add_argument('--resamples', type=int, default=1000,
+                        help='bootstrap resamples (default: 1000)')
+    parser.add_argument('--changes', action='store_true',
+                        help='only show regressions and improvements')
+    parser.add_argument('--json', action='store_true',
+                        help='print the comparisons as JSON')
+
+
+def compare_main(args):
+    """Compare result files for parsed command line args.
+
+    Returns 1 if there are any regressions, otherwise 0.
+    """
+    if not 0 < args.confidence < 1:
+        raise ValueError('confidence must be between 0 and 1')
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    comparisons = compare(old, new, args.threshold, args.confidence,
+                          args.resamples)
+    regressions = [c for c in comparisons if c['status'] == 'regression']
+    if args.json:
+        print(json.dumps(comparisons, indent=1))
+    else:
+        print(format_comparisons(comparisons, args.changes))
+        improvements = len(comparisons) - len(regressions) - sum(
+            1 for c in comparisons if not c['status'])
+        print('\n%d benchmarks compared: %d regressions, %d improvements'
+              % (len(comparisons), len(regressions), improvements))
+    return 1 if regressions else 0
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file __init__.py for the licence terms for this software.
+
+"""
+Command line analysis of numeric data files, for ``python3 -m stats``.
+
+Usage:
+    $ python3 -m stats describe [options] FILE [FILE ...]
+    $ python3 -m stats quantiles [options] FILE [FILE ...]
+    $ python3 -m stats corr [options] FILE [FILE ...]
+    $ python3 -m stats bench [options]
+    $ python3 -m stats compare [options] OLD NEW
+
+Commands:
+    describe    Count, mean, standard deviation, minimum and maximum of
+                each column.
+    quantiles   Quantiles of each column (see ``stats.order.quantile``).
+    corr        Correlation matrix of the columns.
+    bench       Run the performance benchmarks (see ``stats._bench``).
+    compare     Compare two sets of saved benchmark results, and exit with
+                status 1 if there are significant regressions.
+
+Files may be CSV or TSV (with an optional header line naming the columns),
+whitespace-separated text with one row per line, or raw little-endian
+float64 values. The format is guessed from the file name extension (.csv,
+.tsv, .f64, .bin or .raw; anything else is treated as text), or given
+with --format. Binary files hold --width columns, stored row by row.
+
+All files are read in large chunks (binary files through mmap), and the
+data is reduced one chunk at a time by mergeable one-pass accumulators, so
+``describe`` and ``corr`` run in memory bounded by the chunk size however
+large the files are. ``quantiles`` must keep the values, which it stores
+compactly as arrays of floats (8 bytes per value). The columns are sorted
+one at a time; with numpy installed, a large column is sorted into a new
+array, so the peak is about 8 bytes per value plus 8 per value of the
+largest column. Without numpy each column is sorted into a list, which
+costs about 32 bytes per value of that column.
+
+Use --json for machine-readable output instead of a table.
+"""
+
+import argparse
+import array
+import mmap
+import operator
+import os
+import sys
+
+# stats.multivar and stats.order are imported by the commands which need
+# them, to keep start-up fast.
+import stats
+
+
+# Number of bytes to read from a file at a time.
+CHUNKSIZE = 1 << 20
+
+_FORMATS = {'.csv': 'csv', '.tsv': 'tsv', '.f64': 'f64', '.bin': 'f64',
+            '.raw': 'f64'}
+_DELIMITERS = {'csv': b',', 'tsv': b'\t', 'text': None}
+
+
+# === Readers ===
+
+def guess_format(path):
+    """Return the file format implied by the extension of path."""
+    ext = os.path.splitext(path)[1].lower()
+    return _FORMATS.get(ext, 'text')
+
+
+def _select(names, columns):
+    """Return the indexes of the wanted columns.
+
+    columns is a list of column names or 1-based column numbers, or None
+    for all the columns.
+    """
+    if columns is None:
+        return list(range(len(names)))
+    indexes = []
+    for col in columns:
+        if col in names:
+            indexes.append(names.index(col))
+        elif col.isdigit() and 1 <= int(col) <= len(names):
+            indexes.append(int(col) - 1)
+        else:
+            raise stats.StatsError('no such column: %r' % col)
+    return indexes
+
+
+def _read_lines(path, chunksize):
+    """Yield lists of the lines (as bytes) of a file, a chunk at a time."""
+    with open(path, 'rb') as f:
+        tail = b''
+        while True:
+            block = f.read(chunksize)
+            if not block:
+                break
+            lines = (tail + block).split(b'\n')
+            # The last line may be incomplete; keep it for the next chunk.
+            tail = lines.pop()
+            yield lines
+        if tail:
+            yield [tail]
+
+
+def _parse_header(line, delimiter):
+    """Return (names, is_header) for the first line of a text file."""
+    fields = line.split(delimiter)
+    try:
+        [float(field) for field in fields]
+    except ValueError:
+        names = [f.strip().strip(b'"\'').decode('utf-8', 'replace')
+                 for f in fields]
+        return names, True
+    return [str(i) for i in range(1, len(fields)+1)], False
+
+
+def read_text(path, fmt='text', columns=None, chunksize=CHUNKSIZE):
+    """Return (names, chunks) for a CSV, TSV or whitespace-separated file.
+
+    chunks is an iterator yielding, for each chunk of the file, a list of
+    arrays of floats, one array per selected column.
+    """
+    delimiter = _DELIMITERS[fmt]
+    lines = _read_lines(path, chunksize)
+    first = []
+    for first in lines:
+        first = [line for line in first if line.strip()]
+        if first:
+            break
+    if not first:
+        return [], iter([])
+    names, is_header = _parse_header(first[0], delimiter)
+    if is_header:
+        del first[0]
+    indexes = _select(names, columns)
+    width = len(names)
+
+    def parse(lines):
+        lines = [line for line in lines if line.strip()]
+        if width == 1:
+            # Special case for speed: no need to split the lines, and float
+            # rejects any line with more than one field.
+            return [array.array('d', map(float, lines))]
+        rows = [line.split(delimiter) for line in lines]
+        if any(len(row) != width for row in rows):
+            raise stats.StatsError(
+                'expected %d fields on every line of %s' % (width, path))
+        return [array.array('d', map(float, map(operator.itemgetter(i), rows)))
+                for i in indexes]
+
+    def chunks():
+        if first:
+            yield parse(first)
+        for block in lines:
+            yield parse(block)
+
+    return [names[i] for i in indexes], chunks()
+
+
+def read_binary(path, width=1, columns=None, chunksize=CHUNKSIZE):
+    """Return (names, chunks) for a file of little-endian float64 values.
+
+    The file holds rows of ``width`` values each. chunks is an iterator
+    yielding, for each chunk of the file, a list of arrays of floats, one
+    array per selected column.
+    """
+    names = [str(i) for i in range(1, width+1)]
+    indexes = _select(names, columns)
+    rowsize = 8*width
+    size = os.path.getsize(path)
+    if size % rowsize:
+        raise stats.StatsError(
+            '%s does not hold a whole number of rows of %d float64 values'
+            % (path, width))
+    # Read a whole number of rows per chunk.
+    step = max(1, chunksize//rowsize)*rowsize
+
+    def chunks():
+        if not size:
+            return
+        with open(path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, size, step):
+                raw = array.array('d')
+                with memoryview(mm) as mv:
+                    raw.frombytes(mv[start:start+step])
+                if sys.byteorder != 'little':
+                    raw.byteswap()
+                if width == 1:
+                    yield [raw]
+                else:
+                    yield [raw[i::width] for i in indexes]
+
+    return [names[i] for i in indexes], chunks()
+
+
+def read(path, fmt=None, columns=None, width=1, chunksize=CHUNKSIZE):
+    """Return (names, chunks) for a data file of any supported format."""
+    if fmt is None:
+        fmt = guess_format(path)
+    if fmt == 'f64':
+        return read_binary(path, width, columns, chunksize)
+    return read_text(path, fmt, columns, chunksize)
+
+
+def read_all(paths, fmt=None, columns=None, width=1, chunksize=CHUNKSIZE):
+    """Return (names, chunks) for the concatenated data of several files.
+
+    Every file must have the same number of selected columns.
+    """
+    names = None
+    sources = []
+    for path in paths:
+        cols, chunks = read(path, fmt, columns, width, chunksize)
+        if names is None:
+            names = cols
+        elif len(cols) != len(names):
+            raise stats.StatsError(
+                'expected %d columns in %s but found %d'
+                % (len(names), path, len(cols)))
+        sources.append(chunks)
+
+    def chunks():
+        for source in sources:
+            for chunk in source:
+                if chunk and len(chunk[0]):
+                    yield chunk
+
+    return names or [], chunks()
+
+
+# === Commands ===
+
+def describe(names, chunks):
+    """Return a dict of summary statistics for each column."""
+    import stats.multivar
+    moments = [stats.multivar.CoMoments() for _ in names]
+    lo = [float('inf')]*len(names)
+    hi = [float('-inf')]*len(names)
+    for chunk in chunks:
+        for i, col in enumerate(chunk):
+            part = stats.multivar.CoMoments.from_columns([col])
+            moments[i] = moments[i].merge(part)
+            lo[i] = min(lo[i], min(col))
+            hi[i] = max(hi[i], max(col))
+    results = {}
+    for name, cm, a, b in zip(names, moments, lo, hi):
+        nan = float('nan')
+        if cm.n:
+            mean = cm.means[0]
+            sd = cm.cov_matrix()[0][0]**0.5 if cm.n > 1 else nan
+        else:
+            mean = sd = a = b = nan
+        results[name] = {'n': cm.n, 'mean': mean, 'stdev': sd,
+                         'min': a, 'max': b}
+    return results
+
+
+def quantiles(names, chunks, probs, scheme=1):
+    """Return a dict of the quantiles probs for each column."""
+    import stats.order
+    func = stats.order._get_scheme_func(stats.order._Quantile, scheme)
+    data = [array.array('d') for _ in names]
+    for chunk in chunks:
+        for values, col in zip(data, chunk):
+            values.extend(col)
+    results = {}
+    for i, name in enumerate(names):
+        # Drop each column as it is sorted, so only one is held twice.
+        values, data[i] = data[i], None
+        if len(values) < 2:
+            raise stats.StatsError(
+                'need at least 2 items in column %s to calculate quantiles'
+                % name)
+        values = stats.order._sorted(values)
+        results[name] = dict(('%g' % p, func(values, p)) for p in probs)
+    return results
+
+
+def corr(names, chunks):
+    """Return the correlation matrix of the columns, as a dict of dicts."""
+    import stats.multivar
+    cm = stats.multivar.CoMoments()
+    for chunk in chunks:
+        cm = cm.merge(stats.multivar.CoMoments.from_columns(chunk))
+    matrix = cm.corr_matrix()
+    return dict((a, dict(zip(names, row))) for a, row in zip(names, matrix))
+
+
+# === Output ===
+
+def _format(x):
+    if isinstance(x, float):
+        return '%.10g' % x
+    return str(x)
+
+
+def format_table(results):
+    """Return the nested dict results formatted as a text table."""
+    rows = list(results)
+    if not rows:
+        return ''
+    fields = list(results[rows[0]])
+    table = [[''] + fields]
+    table.extend([row] + [_format(results[row][f]) for f in fields]
+                 for row in rows)
+    widths = [max(len(line[i]) for line in table)
+              for i in range(len(table[0]))]
+    lines = []
+    for line in table:
+        cells = [line[0].ljust(widths[0])]
+        cells.extend(cell.rjust(w) for cell, w in zip(line[1:], widths[1:]))
+        lines.append('  '.join(cells).rstrip())
+    return '\n'.join(lines)
+
+
+# === Command line ===
+
+def _probabilities(text):
+    probs = [float(p) for p in text.split(',')]
+    if not all(0.0 <= p <= 1.0 for p in probs):
+        raise argparse.ArgumentTypeError('probabilities must be in [0, 1]')
+    return probs
+
+
+def _scheme(text):
+    return int(text) if text.isdigit() else text
+
+
+def _parser(command=None):
+    # The benchmark options are only added when command is bench or compare,
+    # since importing stats._bench would slow down the other commands.
+    parser = argparse.ArgumentParser(
+        prog='python3 -m stats',
+        description='Summarise columns of numeric data files.')
+    commands = parser.add_subparsers(dest='command')
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('files', nargs='+', metavar='FILE')
+    common.add_argument('-f', '--format', choices=['csv', 'tsv', 'text', 'f64'],
+                        help='file format (default: guess from the extension)')
+    common.add_argument('-c', '--columns', type=lambda s: s.split(','),
+                        help='comma-separated column names or numbers')
+    common.add_argument('-w', '--width', type=int, default=1,
+                        help='number of columns in binary files')
+    common.add_argument('--chunksize', type=int, default=CHUNKSIZE,
+                        help='bytes to read at a time')
+    common.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+    commands.add_parser('describe', parents=[common],
+                        help='count, mean, stdev, min and max')
+    q = commands.add_parser('quantiles', parents=[common], help='quantiles')
+    q.add_argument('-p', '--probs', type=_probabilities,
+                   default=[0.25, 0.5, 0.75],
+                   help='comma-separated probabilities (default: quartiles)')
+    q.add_argument('-s', '--scheme', type=_scheme, default=1,
+                   help='quantile scheme number or alias (default: 1)')
+    commands.add_parser('corr', parents=[common], help='correlation matrix')
+    b = commands.add_parser('bench', help='run the performance benchmarks')
+    c = commands.add_parser('compare', help='compare benchmark results')
+    if command in ('bench', 'compare'):
+        from stats import _bench
+        _bench.add_arguments(b)
+        _bench.add_compare_arguments(c)
+    return parser
+
+
+COMMANDS = ('describe', 'quantiles', 'corr', 'bench', 'compare')
+
+
+def main(argv):
+    """Run the command line argv (excluding the program name).
+
+    Returns the exit status: 0 for success, 2 for errors, and for the
+    compare command, 1 if there are performance regressions.
+    """
+    args = _parser(argv[0] if argv else None).parse_args(argv)
+    try:
+        if args.command == 'bench':
+            from stats import _bench
+            return _bench.main(args)
+        if args.command == 'compare':
+            from stats import _bench
+            return _bench.compare_main(args)
+        names, chunks = read_all(args.files, args.format, args.columns,
+                                 args.width, args.chunksize)
+        if args.command == 'describe':
+            results = describe(names, chunks)
+        elif args.command == 'quantiles':
+            results = quantiles(names, chunks, args.probs, args.scheme)
+        else:
+            results = corr(names, chunks)
+    except (OSError, ValueError) as err:
+        print('%s: error: %s' % ('python3 -m stats', err), file=sys.stderr)
+        return 2
+    if args.json:
+        import json
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_table(results))
+    return 0
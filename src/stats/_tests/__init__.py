@@ -22,7 +22,11 @@ stats package public API and is subject to change without notice.
 
 import unittest
 
-import collections
+try:
+    from collections.abc import Sequence
+except ImportError:
+    # Python 3.2 and older.
+    from collections import Sequence
 
 
 def approx_equal(x, y, tol=1e-12, rel=1e-7):
@@ -48,8 +52,8 @@ class NumericTestCase(unittest.TestCase):
         # the second.
         if tol is USE_DEFAULT: tol = self.tol
         if rel is USE_DEFAULT: rel = self.rel
-        if (isinstance(actual, collections.Sequence) and
-        isinstance(expected, collections.Sequence)):
+        if (isinstance(actual, Sequence) and
+        isinstance(expected, Sequence)):
             result = self._check_approx_seq(actual, expected, tol, rel, msg)
         else:
             result = self._check_approx_num(actual, expected, tol, rel, msg)
@@ -49,20 +49,34 @@ def run_unittests():
     total = failures = errors = skipped = 0
     # Tests to run:
     import stats._tests.basic
+    import stats._tests.bench
+    import stats._tests.cli
     import stats._tests.co
     import stats._tests.general
+    import stats._tests.group
+    import stats._tests.instrument
     import stats._tests.multivar
     import stats._tests.order
+    import stats._tests.resample
+    import stats._tests.sample
     import stats._tests.univar
     import stats._tests.utils
+    import stats._tests.vectorize
     modules = (
         stats._tests.basic,
+        stats._tests.bench,
+        stats._tests.cli,
         stats._tests.co,
         stats._tests.general,
+        stats._tests.group,
+        stats._tests.instrument,
         stats._tests.multivar,
         stats._tests.order,
+        stats._tests.resample,
+        stats._tests.sample,
         stats._tests.univar,
         stats._tests.utils,
+        stats._tests.vectorize,
         )
     for module in modules:
         print("\n+++ Testing module %s +++" % module.__name__)
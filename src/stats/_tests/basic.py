@@ -8,6 +8,8 @@ Test suite for the stats module (stats.__init__.py).
 
 """
 
+import array
+from fractions import Fraction
 import math
 import random
 import unittest
@@ -290,3 +292,230 @@ class VarianceMeanTest(NumericTestCase):
     def test_stdev(self):
         self.compare_with_and_without_mean(stats.stdev)
 
+
+
+class ColumnMajorTest(NumericTestCase):
+    # Test column-major input to the columnar functions.
+    rel = 1e-12
+
+    funcs = (stats.sum, stats.mean, stats.variance, stats.stdev,
+             stats.pvariance, stats.pstdev)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.columns = [[random.uniform(1, 10) for _ in range(40)]
+                        for _ in range(3)]
+        self.rows = [list(row) for row in zip(*self.columns)]
+
+    def testColumns(self):
+        # Columns gives the same results as the equivalent rows.
+        Columns = stats.vectorize.Columns
+        for func in self.funcs:
+            expected = func(self.rows)
+            self.assertApproxEqual(func(Columns(self.columns)), expected)
+            arrays = [array.array('d', col) for col in self.columns]
+            self.assertApproxEqual(func(Columns(arrays)), expected)
+
+    def testNamedColumns(self):
+        # Named columns give a dict of results.
+        data = stats.vectorize.NamedColumns(zip('abc', self.columns))
+        for func in self.funcs:
+            expected = func(self.rows)
+            result = func(data)
+            self.assertEqual(sorted(result), ['a', 'b', 'c'])
+            actual = [result[key] for key in 'abc']
+            self.assertApproxEqual(actual, expected)
+
+    def testPlainMapping(self):
+        # Other mappings are data, as for any other iterable: their keys.
+        self.assertEqual(stats.mean({1: 'a', 2: 'b', 6: 'c'}), 3.0)
+        self.assertEqual(stats.sum({1.5: [1, 2], 2.5: [3, 4]}), 4.0)
+
+    def testUnequalLengths(self):
+        # Columns are processed independently, so may differ in length.
+        data = stats.vectorize.Columns([[1, 2, 3], [4, 6]])
+        self.assertEqual(stats.mean(data), [2.0, 5.0])
+
+    def testExtraArguments(self):
+        Columns = stats.vectorize.Columns
+        m = stats.mean(self.rows)
+        expected = stats.variance(self.rows, m)
+        self.assertApproxEqual(stats.variance(Columns(self.columns), m),
+                               expected)
+        data = stats.vectorize.NamedColumns(zip('abc', self.columns))
+        result = stats.variance(data, dict(zip('abc', m)))
+        self.assertApproxEqual([result[key] for key in 'abc'], expected)
+        self.assertEqual(stats.sum(Columns([[1, 2], [3, 4]]), [10, 20]),
+                         [13, 27])
+
+    def testArray(self):
+        # Arrays of ints and floats are summed with full precision.
+        data = array.array('d', [1.0, 1e100, 1.0, -1e100]*100)
+        self.assertEqual(stats.sum(data), 200.0)
+        self.assertEqual(stats.sum(array.array('q', [2**62]*8)), 2**65)
+        data = array.array('d', [float('inf'), 1.0, float('-inf')])
+        self.assertTrue(math.isnan(stats.sum(data)))
+
+
+class SkipNATest(NumericTestCase):
+    # Test skipping of missing values.
+    rel = 1e-12
+
+    funcs = (stats.sum, stats.mean, stats.variance, stats.stdev,
+             stats.pvariance, stats.pstdev)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        rng = random.Random(7)
+        self.clean = [rng.uniform(-10, 10) for _ in range(200)]
+        self.data = self.clean[:]
+        for i in range(5, 200, 17):
+            self.data.insert(i, float('nan') if i % 2 else None)
+        self.missing = len(self.data) - len(self.clean)
+
+    def testFunctions(self):
+        for func in self.funcs:
+            expected = func(self.clean)
+            self.assertApproxEqual(func(self.data, skipna=True), expected)
+            self.assertApproxEqual(func(iter(self.data), skipna=True),
+                                   expected)
+
+    def testArray(self):
+        data = array.array('d', [x for x in self.data if x is not None])
+        clean = array.array('d', self.clean)
+        for func in self.funcs:
+            self.assertApproxEqual(func(data, skipna=True), func(clean))
+        data = stats.dropna(array.array('d', [1.0, float('nan'), 2.0]))
+        self.assertEqual(stats.sum(data), 3.0)
+        self.assertEqual(data.skipped, 1)
+        self.assertEqual(stats.mean(array.array('i', [1, 2]), skipna=True),
+                         1.5)
+
+    def testSkippedCount(self):
+        for func in self.funcs:
+            for data in (self.data, iter(self.data)):
+                wrapped = stats.dropna(data)
+                func(wrapped)
+                self.assertEqual(wrapped.skipped, self.missing)
+
+    def testNoCopy(self):
+        # Sequences are filtered on each pass, not copied.
+        wrapped = stats.dropna(self.data)
+        self.assertApproxEqual(stats.variance(wrapped),
+                               stats.variance(self.clean))
+        self.assertIs(wrapped.data, self.data)
+        self.assertTrue(wrapped.reiterable())
+        self.assertFalse(stats.dropna(iter(self.data)).reiterable())
+
+    def testDefault(self):
+        # By default, missing values aren't skipped.
+        self.assertTrue(math.isnan(stats.mean([1.0, float('nan')])))
+        self.assertRaises(TypeError, stats.sum, [1.0, None])
+
+    def testRows(self):
+        rows = [[1, 2], [None, 3], [3, float('nan')], [5, 6]]
+        self.assertEqual(stats.mean(rows, skipna=True), [3.0, 4.0])
+        columns = stats.vectorize.NamedColumns(a=[1, None, 3],
+                                               b=[float('nan'), 2, 4])
+        self.assertEqual(stats.mean(columns, skipna=True),
+                         {'a': 2.0, 'b': 3.0})
+
+    def testAllMissing(self):
+        self.assertEqual(stats.sum([None, float('nan')], skipna=True), 0)
+        self.assertRaises(stats.StatsError, stats.mean, [None], skipna=True)
+
+    def testMinmax(self):
+        expected = (min(self.clean), max(self.clean))
+        self.assertEqual(stats.minmax(self.data, skipna=True), expected)
+        self.assertEqual(stats.minmax(iter(self.data), skipna=True), expected)
+        self.assertEqual(stats.minmax(3, None, 1, skipna=True), (1, 3))
+
+
+class ProductTest(NumericTestCase):
+    # Test that product keeps the exponent apart from the mantissa.
+    rel = 1e-13
+
+    def testIntermediateOverflow(self):
+        self.assertApproxEqual(stats.product([1e200, 1e200, 1e-300]), 1e100)
+        self.assertApproxEqual(stats.product([1e-200, 1e-200, 1e300]), 1e-100)
+        self.assertApproxEqual(stats.product(iter([1e200, 1e200, 1e-300])),
+                               1e100)
+
+    def testLong(self):
+        rng = random.Random(47)
+        data = [rng.uniform(0.5, 2.0) for _ in range(2000)]
+        expected = math.exp(math.fsum(map(math.log, data)))
+        self.assertApproxEqual(stats.product(data), expected, rel=1e-10)
+        data = [-x for x in data[:1001]]
+        self.assertApproxEqual(stats.product(data),
+            -math.exp(math.fsum(math.log(-x) for x in data)), rel=1e-11)
+
+    def testOverflow(self):
+        self.assertEqual(stats.product([1e200, 1e200]), float('inf'))
+        self.assertEqual(stats.product([-1e200, 1e200]), float('-inf'))
+        self.assertEqual(stats.product([1e-200, 1e-200]), 0.0)
+
+    def testStart(self):
+        self.assertApproxEqual(stats.product([1e200, 1e200], 1e-300), 1e100)
+        self.assertEqual(stats.product([2.5, 4.0], 3), 30.0)
+
+    def testExact(self):
+        # Ints and Fractions are still multiplied exactly.
+        self.assertEqual(stats.product(range(1, 30)), math.factorial(29))
+        self.assertEqual(stats.product([Fraction(1, 3)]*3), Fraction(1, 27))
+
+
+class MinmaxTest(unittest.TestCase):
+    # See also stats._tests.utils.MinmaxTest.
+    minmax = staticmethod(stats.minmax)
+
+    def testBlocks(self):
+        # Iterators are read in blocks; test across several of them.
+        data = [random.random() for _ in range(10000)]
+        self.assertEqual(self.minmax(iter(data)), (min(data), max(data)))
+        result = self.minmax(iter(data), key=lambda x: -x)
+        self.assertEqual(result, (max(data), min(data)))
+
+    def testTies(self):
+        # The first of equal items is returned, as for min and max.
+        data = [(1, 'a'), (0, 'b'), (2, 'c'), (0, 'd'), (2, 'e')]*3000
+        key = lambda t: t[0]
+        expected = ((0, 'b'), (2, 'c'))
+        self.assertEqual(self.minmax(data, key=key), expected)
+        self.assertEqual(self.minmax(iter(data), key=key), expected)
+
+
+class ArgminmaxTest(unittest.TestCase):
+    def testSequence(self):
+        data = [random.random() for _ in range(1000)]
+        expected = (data.index(min(data)), data.index(max(data)))
+        self.assertEqual(stats.argminmax(data), expected)
+        self.assertEqual(stats.argminmax(*data), expected)
+
+    def testIterator(self):
+        data = [random.random() for _ in range(10000)]
+        expected = (data.index(min(data)), data.index(max(data)))
+        self.assertEqual(stats.argminmax(iter(data)), expected)
+
+    def testKey(self):
+        data = ['aaa', 'bbbb', 'c', 'dd', 'e', 'ffff']
+        self.assertEqual(stats.argminmax(data, key=len), (2, 1))
+        self.assertEqual(stats.argminmax(iter(data), key=len), (2, 1))
+
+    def testFailures(self):
+        self.assertRaises(TypeError, stats.argminmax)
+        self.assertRaises(ValueError, stats.argminmax, [])
+        self.assertRaises(ValueError, stats.argminmax, iter([]))
+        self.assertRaises(TypeError, stats.argminmax, [1], spam=2)
+
+
+class LazySubmoduleTest(unittest.TestCase):
+    def testAttributes(self):
+        for name in ('co', 'instrument', 'multivar', 'order', 'sample',
+                     'univar', 'utils'):
+            module = getattr(stats, name)
+            self.assertEqual(module.__name__, 'stats.' + name)
+            self.assertIn(name, dir(stats))
+
+    def testMissing(self):
+        self.assertRaises(AttributeError, getattr, stats, 'no_such_module')
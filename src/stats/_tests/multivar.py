@@ -10,6 +10,7 @@ Test suite for the stats.multivar module.
 """
 
 import collections
+import functools
 import math
 import random
 
@@ -477,3 +478,449 @@ class LinrTest(NumericTestCase):
     def testSingleton(self):
         self.assertRaises(ValueError, self.func, [(1, 2)])
 
+
+
+class CoMomentsTest(NumericTestCase):
+    tol = 1e-12
+    rel = 1e-9
+
+    def make_rows(self, n, k):
+        return [tuple(random.uniform(-10, 10) + j for j in range(k))
+                for _ in range(n)]
+
+    def testEmpty(self):
+        cm = stats.multivar.CoMoments()
+        self.assertEqual(cm.n, 0)
+        self.assertRaises(ValueError, cm.cov_matrix)
+        self.assertRaises(ValueError, cm.corr_matrix)
+
+    def testRaggedRows(self):
+        cm = stats.multivar.CoMoments([(1, 2, 3)])
+        self.assertRaises(ValueError, cm.add, (1, 2))
+
+    def testMerge(self):
+        rows = self.make_rows(100, 4)
+        expected = stats.multivar.CoMoments(rows)
+        for cut in (1, 37, 50, 99):
+            a = stats.multivar.CoMoments(rows[:cut])
+            b = stats.multivar.CoMoments(iter(rows[cut:]))
+            merged = a.merge(b)
+            self.assertEqual(merged.n, 100)
+            self.assertApproxEqual(merged.means, expected.means)
+            for row1, row2 in zip(merged.cov_matrix(), expected.cov_matrix()):
+                self.assertApproxEqual(row1, row2)
+        # Merging doesn't modify the arguments.
+        self.assertEqual(a.n, 99)
+        self.assertEqual(b.n, 1)
+
+    def testMergeEmpty(self):
+        rows = self.make_rows(10, 3)
+        a = stats.multivar.CoMoments(rows)
+        empty = stats.multivar.CoMoments()
+        self.assertEqual(a.merge(empty).cov_matrix(), a.cov_matrix())
+        self.assertEqual(empty.merge(a).cov_matrix(), a.cov_matrix())
+
+    def testFromColumns(self):
+        rows = self.make_rows(50, 3)
+        expected = stats.multivar.CoMoments(rows)
+        cm = stats.multivar.CoMoments.from_columns(zip(*rows))
+        self.assertEqual(cm.n, 50)
+        self.assertApproxEqual(cm.means, expected.means)
+        for row1, row2 in zip(cm.cov_matrix(), expected.cov_matrix()):
+            self.assertApproxEqual(row1, row2)
+        self.assertEqual(stats.multivar.CoMoments.from_columns([]).n, 0)
+        self.assertRaises(ValueError, stats.multivar.CoMoments.from_columns,
+                          [[1, 2], [3]])
+
+    def testFromArrayColumns(self):
+        # Columns without a truth value, like numpy arrays, are accepted.
+        class Column(list):
+            def __bool__(self):
+                raise ValueError('truth value is ambiguous')
+        rows = self.make_rows(20, 3)
+        expected = stats.multivar.CoMoments(rows)
+        columns = [Column(col) for col in zip(*rows)]
+        cm = stats.multivar.CoMoments.from_columns(columns)
+        self.assertApproxEqual(cm.means, expected.means)
+        self.assertEqual(
+            stats.multivar.CoMoments.from_columns([Column()]).n, 0)
+        np = stats._numpy()
+        if np is not None:
+            cm = stats.multivar.CoMoments.from_columns(np.array(columns))
+            self.assertApproxEqual(cm.means, expected.means)
+
+
+class CovMatrixTest(NumericTestCase):
+    tol = 1e-12
+    rel = 1e-9
+
+    def testAgreesWithCov(self):
+        rows = [(random.gauss(0, 1), random.gauss(5, 2), random.random())
+                for _ in range(50)]
+        result = stats.multivar.cov_matrix(iter(rows))
+        presult = stats.multivar.pcov_matrix(rows)
+        for i in range(3):
+            for j in range(3):
+                xs = [row[i] for row in rows]
+                ys = [row[j] for row in rows]
+                self.assertApproxEqual(result[i][j], stats.multivar.cov(xs, ys))
+                self.assertApproxEqual(
+                    presult[i][j], stats.multivar.pcov(xs, ys))
+
+    def testSymmetric(self):
+        rows = [(random.random(), random.random(), random.random())
+                for _ in range(20)]
+        result = stats.multivar.cov_matrix(rows)
+        for i in range(3):
+            for j in range(3):
+                self.assertEqual(result[i][j], result[j][i])
+
+    def testShift(self):
+        # The one-pass update should not suffer from catastrophic
+        # cancellation when the data has a large offset.
+        rows = [(random.random(), random.random()) for _ in range(50)]
+        expected = stats.multivar.cov_matrix(rows)
+        shifted = [(x + 1e9, y - 1e9) for (x, y) in rows]
+        result = stats.multivar.cov_matrix(shifted)
+        for row1, row2 in zip(result, expected):
+            self.assertApproxEqual(row1, row2, tol=1e-7)
+
+    def testTooFewRows(self):
+        self.assertRaises(ValueError, stats.multivar.cov_matrix, [])
+        self.assertRaises(ValueError, stats.multivar.cov_matrix, [(1, 2)])
+        self.assertRaises(ValueError, stats.multivar.pcov_matrix, [])
+
+
+class CorrMatrixTest(NumericTestCase):
+    tol = 1e-14
+
+    def testAgreesWithCorr(self):
+        rows = [(x, 2.5*x + random.random(), random.random())
+                for x in (random.uniform(-5, 5) for _ in range(40))]
+        result = stats.multivar.corr_matrix(rows)
+        for i in range(3):
+            self.assertEqual(result[i][i], 1.0)
+            for j in range(3):
+                if i != j:
+                    xs = [row[i] for row in rows]
+                    ys = [row[j] for row in rows]
+                    expected = stats.multivar.corr(xs, ys)
+                    self.assertApproxEqual(result[i][j], expected)
+
+    def testConstantColumn(self):
+        rows = [(x, 3) for x in range(10)]
+        result = stats.multivar.corr_matrix(rows)
+        self.assertEqual(result[0][0], 1.0)
+        self.assertTrue(math.isnan(result[0][1]))
+        self.assertTrue(math.isnan(result[1][1]))
+
+    def testStateArgument(self):
+        rows = [(random.random(), random.random()) for _ in range(10)]
+        state = stats.multivar.CoMoments(rows)
+        self.assertEqual(stats.multivar.corr_matrix(state),
+                         stats.multivar.corr_matrix(rows))
+
+
+class MlinrTest(NumericTestCase):
+    tol = 1e-9
+    rel = 1e-9
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = stats.multivar.mlinr
+
+    def make_rows(self, n, coeffs, noise=0.0):
+        rows = []
+        for _ in range(n):
+            xs = [random.uniform(-10, 10) for _ in coeffs[1:]]
+            y = coeffs[0] + sum(b*x for b, x in zip(coeffs[1:], xs))
+            rows.append(tuple(xs) + (y + random.gauss(0, noise),))
+        return rows
+
+    def testExact(self):
+        coeffs = [2.5, -1.25, 0.5, 3.0]
+        result = self.func(iter(self.make_rows(30, coeffs)))
+        self.assertApproxEqual(result.coefficients, coeffs)
+        self.assertApproxEqual(result.residual_variance, 0.0)
+        self.assertApproxEqual(result.rsquared, 1.0)
+        self.assertEqual(result.n, 30)
+
+    def testAgreesWithLinr(self):
+        for i in range(NUM_HP_TESTS):
+            record = hp_multivariate_test_data(i)
+            data = list(record.DATA)
+            result = self.func(data)
+            a, b = stats.multivar.linr(data)
+            self.assertApproxEqual(result.coefficients, [a, b])
+            self.assertApproxEqual(
+                result.residual_variance, stats.multivar.errsumsq(data))
+            r = stats.multivar.corr(data)
+            self.assertApproxEqual(result.rsquared, r*r)
+
+    def testNoIntercept(self):
+        rows = [(x, 3*x + 0.5) for x in range(10)]
+        result = self.func(rows, intercept=False)
+        self.assertEqual(len(result.coefficients), 1)
+        result = self.func([(x, 3*x) for x in range(10)], intercept=False)
+        self.assertApproxEqual(result.coefficients, [3.0])
+
+    def testMerge(self):
+        rows = self.make_rows(100, [1.0, 2.0, -3.0], noise=0.5)
+        expected = self.func(rows)
+        a = stats.multivar.Regression()
+        b = stats.multivar.Regression()
+        a.update(rows[:41])
+        b.update(rows[41:])
+        result = self.func(a.merge(b))
+        self.assertApproxEqual(result.coefficients, expected.coefficients)
+        self.assertApproxEqual(
+            result.residual_variance, expected.residual_variance)
+        self.assertApproxEqual(result.rsquared, expected.rsquared)
+        self.assertEqual(result.n, 100)
+
+    def testTooFewRows(self):
+        self.assertRaises(ValueError, self.func, [])
+        self.assertRaises(ValueError, self.func, [(1, 2, 3), (2, 3, 4)])
+
+    def testCollinear(self):
+        rows = [(x, 2*x, 5*x - 1) for x in range(10)]
+        self.assertRaises(ValueError, self.func, rows)
+
+    def testRaggedRows(self):
+        fit = stats.multivar.Regression()
+        fit.add([1, 2], 3)
+        self.assertRaises(ValueError, fit.add, [1], 3)
+
+
+class OnePassMixin:
+    # The single pass algorithm is not exactly independent of the order of
+    # the data, so override the mixin test with an approximate version.
+    @common.handle_data_sets(None)
+    @common.handle_extra_arguments
+    def testOrderDoesntMatter(self, data, *args):
+        data.sort()
+        expected = self.func(data, *args)
+        result = self.func(reversed(data), *args)
+        self.assertApproxEqual(result, expected, tol=1e-13, rel=None)
+        for i in range(10):
+            random.shuffle(data)
+            result = self.func(data, *args)
+            self.assertApproxEqual(result, expected, tol=1e-13, rel=None)
+
+
+class OnePassCorrTest(OnePassMixin, CorrTest):
+    # Run the corr tests again, using the single pass algorithm.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = functools.partial(stats.multivar.corr, onepass=True)
+
+    def testIterators(self):
+        # Test that the one pass algorithm works with generators, without
+        # converting them to lists.
+        xdata = [random.random() for _ in range(100)]
+        ydata = [random.random() for _ in range(100)]
+        expected = stats.multivar.corr(xdata, ydata)
+        result = self.func((x for x in xdata), (y for y in ydata))
+        self.assertApproxEqual(result, expected)
+        result = self.func(zip(iter(xdata), iter(ydata)))
+        self.assertApproxEqual(result, expected)
+
+    def testPerfectZeroCorrelation(self):
+        data = [(x, y) for x in range(1, 10) for y in range(1, 10)]
+        self.assertApproxEqual(self.func(data), 0.0, tol=1e-15)
+
+
+class OnePassPCovTest(OnePassMixin, PCovTest):
+    # Run the pcov tests again, using the single pass algorithm.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = functools.partial(stats.multivar.pcov, onepass=True)
+
+    def testShift(self):
+        # Adding large offsets rounds away the low bits of the data itself,
+        # so the covariance can only be expected to agree to an absolute
+        # tolerance that grows with the size of the offset.
+        xdata = [random.random() for _ in range(50)]
+        ydata = [random.random() for _ in range(50)]
+        a = self.func(zip(xdata, ydata))
+        for x0, y0, tol in [(-23, 89, 1e-12), (193, -4362, 1e-11),
+                            (3.7e5, 2.9e6, 1e-10), (1.4e9, 8.1e9, 5e-7),
+                            (-2.3e9, 5.8e9, 5e-7)]:
+            xdata = [x+x0 for x in xdata]
+            ydata = [y+y0 for y in ydata]
+            b = self.func(zip(xdata, ydata))
+            self.assertApproxEqual(a, b, tol=tol, rel=None)
+
+
+class OnePassCovTest(OnePassMixin, CovTest):
+    # Run the cov tests again, using the single pass algorithm.
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = functools.partial(stats.multivar.cov, onepass=True)
+
+    testShift = OnePassPCovTest.testShift
+
+    def testSingleton(self):
+        # Sample covariance is not defined for a single point.
+        self.assertRaises(ValueError, self.func, [(1, 2)])
+
+    def testTruncation(self):
+        # Like the two pass version, the data is truncated to the shorter
+        # of the two arguments.
+        xdata = [random.random() for _ in range(20)]
+        ydata = [random.random() for _ in range(25)]
+        expected = stats.multivar.cov(xdata, ydata)
+        result = self.func(iter(xdata), iter(ydata))
+        self.assertApproxEqual(result, expected)
+
+
+class RankCorrMixin:
+    # Tests common to both rank correlation coefficients.
+    tol = 1e-12
+    rel = 1e-12
+
+    def testPerfect(self):
+        # Any strictly monotonic relationship gives perfect correlation.
+        xdata = [random.uniform(-100, 100) for _ in range(50)]
+        self.assertApproxEqual(self.func(xdata, [x**3 for x in xdata]), 1.0)
+        self.assertApproxEqual(
+            self.func(xdata, [math.exp(-x/50) for x in xdata]), -1.0)
+
+    def testOrderDoesntMatter(self):
+        data = [(random.randint(0, 9), random.randint(0, 9))
+                for _ in range(100)]
+        expected = self.func(data)
+        random.shuffle(data)
+        self.assertApproxEqual(self.func(data), expected)
+
+    def testSymmetric(self):
+        data = [(random.random(), random.random()) for _ in range(100)]
+        expected = self.func(data)
+        result = self.func([(y, x) for (x, y) in data])
+        self.assertApproxEqual(result, expected)
+
+    def testIterators(self):
+        xdata = [random.random() for _ in range(30)]
+        ydata = [random.random() for _ in range(30)]
+        expected = self.func(xdata, ydata)
+        self.assertApproxEqual(self.func(iter(xdata), iter(ydata)), expected)
+        self.assertApproxEqual(self.func(iter(zip(xdata, ydata))), expected)
+
+    def testFailures(self):
+        self.assertRaises(ValueError, self.func, [])
+        self.assertRaises(ValueError, self.func, [(1, 2)])
+        self.assertRaises(ValueError, self.func, [1, 1, 1], [1, 2, 3])
+        self.assertRaises(ValueError, self.func, [1, 2, 3], [4, 4, 4])
+
+    def testNaive(self):
+        # Compare against a direct O(N**2) calculation, including ties.
+        for n in (2, 3, 10, 70, 200):
+            xdata = [random.randint(0, 12) for _ in range(n)]
+            ydata = [random.randint(0, 12) for _ in range(n)]
+            if len(set(xdata)) < 2 or len(set(ydata)) < 2:
+                continue
+            expected = self.naive(xdata, ydata)
+            self.assertApproxEqual(self.func(xdata, ydata), expected)
+
+
+class SpearmanTest(RankCorrMixin, NumericTestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = stats.multivar.spearman
+
+    def naive(self, xdata, ydata):
+        # Pearson's correlation coefficient of the average ranks.
+        def ranks(data):
+            return [(sum(v < x for v in data) + sum(v <= x for v in data) + 1)/2
+                    for x in data]
+        return stats.multivar.corr(ranks(xdata), ranks(ydata))
+
+    def testExample(self):
+        # Example from Wikipedia's article on Spearman's rho.
+        iq = [106, 86, 100, 101, 99, 103, 97, 113, 112, 110]
+        tv = [7, 0, 27, 50, 28, 29, 20, 12, 6, 17]
+        self.assertApproxEqual(self.func(iq, tv), -29/165)
+
+
+class KendallTest(RankCorrMixin, NumericTestCase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.func = stats.multivar.kendall
+
+    def naive(self, xdata, ydata):
+        # Count every pair of points.
+        concordant = discordant = xtied = ytied = 0
+        n = len(xdata)
+        for i in range(n):
+            for j in range(i+1, n):
+                sx = (xdata[i] > xdata[j]) - (xdata[i] < xdata[j])
+                sy = (ydata[i] > ydata[j]) - (ydata[i] < ydata[j])
+                if sx*sy > 0:
+                    concordant += 1
+                elif sx*sy < 0:
+                    discordant += 1
+                elif sx:
+                    ytied += 1
+                elif sy:
+                    xtied += 1
+        pairs = concordant + discordant
+        return (concordant - discordant)/math.sqrt(
+            (pairs + xtied)*(pairs + ytied))
+
+    def testExample(self):
+        data = [(1, 2), (2, 1), (3, 4), (4, 3), (5, 5)]
+        self.assertApproxEqual(self.func(data), 0.6)
+
+    def testManyBlocks(self):
+        # Large enough to exercise merging of the sorted blocks.
+        xdata = list(range(1000))
+        ydata = xdata[:]
+        random.shuffle(ydata)
+        self.assertApproxEqual(
+            self.func(xdata, ydata), self.naive(xdata, ydata))
+
+    def testInversions(self):
+        count = stats.multivar._count_inversions
+        self.assertEqual(count([]), 0)
+        self.assertEqual(count(list(range(100))), 0)
+        self.assertEqual(count(list(range(100, 0, -1))), 100*99//2)
+        # Ties across the merged blocks are not inversions.
+        data = [random.randrange(5) for _ in range(300)]
+        expected = sum(data[i] > data[j] for i in range(300)
+                       for j in range(i + 1, 300))
+        self.assertEqual(count(data), expected)
+
+
+class SkipNATest(NumericTestCase):
+    # Test pairwise-complete skipping of missing values.
+    rel = 1e-12
+
+    def testPairwiseComplete(self):
+        nan = float('nan')
+        xdata = [1.0, 2.0, None, 4.0, 5.0, 6.0, nan, 8.0]
+        ydata = [2.5, nan, 1.0, 3.5, None, 6.0, 2.0, 9.5]
+        pairs = [(x, y) for x, y in zip(xdata, ydata)
+                 if not stats._is_missing((x, y))]
+        xs, ys = zip(*pairs)
+        for func in (stats.multivar.qcorr, stats.multivar.corr,
+                     stats.multivar.pcov, stats.multivar.cov,
+                     stats.multivar.errsumsq, stats.multivar.linr,
+                     stats.multivar.spearman, stats.multivar.kendall):
+            expected = func(xs, ys)
+            self.assertApproxEqual(func(xdata, ydata, skipna=True), expected)
+            self.assertApproxEqual(
+                func(zip(xdata, ydata), skipna=True), expected)
+
+    def testOnePass(self):
+        xdata = [1.0, None, 3.0, 4.0, 7.0]
+        ydata = [2.0, 5.0, float('nan'), 3.0, 8.0]
+        for func in (stats.multivar.corr, stats.multivar.cov,
+                     stats.multivar.pcov):
+            expected = func([1.0, 4.0, 7.0], [2.0, 3.0, 8.0])
+            self.assertApproxEqual(
+                func(xdata, ydata, onepass=True, skipna=True), expected)
+
+    def testCount(self):
+        pairs = stats.dropna([(1, 2), (None, 3), (2, 5), (3, 7)])
+        self.assertApproxEqual(stats.multivar.cov(pairs), 2.5)
+        self.assertEqual(pairs.skipped, 1)
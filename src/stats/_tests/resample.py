@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file stats/__init__.py for the licence terms for this software.
+
+"""
+Test suite for the stats.resample module.
+
+"""
+
+import math
+import random
+import unittest
+
+import stats
+import stats.multivar
+import stats.order
+
+# The module to be tested:
+import stats.resample
+
+
+class SortedIndicesTest(unittest.TestCase):
+    def testSorted(self):
+        rng = random.Random(1)
+        for n in (1, 2, 10, 1000):
+            indices = stats.resample._sorted_indices(n, rng)
+            self.assertEqual(len(indices), n)
+            self.assertEqual(indices, sorted(indices))
+            self.assertTrue(0 <= indices[0] and indices[-1] < n)
+
+    def testUniform(self):
+        # Each index is drawn with probability 1/n.
+        rng = random.Random(2)
+        n = 10
+        counts = [0]*n
+        for _ in range(2000):
+            for i in stats.resample._sorted_indices(n, rng):
+                counts[i] += 1
+        for count in counts:
+            self.assertTrue(1800 < count < 2200, counts)
+
+
+class NormalTest(unittest.TestCase):
+    def testRoundTrip(self):
+        for p in (1e-300, 1e-10, 0.001, 0.02, 0.1, 0.5, 0.8, 0.975, 0.999):
+            x = stats.resample._ndtri(p)
+            self.assertAlmostEqual(stats.resample._ndtr(x)/p, 1.0, places=12)
+
+    def testKnownValues(self):
+        ndtri = stats.resample._ndtri
+        self.assertEqual(ndtri(0.5), 0.0)
+        self.assertAlmostEqual(ndtri(0.975), 1.959963984540054, places=14)
+        self.assertAlmostEqual(ndtri(0.025), -1.959963984540054, places=14)
+        self.assertRaises(ValueError, ndtri, 0.0)
+        self.assertRaises(ValueError, ndtri, 1.0)
+
+
+class JackknifeTest(unittest.TestCase):
+    def testLeaveOneOut(self):
+        data = [3, 1, 4, 1, 5, 9, 2, 6]
+        expected = [stats.mean(sorted(data)[:i] + sorted(data)[i+1:])
+                    for i in range(len(data))]
+        self.assertEqual(stats.resample.jackknife(data, stats.mean),
+                         expected)
+
+    def testGroups(self):
+        data = list(range(1000))
+        result = stats.resample.jackknife(data, len)
+        self.assertEqual(result, [995]*200)
+        result = stats.resample.jackknife(data, min, groups=10)
+        self.assertEqual(result, [1] + [0]*9)
+
+    def testBadGroups(self):
+        self.assertRaises(ValueError, stats.resample.jackknife, [1, 2], len,
+                          groups=3)
+        self.assertRaises(ValueError, stats.resample.jackknife, [1, 2], len,
+                          groups=1)
+
+
+class BootstrapTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(5)
+        self.data = [rng.gauss(10, 2) for _ in range(200)]
+
+    def testReproducible(self):
+        bootstrap = stats.resample.bootstrap
+        a = bootstrap(self.data, stats.mean, 100, seed=7)
+        b = bootstrap(self.data, stats.mean, 100, seed=7)
+        self.assertEqual(a, b)
+        c = bootstrap(self.data, stats.mean, 100, seed=8)
+        self.assertNotEqual(a.replicates, c.replicates)
+        d = bootstrap(self.data, stats.mean, 100)
+        self.assertEqual(bootstrap(self.data, stats.mean, 100, seed=d.seed),
+                         d)
+
+    def testProcesses(self):
+        # The results don't depend on the number of processes.
+        bootstrap = stats.resample.bootstrap
+        a = bootstrap(self.data, stats.order.median, 50, seed=3)
+        b = bootstrap(self.data, stats.order.median, 50, seed=3, processes=2)
+        self.assertEqual(a, b)
+
+    def testPercentile(self):
+        result = stats.resample.bootstrap(self.data, stats.mean, 500, seed=1,
+                                          bca=False)
+        self.assertIsNone(result.bca)
+        self.assertEqual(result.estimate, stats.mean(self.data))
+        self.assertEqual(result.replicates, sorted(result.replicates))
+        self.assertEqual(len(result.replicates), 500)
+        low, high = result.percentile
+        self.assertTrue(low < result.estimate < high)
+        self.assertEqual(low, stats.order.quantile(result.replicates, 0.025,
+                                                   scheme=7))
+
+    def testNormalMean(self):
+        # For the mean of normal data, both intervals are close to the
+        # usual normal interval.
+        result = stats.resample.bootstrap(self.data, stats.mean, 2000, seed=2)
+        half = 1.96*stats.stdev(self.data)/math.sqrt(len(self.data))
+        m = result.estimate
+        for low, high in (result.percentile, result.bca):
+            self.assertAlmostEqual(low, m - half, delta=0.1*half)
+            self.assertAlmostEqual(high, m + half, delta=0.1*half)
+
+    def testBCaSkewed(self):
+        # For skewed data the BCa interval of the mean shifts to the right.
+        rng = random.Random(4)
+        data = [rng.expovariate(1.0) for _ in range(100)]
+        result = stats.resample.bootstrap(data, stats.mean, 2000, seed=4)
+        self.assertGreater(result.bca.low, result.percentile.low)
+        self.assertGreater(result.bca.high, result.percentile.high)
+
+    def testConstant(self):
+        result = stats.resample.bootstrap([2.5]*20, stats.mean, 50, seed=0)
+        self.assertEqual(result.percentile, (2.5, 2.5))
+        self.assertEqual(result.bca, (2.5, 2.5))
+
+    def testPairs(self):
+        rng = random.Random(6)
+        xs = [rng.random() for _ in range(100)]
+        pairs = [(x, x + rng.gauss(0, 0.1)) for x in xs]
+        result = stats.resample.bootstrap(pairs, stats.multivar.corr, 200,
+                                          seed=6)
+        self.assertEqual(result.estimate, stats.multivar.corr(pairs))
+        self.assertTrue(result.bca.low < result.estimate < result.bca.high)
+
+    def testErrors(self):
+        bootstrap = stats.resample.bootstrap
+        self.assertRaises(stats.StatsError, bootstrap, [], stats.mean)
+        self.assertRaises(ValueError, bootstrap, [1, 2], stats.mean, 1)
+        for confidence in (0, 1, 1.5):
+            self.assertRaises(ValueError, bootstrap, [1, 2], stats.mean,
+                              confidence=confidence)
+        self.assertRaises(ValueError, bootstrap, [1, 2], stats.mean,
+                          processes=0)
+
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file stats/__init__.py for the licence terms for this software.
+
+"""
+Test suite for the stats.sample module.
+
+"""
+
+import array
+import operator
+import random
+import unittest
+
+from decimal import Decimal
+from fractions import Fraction
+
+import stats
+import stats.order
+import stats.univar
+
+# The module to be tested:
+from stats.sample import Sample
+
+
+FUNCTIONS = [
+    ('sum', stats.sum), ('mean', stats.mean), ('variance', stats.variance),
+    ('stdev', stats.stdev), ('pvariance', stats.pvariance),
+    ('pstdev', stats.pstdev), ('skewness', stats.univar.skewness),
+    ('pskewness', stats.univar.pskewness),
+    ('kurtosis', stats.univar.kurtosis),
+    ('pkurtosis', stats.univar.pkurtosis), ('mode', stats.univar.mode),
+    ('median', stats.order.median), ('quartiles', stats.order.quartiles),
+    ('iqr', stats.order.iqr), ('mad', stats.order.mad),
+    ('qn', stats.order.qn), ('sn', stats.order.sn),
+    ]
+
+
+class SampleTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.floats = [rng.gauss(10, 3) for _ in range(501)]
+        self.ints = [rng.randint(0, 20) for _ in range(200)]
+
+    def outcome(self, func, *args):
+        try:
+            return func(*args)
+        except Exception as err:
+            return type(err)
+
+    def check_identical(self, data):
+        sample = Sample(data)
+        for name, func in FUNCTIONS:
+            # Call twice: the second call uses the cached values.
+            for _ in range(2):
+                expected = self.outcome(func, data)
+                result = self.outcome(getattr(sample, name))
+                self.assertEqual(result, expected, name)
+                self.assertIs(type(result), type(expected), name)
+
+    def testIdentical(self):
+        self.check_identical(self.floats)
+        self.check_identical(self.ints)
+        self.check_identical(array.array('d', self.floats))
+        self.check_identical([Fraction(x, 7) for x in self.ints])
+        self.check_identical([Decimal(x)/4 for x in self.ints])
+
+    def testSmallData(self):
+        for data in ([], [1.5], [2.0, 3.0], [1, 2, 4]):
+            self.check_identical(data)
+
+    def testArguments(self):
+        sample = Sample(self.floats)
+        data = self.floats
+        self.assertEqual(sample.variance(10), stats.variance(data, 10))
+        self.assertEqual(sample.pstdev(10), stats.pstdev(data, 10))
+        self.assertEqual(sample.skewness(10, 3),
+                         stats.univar.skewness(data, 10, 3))
+        self.assertEqual(sample.kurtosis(s=3),
+                         stats.univar.kurtosis(data, s=3))
+        self.assertEqual(sample.sum(1.5), stats.sum(data, 1.5))
+        for scheme in (1, 2, 3, 4):
+            self.assertEqual(sample.median(scheme),
+                             stats.order.median(data, scheme))
+            self.assertEqual(sample.mad(scheme=scheme, scale='normal'),
+                             stats.order.mad(data, scheme=scheme,
+                                             scale='normal'))
+        self.assertEqual(sample.quantile(0.1, 7),
+                         stats.order.quantile(data, 0.1, 7))
+        self.assertEqual(sample.quartiles(5),
+                         stats.order.quartiles(data, 5))
+
+    def testImmutable(self):
+        data = [1.0, 2.0, 4.0]
+        sample = Sample(data)
+        data[0] = 100.0
+        self.assertEqual(sample.mean(), 7/3)
+        self.assertEqual(list(sample), [1.0, 2.0, 4.0])
+        self.assertRaises(AttributeError, setattr, sample, 'x', 1)
+        self.assertRaises(TypeError, operator.setitem, sample, 0, 2.0)
+
+    def testStorage(self):
+        self.assertIsInstance(Sample([1.0, 2.5])._data, array.array)
+        self.assertIsInstance(Sample([1, 2.5])._data, tuple)
+        self.assertIsInstance(Sample(iter([1, 2]))._data, tuple)
+        self.assertRaises(TypeError, Sample, 'abc')
+
+    def testSequence(self):
+        sample = Sample([3, 1, 2])
+        self.assertEqual(len(sample), 3)
+        self.assertEqual(sample[0], 3)
+        self.assertEqual(list(sample[1:]), [1, 2])
+        self.assertEqual(list(Sample(sample)), [3, 1, 2])
+
+    def testCached(self):
+        sample = Sample(self.floats)
+        sample.skewness()
+        sample.median()
+        cached = dict(sample._cache)
+        sample.kurtosis()
+        sample.quartiles()
+        for key in cached:
+            self.assertIs(sample._cache[key], cached[key])
+
+    def testFreqTable(self):
+        sample = Sample([1, 2, 2, 3])
+        table = sample.freq_table()
+        self.assertEqual(table, {1: 1, 2: 2, 3: 1})
+        table[1] = 10
+        self.assertEqual(sample.freq_table()[1], 1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file stats/__init__.py for the licence terms for this software.
+
+"""
+Test suite for the stats.vectorize module.
+
+"""
+
+import array
+import math
+import operator
+import unittest
+
+# The module to be tested:
+import stats.vectorize as v
+
+
+class IsIterableTest(unittest.TestCase):
+    def testScalars(self):
+        for obj in (42, 4.5, 1j, None, object()):
+            self.assertFalse(v.isiterable(obj))
+            # And again, from the cache.
+            self.assertFalse(v.isiterable(obj))
+
+    def testIterables(self):
+        for obj in ([], (), 'abc', {}, set(), iter([]), array.array('d')):
+            self.assertTrue(v.isiterable(obj))
+            self.assertTrue(v.isiterable(obj))
+
+
+class ApplyTest(unittest.TestCase):
+    def testScalar(self):
+        self.assertEqual(v.apply(operator.add, 2, 3), 5)
+
+    def testBroadcast(self):
+        self.assertEqual(v.apply(operator.add, [1, 2, 3], 10), [11, 12, 13])
+        self.assertEqual(v.apply(operator.add, iter([1, 2]), [3, 4]), [4, 6])
+
+    def testKeywords(self):
+        f = lambda x, y=0: x - y
+        self.assertEqual(v.apply(f, [5, 6], y=1), [4, 5])
+
+    def testStrict(self):
+        self.assertRaises(ValueError, v.apply, operator.add, [1, 2], [1])
+
+    def testArrays(self):
+        x = array.array('d', [1.0, 4.0, 9.0])
+        self.assertEqual(v.sqrt(x), [1.0, 2.0, 3.0])
+        self.assertEqual(v.apply(operator.sub, x, array.array('i', [1, 2, 3])),
+                         [0.0, 2.0, 6.0])
+        self.assertRaises(ValueError, v.apply, operator.sub, x,
+                          array.array('d', [1.0]))
+
+
+class ApplyOpTest(unittest.TestCase):
+    def testScalars(self):
+        self.assertEqual(v.add(2, 3), 5)
+        self.assertEqual(v.div(1, 4), 0.25)
+
+    def testLists(self):
+        self.assertEqual(v.add([1, 2], [3, 4]), [4, 6])
+        self.assertEqual(v.sub([1, 2], 1), [0, 1])
+        self.assertEqual(v.mul(2, [1, 2]), [2, 4])
+        self.assertRaises(ValueError, v.add, [1, 2], [1, 2, 3])
+
+    def testArrays(self):
+        x = array.array('d', [1.0, 2.0, 4.0])
+        y = array.array('d', [0.5, 0.5, 2.0])
+        self.assertEqual(v.add(x, y), [1.5, 2.5, 6.0])
+        self.assertEqual(v.div(x, 2), [0.5, 1.0, 2.0])
+        self.assertEqual(v.add(x, (1, 1, 1)), [2.0, 3.0, 5.0])
+        self.assertRaises(ValueError, v.add, x, array.array('d', [1.0]))
+        self.assertRaises(ValueError, v.add, [1.0], x)
+
+    def testIterators(self):
+        self.assertEqual(v.add(iter([1, 2]), [3, 4]), [4, 6])
+        self.assertRaises(ValueError, v.add, iter([1, 2]), iter([3]))
@@ -4,26 +4,33 @@
 ##  See the file __init__.py for the licence terms for this software.
 
 """
-The ``stats.co`` module provides eight coroutine based statistics functions:
-
-    Function        Description
-    ==============  =============================================
-    corr            Correlation coefficient of (X, Y) data.
-    ewma            Exponentially weighted moving average.
-    mean            Running arithmetic mean (average).
-    pstdev          Population standard deviation of data.
-    pvariance       Population variance of data.
-    stdev           Sample standard deviation of data.
-    sum             Running sum of data.
-    variance        Sample variance of data (bias-corrected).
+The ``stats.co`` module provides thirteen coroutine based statistics
+functions:
+
+    Function          Description
+    ================  =============================================
+    circular_summary  Mean and spread of circular data, e.g. angles.
+    corr              Correlation coefficient of (X, Y) data.
+    ewma              Exponentially weighted moving average.
+    linr              Linear regression coefficients of (X, Y) data.
+    mean              Running arithmetic mean (average).
+    minmax            Running minimum and maximum.
+    pstdev            Population standard deviation of data.
+    pvariance         Population variance of data.
+    reservoir         Random sample of a stream, e.g. for quantiles.
+    rollup            Statistics of time buckets of (time, value) data.
+    stdev             Sample standard deviation of data.
+    sum               Running sum of data.
+    variance          Sample variance of data (bias-corrected).
 
 The function ``stats.co.sum`` is an alias to ``stats.running_sum``.
 
-The module also includes one public utility function:
+The module also includes two public utilities:
 
     Name            Description
     ==============  =============================================
     feed            Convert coroutines into iterators.
+    Reservoir       Mergeable fixed-size random sample of a stream.
 
 
 
@@ -82,14 +89,18 @@ the consumer. For example:
 """
 
 __all__ = [
-    'corr', 'ewma', 'feed', 'mean', 'pstdev', 'pvariance', 'stdev',
-    'sum', 'variance',
+    'Bucket', 'circular_summary', 'corr', 'ewma', 'feed', 'linr', 'mean',
+    'minmax', 'pstdev', 'pvariance', 'Reservoir', 'reservoir', 'rollup',
+    'stdev', 'sum', 'variance',
     ]
 
 
 import collections
+import heapq
 import itertools
 import math
+import operator
+import random
 
 import stats
 
@@ -411,6 +422,323 @@ def _terriberry(data):
     # kurtosis = (n*M4) / (M2*M2) - 3
 
 
+# === Order statistics ===
+
+@stats.coroutine
+def minmax(key=None):
+    """Running minimum and maximum co-routine.
+
+    minmax() consumes values and returns the smallest and largest values
+    seen so far, as a two-tuple:
+
+    >>> mm = minmax()
+    >>> [mm.send(x) for x in (5, 3, 8, 4)]
+    [(5, 5), (3, 5), (3, 8), (3, 8)]
+
+    The optional argument ``key`` specifies a key function, as for
+    ``stats.minmax``.
+    """
+    x = (yield None)
+    minimum = maximum = x
+    keyed_min = keyed_max = x if key is None else key(x)
+    while True:
+        x = (yield (minimum, maximum))
+        keyed = x if key is None else key(x)
+        if keyed < keyed_min:
+            keyed_min, minimum = keyed, x
+        elif keyed > keyed_max:
+            keyed_max, maximum = keyed, x
+
+
+# === Sampling ===
+
+class Reservoir:
+    """Reservoir(k [, data, weighted, seed]) -> random sample of a stream
+
+    A fixed-size random sample of at most ``k`` of the values seen, for
+    estimating order statistics of streams too large to keep in memory.
+    Every value seen is equally likely to be in the sample. The reservoir
+    is a sequence of the sampled values, in no particular order, so it can
+    be passed straight to ``stats.order.median``, ``quartiles``,
+    ``quantile``, ``mad``, ``fivenum`` and the like:
+
+    >>> import stats.order
+    >>> sample = Reservoir(100, range(1, 1000001), seed=7)
+    >>> len(sample), sample.count
+    (100, 1000000)
+    >>> 400000 < stats.order.median(sample) < 600000
+    True
+
+    Values can be added one at a time with ``add``, or from an iterable with
+    ``update``. Once the reservoir is full, the number of values to skip
+    before the next one is sampled is drawn directly (Li's Algorithm L), so
+    only a few random numbers are needed per sampled value rather than one
+    per value seen, and ``update`` skips the others without looking at
+    them.
+
+    If ``weighted`` is true, values are added as ``add(x, weight)``, or as
+    (value, weight) pairs with ``update``, and each value is sampled with
+    probability proportional to its weight (Efraimidis and Spirakis'
+    A-ExpJ, which likewise jumps over the values between samples):
+
+    >>> sample = Reservoir(2, [('a', 1), ('b', 100), ('c', 1)], True, seed=1)
+    >>> 'b' in sample
+    True
+
+    Reservoirs of separate parts of a stream, e.g. from parallel workers,
+    can be combined with ``merge``; the result is a sample of the whole
+    stream. ``seed`` seeds the random number generator, for reproducible
+    samples.
+    """
+
+    def __init__(self, k, data=None, weighted=False, seed=None):
+        if k < 1:
+            raise stats.StatsError('reservoir size must be at least 1')
+        self.k = k
+        self.weighted = weighted
+        # The number of values seen, and their total weight if weighted.
+        self.count = 0
+        self.weight = 0
+        self._rng = random.Random(seed)
+        # Sampled values, or a min-heap of [log key, tie-breaker, value] if
+        # weighted, where the values with the largest keys are kept.
+        self._items = []
+        # Values (or weight) still to skip before the next is sampled.
+        self._skip = 0
+        if data is not None:
+            self.update(data)
+
+    def __repr__(self):
+        return '<%s of %d from %d values>' % (
+            type(self).__name__, len(self._items), self.count)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        if self.weighted:
+            return map(operator.itemgetter(2), self._items)
+        return iter(self._items)
+
+    def __getitem__(self, i):
+        if self.weighted:
+            if isinstance(i, slice):
+                return [item[2] for item in self._items[i]]
+            return self._items[i][2]
+        return self._items[i]
+
+    def _random(self):
+        # A random number in (0, 1], so that its log is finite.
+        return 1.0 - self._rng.random()
+
+    def _restart(self):
+        # Draw the number of values to skip for a full reservoir.
+        log = math.log
+        if self.weighted:
+            # The key of the next value to be sampled must beat the smallest
+            # key in the reservoir; skip weight until it does.
+            self._skip = log(self._random())/self._items[0][0]
+        else:
+            # self._w is distributed as the largest of the random keys of
+            # the sampled values, i.e. the kth smallest of count uniform
+            # keys; the next value sampled is the next key below it.
+            w = self._w
+            self._skip = int(log(self._random())/math.log1p(-w))
+
+    def _fill(self):
+        # Start skipping when the reservoir has just become full.
+        if not self.weighted:
+            self._w = self._rng.betavariate(self.k, self.count - self.k + 1)
+        self._restart()
+
+    def _replace(self, x, weight=None):
+        # Replace a random (or the lowest-keyed) sampled value with x.
+        rng = self._rng
+        if self.weighted:
+            items = self._items
+            t = math.exp(weight*items[0][0])
+            key = math.log(rng.uniform(t, 1.0))/weight
+            heapq.heapreplace(items, [key, self.count, x])
+        else:
+            self._items[int(rng.random()*self.k)] = x
+            self._w *= math.exp(math.log(self._random())/self.k)
+        self._restart()
+
+    def add(self, x, weight=None):
+        """Add value x to the stream (with the given weight if weighted)."""
+        if self.weighted and (weight is None or weight < 0):
+            raise stats.StatsError('weights must be non-negative')
+        self.count += 1
+        if self.weighted:
+            if not weight:
+                return
+            self.weight += weight
+        items = self._items
+        if len(items) < self.k:
+            if self.weighted:
+                key = math.log(self._random())/weight
+                heapq.heappush(items, [key, self.count, x])
+            else:
+                items.append(x)
+            if len(items) == self.k:
+                self._fill()
+        elif self.weighted:
+            self._skip -= weight
+            if self._skip <= 0:
+                self._replace(x, weight)
+        elif self._skip:
+            self._skip -= 1
+        else:
+            self._replace(x)
+
+    def update(self, data):
+        """Add an iterable of values (or (value, weight) pairs if weighted)
+        to the stream."""
+        if self.weighted:
+            add = self.add
+            for x, weight in data:
+                add(x, weight)
+            return
+        it = iter(data)
+        items = self._items
+        room = self.k - len(items)
+        if room:
+            new = list(itertools.islice(it, room))
+            self.count += len(new)
+            items.extend(new)
+            if len(new) < room:
+                return
+            self._fill()
+        # Pass over the skipped values in C, keeping only the last value
+        # read and how many were read.
+        last = collections.deque(maxlen=1)
+        islice, counter = itertools.islice, itertools.count
+        while True:
+            want = self._skip + 1
+            last.extend(zip(counter(1), islice(it, want)))
+            if not last:
+                return
+            read, x = last.pop()
+            self.count += read
+            if read < want:
+                self._skip -= read
+                return
+            self._replace(x)
+
+    def merge(self, other):
+        """Return a new Reservoir sampling the values of self and other."""
+        if (self.k, self.weighted) != (other.k, other.weighted):
+            raise stats.StatsError(
+                'only reservoirs of the same size and kind can be merged')
+        new = type(self)(self.k, weighted=self.weighted)
+        new._rng.setstate(self._rng.getstate())
+        new.count = self.count + other.count
+        new.weight = self.weight + other.weight
+        if self.weighted:
+            # Keys are independent of the stream, so keep the largest.
+            items = heapq.nlargest(self.k, self._items + other._items)
+            heapq.heapify(items)
+            new._items = items
+        elif new.count <= self.k:
+            new._items = self._items + other._items
+        else:
+            # Draw k values without replacement from the two streams, taking
+            # each from one stream or the other in proportion to the number
+            # of its values not yet drawn. Each stream's sample is a uniform
+            # sample of that stream, so any of its values will do.
+            rng = new._rng
+            a, b = self._items[:], other._items[:]
+            na, nb = self.count, other.count
+            for _ in range(self.k):
+                if rng.random()*(na + nb) < na:
+                    source = a
+                    na -= 1
+                else:
+                    source = b
+                    nb -= 1
+                i = int(rng.random()*len(source))
+                source[i], source[-1] = source[-1], source[i]
+                new._items.append(source.pop())
+        if len(new._items) == new.k:
+            new._fill()
+        return new
+
+
+@stats.coroutine
+def reservoir(k, weighted=False, seed=None):
+    """Reservoir sampling co-routine.
+
+    ``reservoir`` consumes values and returns a ``Reservoir``: a uniform
+    random sample of at most ``k`` of the values seen, which can be passed
+    to the functions of ``stats.order`` to estimate the median, quartiles
+    and so on of an unbounded stream:
+
+    >>> import stats.order
+    >>> r = reservoir(1000, seed=1)
+    >>> for x in range(100000):
+    ...     sample = r.send(x)
+    ...
+    >>> len(sample), sample.count
+    (1000, 100000)
+    >>> 45000 < stats.order.median(sample) < 55000
+    True
+
+    The same ``Reservoir`` is returned each time, updated in place. If
+    ``weighted`` is true, send (value, weight) pairs instead, and values are
+    sampled with probability proportional to their weight.
+    """
+    sample = Reservoir(k, weighted=weighted, seed=seed)
+    add = sample.add
+    if weighted:
+        x, weight = (yield None)
+        while True:
+            add(x, weight)
+            x, weight = (yield sample)
+    else:
+        x = (yield None)
+        while True:
+            add(x)
+            x = (yield sample)
+
+
+# === Circular quantities ===
+
+@stats.coroutine
+def circular_summary(deg=True):
+    """Running circular statistics co-routine.
+
+    ``circular_summary`` consumes angles and returns the
+    ``stats.univar.CircularSummary`` of the angles seen so far: the mean
+    direction, mean resultant length R, circular variance and circular
+    standard deviation. This is suitable for wind directions or times of
+    day, for example.
+
+    >>> cs = circular_summary()
+    >>> for angle in (350, 10, 20, 340):
+    ...     result = cs.send(angle)
+    ...
+    >>> round(result.mean, 9), round(result.length, 3)
+    (0.0, 0.962)
+
+    If optional argument deg is a true value (the default), the angles are
+    degrees, otherwise radians. Only the high-precision sums of the cosines
+    and sines are kept, so each value takes constant time and memory.
+    """
+    from stats.univar import _circular_summary
+    add_partial = stats.add_partial
+    cosines, sines = [], []
+    n = 0
+    theta = (yield None)
+    while True:
+        if deg:
+            theta = math.radians(theta)
+        n += 1
+        add_partial(math.cos(theta), cosines)
+        add_partial(math.sin(theta), sines)
+        theta = (yield _circular_summary(
+            n, math.fsum(cosines), math.fsum(sines), deg))
+
+
 # === Multivariate functions ===
 
 def _calc_r(sumsqx, sumsqy, sumco):
@@ -487,3 +815,204 @@ def corr():
         x,y = (yield r)
         i += 1
 
+
+
+@stats.coroutine
+def linr(decay=1, stderr=False):
+    """Running linear regression coroutine.
+
+    ``linr`` consumes (X,Y) pairs and returns the y-intercept ``a`` and
+    slope ``b`` of the least-squares regression line of the data points
+    seen so far, as a tuple ``(a, b)``:
+
+    >>> xdata = [1, 2, 3, 4, 5]
+    >>> ydata = [3.5, 5.5, 7.5, 9.5, 11.5]
+    >>> lr = linr()
+    >>> for x,y in zip(xdata, ydata):
+    ...     print(lr.send((x, y)))
+    ...
+    (nan, nan)
+    (1.5, 2.0)
+    (1.5, 2.0)
+    (1.5, 2.0)
+    (1.5, 2.0)
+
+    The regression line is not defined until at least two different X
+    values have been seen; until then the coefficients are NANs.
+
+    If optional argument ``stderr`` is true, the residual standard error
+    (the standard deviation of the errors about the regression line, with
+    N-2 degrees of freedom) is returned as a third item, ``(a, b, se)``:
+
+    >>> lr = linr(stderr=True)
+    >>> for x,y in zip(xdata, [3, 6, 7, 10, 11]):
+    ...     a, b, se = lr.send((x, y))
+    ...
+    >>> print(round(a, 12), b, round(se, 12))
+    1.4 2.0 0.632455532034
+
+    Optional argument ``decay`` is a forgetting factor between 0 and 1
+    (the default). Before each new point is added, the weights of all the
+    previous points are multiplied by ``decay``, so that old data is
+    exponentially forgotten and the line tracks recent trends. With decay,
+    N in the degrees of freedom is the sum of the weights.
+
+    ``linr`` uses the same numerically stable updates as ``corr``, and takes
+    constant time and memory per data point.
+    """
+    if not stats._is_numeric(decay):
+        raise stats.StatsError('decay must be a number')
+    if not 0 < decay <= 1:
+        raise stats.StatsError('decay must be in the range 0 < decay <= 1')
+    nan = float('nan')
+    sumsqx = 0  # weighted sum of the squared deviations of x
+    sumsqy = 0  # weighted sum of the squared deviations of y
+    sumco = 0  # weighted sum of the co-products of the deviations
+    w = 1  # total weight
+    x,y = (yield None)
+    mx = x  # First estimate of the means are the first values.
+    my = y
+    while True:
+        # Standard sweep update, weighting the new point by 1 against a
+        # total weight w-1 for the (decayed) previous points.
+        sweep = (w-1)/w
+        dx = x - mx
+        dy = y - my
+        sumsqx += sweep*dx**2
+        sumsqy += sweep*(dy**2)
+        sumco += sweep*(dx*dy)
+        mx += dx/w  # Update the means.
+        my += dy/w
+        if sumsqx == 0:
+            a = b = nan
+        else:
+            b = sumco/sumsqx
+            a = my - b*mx
+        if stderr:
+            if sumsqx == 0 or w <= 2:
+                se = nan
+            else:
+                # Clamp rounding errors which make the residual sum of
+                # squares slightly negative.
+                rss = max(sumsqy - b*sumco, 0.0)
+                se = math.sqrt(rss/(w - 2))
+            result = (a, b, se)
+        else:
+            result = (a, b)
+        x,y = (yield result)
+        if decay != 1:
+            sumsqx *= decay
+            sumsqy *= decay
+            sumco *= decay
+            w *= decay
+        w += 1
+
+
+# === Time series ===
+
+Bucket = collections.namedtuple(
+    'Bucket', 'width start count sum mean variance stdev min max')
+Bucket.__doc__ = """Statistics of the values in one time bucket.
+
+    width       the width of the bucket
+    start       the start time; the bucket covers start <= t < start+width
+    count ...   as for ``stats.group.GroupSummary``
+    """
+
+
+@stats.coroutine
+def rollup(widths, hop=None, lateness=0):
+    """Time-bucketed aggregation co-routine.
+
+    ``rollup`` consumes (timestamp, value) pairs, and returns a list of the
+    buckets closed by each pair, as ``Bucket`` named tuples with the count,
+    sum, mean, variance, standard deviation, minimum and maximum of the
+    values in each bucket. ``widths`` is a list of bucket widths, e.g.
+    (1, 60, 3600) for seconds, minutes and hours, where each width is a
+    multiple of the one before:
+
+    >>> r = rollup([10, 60])
+    >>> r.send((0, 1.0)), r.send((4, 3.0)), r.send((12, 5.0))
+    ([], [], [Bucket(width=10, start=0, count=2, sum=4.0, mean=2.0, variance=2.0, stdev=1.4142135623730951, min=1.0, max=3.0)])
+    >>> [(b.width, b.start, b.count) for b in r.send((61, 2.0))]
+    [(10, 10, 1), (60, 0, 3)]
+
+    Only the finest buckets see the raw values. When a bucket closes, its
+    state is merged into the coarser bucket containing it, so each width
+    costs one merge per closed bucket of the width below. Buckets which
+    receive no values are not returned.
+
+    A bucket closes once a timestamp at least ``lateness`` past its end has
+    been seen, so that values arriving up to ``lateness`` out of order are
+    still counted; later values whose bucket has already closed are
+    ignored. Send None at the end of the stream to close every bucket:
+
+    >>> [(b.width, b.start, b.count) for b in r.send(None)]
+    [(10, 60, 1), (60, 60, 1)]
+
+    If ``hop`` is given, the finest buckets are hopping windows instead of
+    tumbling ones: a window of ``widths[0]`` starts every ``hop``, so that
+    windows overlap. They are built by merging panes of width ``hop``, and
+    the coarser widths are built from the panes.
+    """
+    widths = list(widths)
+    if not widths:
+        raise stats.StatsError('at least one bucket width is required')
+    for a, b in zip([hop or widths[0]] + widths, widths):
+        if not 0 < a <= b or b % a:
+            raise stats.StatsError(
+                'each bucket width must be a multiple of the one before')
+    if lateness < 0:
+        raise stats.StatsError('lateness cannot be negative')
+    from stats.group import _Accumulator
+    pane = hop or widths[0]
+    # [width, step between window starts, open windows by start]
+    levels = [(widths[0], pane, {})] + [(w, w, {}) for w in widths[1:]]
+    panes = {}
+    closed = None  # Every pane ending at or before this has closed.
+    watermark = None  # Latest timestamp seen.
+    result = None
+    while True:
+        item = (yield result)
+        result = []
+        if item is None:
+            boundary = float('inf')
+        else:
+            t, x = item
+            if closed is not None and t < closed:
+                continue  # Too late.
+            start = t - t % pane
+            acc = panes.get(start)
+            if acc is None:
+                panes[start] = _Accumulator(x)
+            else:
+                acc.add(x)
+            if watermark is None or t > watermark:
+                watermark = t
+            boundary = watermark - lateness
+            boundary -= boundary % pane
+            if closed is not None and boundary <= closed:
+                continue
+        closed = boundary
+        # Close the panes, and cascade them into the coarser buckets.
+        done = sorted(s for s in panes if s + pane <= boundary)
+        source = [(s, s + pane, panes.pop(s)) for s in done]
+        for width, step, windows in levels:
+            for s, end, acc in source:
+                # Merge into every open window containing the source.
+                start = s - s % step
+                while start + width >= end:
+                    window = windows.get(start)
+                    if window is None:
+                        windows[start] = acc.copy()
+                    else:
+                        window.merge_from(acc)
+                    start -= step
+            done = sorted(s for s in windows if s + width <= boundary)
+            closed_windows = [(s, s + width, windows.pop(s)) for s in done]
+            result.extend(Bucket(width, s, *acc.summary())
+                          for s, end, acc in closed_windows)
+            if step == width:
+                # Hopping windows overlap, so coarser buckets are built from
+                # the panes instead.
+                source = closed_windows
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file __init__.py for the licence terms for this software.
+
+"""
+Group-by aggregation of statistics in a single pass.
+
+``group_stats`` calculates the count, sum, mean, variance, standard
+deviation, minimum and maximum of the values of each group of a stream of
+records, in one pass and without keeping the values:
+
+>>> records = [('a', 1.0), ('b', 10.0), ('a', 2.0), ('a', 6.0)]
+>>> result = group_stats(records)
+>>> result['a']
+GroupSummary(count=3, sum=9.0, mean=3.0, variance=7.0, stdev=2.6457513110645907, min=1.0, max=6.0)
+
+Only a small accumulator is kept for each key. To process the records in
+parallel, build a ``GroupTable`` from each part and merge them.
+"""
+
+__all__ = ['group_stats', 'GroupSummary', 'GroupTable']
+
+
+import collections
+import math
+import operator
+
+import stats
+
+
+GroupSummary = collections.namedtuple(
+    'GroupSummary', 'count sum mean variance stdev min max')
+GroupSummary.__doc__ = """Statistics of the values of one group.
+
+    count       the number of values
+    sum         the high-precision sum
+    mean        the arithmetic mean
+    variance    the sample variance, or NAN if there is only one value
+    stdev       the sample standard deviation, or NAN likewise
+    min, max    the smallest and largest values
+    """
+
+
+class _Accumulator:
+    # Running state for one group: the count, the high-precision partial
+    # sums, Welford's running mean and sum of squared deviations, and the
+    # minimum and maximum.
+    __slots__ = ('n', 'partials', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self, x):
+        self.n = 1
+        self.partials = [x]
+        self.mean = x
+        self.m2 = 0*x
+        self.min = self.max = x
+
+    def add(self, x):
+        self.n += 1
+        stats.add_partial(x, self.partials)
+        delta = x - self.mean
+        self.mean += delta/self.n
+        self.m2 += delta*(x - self.mean)
+        if x < self.min:
+            self.min = x
+        elif x > self.max:
+            self.max = x
+
+    def copy(self):
+        new = _Accumulator.__new__(_Accumulator)
+        new.n, new.mean, new.m2 = self.n, self.mean, self.m2
+        new.partials = self.partials[:]
+        new.min, new.max = self.min, self.max
+        return new
+
+    def merge_from(self, other):
+        # Merge other into self in place, using the pairwise update
+        # formula of Chan, Golub and LeVeque.
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        self.mean += delta*nb/n
+        self.m2 += other.m2 + delta*delta*na*nb/n
+        for x in other.partials:
+            stats.add_partial(x, self.partials)
+        self.n = n
+        if other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+
+    def summary(self):
+        n, partials = self.n, self.partials
+        if all(type(x) is float for x in partials):
+            total = math.fsum(partials)
+        else:
+            total = sum(partials)
+        if n > 1:
+            variance = self.m2/(n - 1)
+            stdev = math.sqrt(variance)
+        else:
+            variance = stdev = float('nan')
+        return GroupSummary(n, total, total/n, variance, stdev, self.min,
+                            self.max)
+
+
+class GroupTable:
+    """Running statistics of groups of values.
+
+    GroupTable() -> empty table
+    GroupTable(records [, key, value]) -> table of the given records
+
+    Records are split into groups by ``key(record)``, and the statistics
+    of ``value(record)`` are accumulated for each group. By default,
+    records are (key, value) pairs.
+
+    >>> table = GroupTable([('x', 2), ('y', 5), ('x', 4)])
+    >>> sorted(table)
+    ['x', 'y']
+    >>> table['x'].mean
+    3.0
+
+    Values can be added one at a time with ``add``, or from an iterable of
+    records with ``update``. Tables calculated from separate parts of the
+    data, e.g. by parallel workers, can be combined with ``merge``:
+
+    >>> other = GroupTable([('y', 7), ('z', 1)])
+    >>> merged = table.merge(other)
+    >>> merged['y'].count, merged['y'].mean
+    (2, 6.0)
+
+    Indexing the table with a key returns the ``GroupSummary`` of that
+    group; ``summaries`` returns a dict of them all.
+    """
+
+    def __init__(self, records=None, key=None, value=None):
+        self._groups = {}
+        if records is not None:
+            self.update(records, key, value)
+
+    def __repr__(self):
+        return '<%s of %d groups>' % (type(self).__name__, len(self._groups))
+
+    def __len__(self):
+        return len(self._groups)
+
+    def __iter__(self):
+        return iter(self._groups)
+
+    def __contains__(self, key):
+        return key in self._groups
+
+    def __getitem__(self, key):
+        return self._groups[key].summary()
+
+    def add(self, key, x):
+        """Add value x to the group key."""
+        acc = self._groups.get(key)
+        if acc is None:
+            self._groups[key] = _Accumulator(x)
+        else:
+            acc.add(x)
+
+    def update(self, records, key=None, value=None):
+        """Add an iterable of records to the table.
+
+        ``key`` and ``value`` are functions which return the key and value
+        of a record. They default to the first and second items, so that
+        records are (key, value) pairs.
+        """
+        if key is None:
+            key = operator.itemgetter(0)
+        if value is None:
+            value = operator.itemgetter(1)
+        groups = self._groups
+        get = groups.get
+        for record in records:
+            k = key(record)
+            x = value(record)
+            acc = get(k)
+            if acc is None:
+                groups[k] = _Accumulator(x)
+            else:
+                acc.add(x)
+
+    def merge(self, other):
+        """Return a new GroupTable combining the groups of self and other."""
+        new = type(self)()
+        groups = new._groups
+        for k, acc in self._groups.items():
+            groups[k] = acc.copy()
+        for k, acc in other._groups.items():
+            mine = groups.get(k)
+            if mine is None:
+                groups[k] = acc.copy()
+            else:
+                mine.merge_from(acc)
+        return new
+
+    def summaries(self):
+        """Return a dict mapping each key to its ``GroupSummary``."""
+        return dict((k, acc.summary()) for k, acc in self._groups.items())
+
+
+def group_stats(records, key=None, value=None):
+    """group_stats(records [, key, value]) -> dict of GroupSummary
+
+    Return a dict mapping each group key to a ``GroupSummary`` of the count,
+    sum, mean, variance, standard deviation, minimum and maximum of the
+    values of that group. ``key`` and ``value`` are functions returning the
+    key and value of a record, by default its first and second items:
+
+    >>> records = [{'customer': 'ann', 'amount': 12.5},
+    ...            {'customer': 'bob', 'amount': 3.0},
+    ...            {'customer': 'ann', 'amount': 7.5}]
+    >>> from operator import itemgetter
+    >>> result = group_stats(records, key=itemgetter('customer'),
+    ...                      value=itemgetter('amount'))
+    >>> result['ann'].mean, result['ann'].stdev  #doctest: +ELLIPSIS
+    (10.0, 3.5355339059327...)
+
+    The records are read in a single pass, so they can come from an
+    iterator, and only a small fixed amount of state is kept for each group.
+    ``records`` can also be a ``GroupTable``, e.g. one merged from tables
+    built in parallel.
+    """
+    if not isinstance(records, GroupTable):
+        records = GroupTable(records, key, value)
+    return records.summaries()
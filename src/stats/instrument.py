@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file __init__.py for the licence terms for this software.
+
+"""
+Opt-in instrumentation of the stats package, for finding hot spots.
+
+While instrumentation is enabled, every call to a public function of
+``stats``, ``stats.co``, ``stats.order``, ``stats.univar`` and
+``stats.multivar`` is timed, and an ``Event`` describing it is passed to
+each registered callback. Some private helpers are also instrumented as
+probes, to show which internal code path was taken:
+
+    Probe       Paths
+    ==========  =============================================
+    len_sum     "list" or "array" fast path, or "countiter"
+    sort        "sort" (order statistics from sorted data)
+    select      "select" (linear-time selection, e.g. trimmed means)
+
+and the public functions ``stats.multivar.corr``, ``cov`` and ``pcov``
+report their path as "one-pass" or "two-pass".
+
+The simplest way to use instrumentation is the ``collect`` context
+manager, which gathers the events into a ``Report``:
+
+>>> import stats, stats.instrument
+>>> with stats.instrument.collect() as report:
+...     _ = stats.variance([1.0, 2.0, 4.0, 7.0])
+...     _ = stats.mean(iter([1.0, 2.0]))
+...
+>>> report.functions['stats.variance'].calls
+1
+>>> report.paths[('len_sum', 'countiter')]
+1
+
+Instrumentation works by replacing the functions in their modules with
+timing wrappers, and restoring the originals when it is disabled, so it
+has no overhead at all when it is not in use. Only calls made through the
+module attribute are seen: a function imported with ``from stats import
+mean`` before instrumentation was enabled is not instrumented.
+
+Times are inclusive: the time of a call includes the time of any other
+instrumented calls it makes. Instrumentation is not thread-safe.
+"""
+
+__all__ = ['add_callback', 'collect', 'disable', 'enable', 'Event',
+           'is_enabled', 'remove_callback', 'Report']
+
+
+import array
+import builtins
+import collections
+import contextlib
+import functools
+import importlib
+import inspect
+import time
+
+
+Event = collections.namedtuple('Event', 'name path elements wall cpu')
+Event.__doc__ = """Details of one instrumented call.
+
+    name        qualified name of the function or probe
+    path        the code path taken, or None
+    elements    the number of data points, or None if not known
+    wall        elapsed wall-clock time in seconds
+    cpu         elapsed CPU time of the process in seconds
+    """
+
+
+# === Paths and element counts ===
+
+def _elements(args, kwargs, result):
+    # Count the data points without consuming any iterator.
+    if args and hasattr(args[0], '__len__'):
+        return len(args[0])
+    return None
+
+
+def _onepass_path(args, kwargs):
+    return 'one-pass' if kwargs.get('onepass') else 'two-pass'
+
+
+def _len_sum_path(args, kwargs):
+    iterable = args[0]
+    if isinstance(iterable, array.array) and len(args) < 2:
+        return 'array'
+    return 'list' if isinstance(iterable, list) else 'countiter'
+
+
+# Code paths of public functions, by qualified name.
+_PATHS = {
+    'stats.multivar.corr': _onepass_path,
+    'stats.multivar.cov': _onepass_path,
+    'stats.multivar.pcov': _onepass_path,
+    }
+
+_MODULES = ('stats', 'stats.co', 'stats.order', 'stats.univar',
+            'stats.multivar')
+
+# Public functions which aren't instrumented: decorators and helpers.
+_EXCLUDE = frozenset(['stats.coroutine', 'stats.co.feed'])
+
+# Probes of private helpers: (module, attribute, probe name, path function,
+# elements function). If the module has no such attribute, the built-in of
+# that name is instrumented in the module's namespace instead.
+PROBES = [
+    ('stats', '_len_sum', 'len_sum', _len_sum_path,
+     lambda args, kwargs, result: result[0]),
+    ('stats.order', 'sorted', 'sort', lambda args, kwargs: 'sort',
+     lambda args, kwargs, result: len(result)),
+    ('stats.utils', '_select', 'select', lambda args, kwargs: 'select',
+     lambda args, kwargs, result: len(args[0])),
+    ]
+
+
+# === Enabling and disabling ===
+
+_callbacks = []
+_saved = []  # (module, attribute, original value or _MISSING)
+_MISSING = object()
+
+
+def _wrap(name, func, path, elements):
+    perf_counter = time.perf_counter
+    process_time = time.process_time
+    @functools.wraps(func)
+    def inner(*args, **kwargs):
+        wall = perf_counter()
+        cpu = process_time()
+        result = func(*args, **kwargs)
+        cpu = process_time() - cpu
+        wall = perf_counter() - wall
+        event = Event(name, path and path(args, kwargs),
+                      elements(args, kwargs, result), wall, cpu)
+        for callback in list(_callbacks):
+            callback(event)
+        return result
+    inner.__wrapped__ = func
+    return inner
+
+
+def _targets():
+    # Yield (module, attribute, name, path, elements) for everything which
+    # can be instrumented.
+    for modname in _MODULES:
+        module = importlib.import_module(modname)
+        for attr in module.__all__:
+            name = modname + '.' + attr
+            obj = getattr(module, attr)
+            if inspect.isfunction(obj) and name not in _EXCLUDE:
+                yield module, attr, name, _PATHS.get(name), _elements
+    for modname, attr, name, path, elements in PROBES:
+        yield importlib.import_module(modname), attr, name, path, elements
+
+
+def is_enabled():
+    """Return True if instrumentation is enabled."""
+    return bool(_saved)
+
+
+def enable():
+    """Enable instrumentation, if it isn't already enabled."""
+    if _saved:
+        return
+    for module, attr, name, path, elements in _targets():
+        original = module.__dict__.get(attr, _MISSING)
+        func = getattr(builtins, attr) if original is _MISSING else original
+        _saved.append((module, attr, original))
+        setattr(module, attr, _wrap(name, func, path, elements))
+
+
+def disable():
+    """Disable instrumentation, restoring the original functions."""
+    while _saved:
+        module, attr, original = _saved.pop()
+        if original is _MISSING:
+            delattr(module, attr)
+        else:
+            setattr(module, attr, original)
+
+
+def add_callback(callback):
+    """Register callback to be called with an ``Event`` for each call.
+
+    Registering a callback does not enable instrumentation; call ``enable``
+    as well.
+    """
+    _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    """Unregister a callback registered with ``add_callback``."""
+    _callbacks.remove(callback)
+
+
+# === Reports ===
+
+class Record:
+    """Totals for one instrumented function."""
+    __slots__ = ('calls', 'elements', 'wall', 'cpu')
+
+    def __init__(self):
+        self.calls = self.elements = 0
+        self.wall = self.cpu = 0.0
+
+    def __repr__(self):
+        return '<%s calls=%d elements=%d wall=%g cpu=%g>' % (
+            type(self).__name__, self.calls, self.elements, self.wall,
+            self.cpu)
+
+
+class Report:
+    """Collect instrumentation events into totals.
+
+    A ``Report`` instance is a callback which can be passed to
+    ``add_callback``. It has two attributes:
+
+    functions   dict mapping names to ``Record`` totals of the calls,
+                elements, wall and CPU time
+    paths       counter of (name, path) pairs
+
+    Elements are only counted for calls where the number of data points is
+    known without consuming the data.
+    """
+
+    def __init__(self):
+        self.functions = collections.defaultdict(Record)
+        self.paths = collections.Counter()
+
+    def __call__(self, event):
+        record = self.functions[event.name]
+        record.calls += 1
+        if event.elements is not None:
+            record.elements += event.elements
+        record.wall += event.wall
+        record.cpu += event.cpu
+        if event.path is not None:
+            self.paths[(event.name, event.path)] += 1
+
+    def __str__(self):
+        lines = ['%-34s %8s %10s %10s %10s' % (
+                 'function', 'calls', 'elements', 'wall', 'cpu')]
+        for name, r in sorted(self.functions.items(),
+                              key=lambda item: -item[1].wall):
+            lines.append('%-34s %8d %10d %10.4g %10.4g' % (
+                         name, r.calls, r.elements, r.wall, r.cpu))
+        if self.paths:
+            lines.append('')
+            lines.append('%-34s %8s' % ('path', 'calls'))
+            for (name, path), count in sorted(self.paths.items()):
+                lines.append('%-34s %8d' % (name + ': ' + path, count))
+        return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def collect():
+    """Context manager which enables instrumentation and yields a Report.
+
+    Instrumentation is disabled again on exit, unless it was already
+    enabled on entry.
+    """
+    was_enabled = is_enabled()
+    report = Report()
+    add_callback(report)
+    enable()
+    try:
+        yield report
+    finally:
+        remove_callback(report)
+        if not was_enabled:
+            disable()
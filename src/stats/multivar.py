@@ -6,16 +6,39 @@
 """
 Multivariate statistics.
 
+As well as the pairwise statistics such as ``corr`` and ``cov``, which take
+(x, y) data, the functions ``cov_matrix``, ``pcov_matrix`` and
+``corr_matrix`` take rows of k variables and calculate every pairwise
+statistic in a single pass over the data. The running state they use,
+``CoMoments``, can also be used directly, e.g. to combine the results of
+sharded data sets.
+
+Similarly, ``mlinr`` fits a multiple linear regression in a single pass
+over the data, using the mergeable running state ``Regression``.
+
+The pairwise statistics accept a keyword-only argument ``skipna``. If it is
+true, (x, y) pairs where either value is missing (None or a NAN) are
+skipped, so that the statistic is calculated from the complete pairs:
+
+>>> cov([1, 2, None, 4], [2, 4, 6, float('nan')], skipna=True)
+1.0
+
+To count the pairs skipped, pass the pairs wrapped in ``stats.dropna``.
+
 """
 
 __all__ = [
     'qcorr', 'corr', 'pcov', 'cov', 'errsumsq', 'linr',
+    'CoMoments', 'corr_matrix', 'cov_matrix', 'pcov_matrix',
+    'Regression', 'mlinr', 'kendall', 'spearman',
     ]
 
+import bisect
 import collections
 import functools
 import itertools
 import math
+import operator
 
 import stats
 
@@ -106,12 +129,40 @@ class _Multivariate:
         # here, we postpone dealing with any mismatches to later.
         return itertools.chain([first], it)
 
+    def pairs(xydata):
+        """Helper function which checks that the single argument xydata
+        holds (x,y) pairs rather than single values, and returns an
+        iterable of them."""
+        # Look at the first item, as split does, without consuming it.
+        it = iter(xydata)
+        try:
+            first = next(it)
+        except StopIteration:
+            return xydata
+        try:
+            n = len(first)
+        except TypeError:
+            raise StatsError('expecting (x, y) pairs but got single values')
+        if n != 2:
+            raise TypeError('expecting 2-tuple (x, y) but got %d-tuple' % n)
+        return itertools.chain([first], it)
+
+    def complete(xdata, ydata=None):
+        """Helper function which returns the (x,y) pairs of xdata, ydata
+        with no missing values."""
+        return stats.dropna(_Multivariate.merge(xdata, ydata))
+
     def split_xydata(func):
         """Decorator to split a single (x,y) data iterable into separate x
         and y iterables.
+
+        The decorated function also takes a keyword-only argument
+        ``skipna``. If it is true, incomplete pairs are skipped.
         """
         @functools.wraps(func)
-        def inner(xdata, ydata=None):
+        def inner(xdata, ydata=None, *, skipna=False):
+            if skipna:
+                xdata, ydata = _Multivariate.complete(xdata, ydata), None
             xdata, ydata = _Multivariate.split(xdata, ydata)
             return func(xdata, ydata)
         return inner
@@ -126,6 +177,97 @@ class _Multivariate:
             return func(xydata)
         return inner
 
+    def onepass_option(streaming):
+        """Decorator factory adding a keyword-only ``onepass`` argument.
+
+        When the decorated function is called with ``onepass`` a true
+        value, the (x,y) data is merged lazily (without converting it to
+        lists) and passed to the single-pass function ``streaming`` instead
+        of the decorated function.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def inner(xdata, ydata=None, *, onepass=False, skipna=False):
+                if ydata is None:
+                    xdata = _Multivariate.pairs(xdata)
+                if onepass:
+                    if skipna:
+                        xydata = _Multivariate.complete(xdata, ydata)
+                    else:
+                        xydata = _Multivariate.merge(xdata, ydata)
+                    return streaming(xydata)
+                return func(xdata, ydata, skipna=skipna)
+            return inner
+        return decorator
+
+
+def _comoments2(xydata):
+    """Return the count, means and co-moments of (x,y) data in one pass.
+
+    Returns (n, mx, my, Sxx, Syy, Sxy), where mx and my are the means of
+    the x and y values, and Sxx, Syy, Sxy are the sums of the squares and
+    products of deviations from the means. The co-moments are updated using
+    Welford's method, with the updates added with full precision.
+
+    >>> _comoments2(iter([(1, 2), (2, 4), (3, 9)]))
+    (3, 2.0, 5.0, 2.0, 26.0, 7.0)
+
+    """
+    it = iter(xydata)
+    for x0, y0 in it:
+        break
+    else:
+        return (0, None, None, 0.0, 0.0, 0.0)
+    # Work with deviations from the first point, rather than the raw values.
+    # This reduces the round-off error in the running means when the data
+    # has a large offset from zero.
+    ap = add_partial
+    n = 1
+    mx = my = 0.0
+    sxx, syy, sxy = [], [], []
+    for x, y in it:
+        n += 1
+        dx = (x - x0) - mx
+        dy = (y - y0) - my
+        mx += dx/n
+        my += dy/n
+        sweep = (n-1)/n
+        ap(dx*dx*sweep, sxx)
+        ap(dy*dy*sweep, syy)
+        ap(dx*dy*sweep, sxy)
+    if n == 1:
+        return (1, x0, y0, 0.0, 0.0, 0.0)
+    fsum = math.fsum
+    return (n, x0 + mx, y0 + my, fsum(sxx), fsum(syy), fsum(sxy))
+
+
+def _corr_onepass(xydata):
+    n, _, _, sxx, syy, sxy = _comoments2(xydata)
+    if n < 2:
+        raise StatsError(
+            'correlation requires at least two data points, got %d' % n)
+    if sxx == 0:
+        raise StatsError('all x values are equal')
+    if syy == 0:
+        raise StatsError('all y values are equal')
+    r = sxy/math.sqrt(sxx*syy)
+    # Rounding may push r very slightly outside of the range [-1, 1].
+    return max(-1.0, min(1.0, r))
+
+
+def _pcov_onepass(xydata):
+    n, _, _, _, _, sxy = _comoments2(xydata)
+    if n > 0:
+        return sxy/n
+    raise StatsError('population covariance requires at least one point')
+
+
+def _cov_onepass(xydata):
+    n, _, _, _, _, sxy = _comoments2(xydata)
+    if n > 1:
+        return sxy/(n-1)
+    raise StatsError('sample covariance requires at least two points')
+
 
 
 # === Simple multivariate statistics ===
@@ -190,6 +332,7 @@ def qcorr(xdata, ydata):
     return q
 
 
+@_Multivariate.onepass_option(_corr_onepass)
 @_Multivariate.split_xydata
 def corr(xdata, ydata):
     """corr(xydata) -> float
@@ -220,6 +363,17 @@ def corr(xdata, ydata):
 
     If there are not at least two data points, or if either all the x values
     or all the y values are equal, StatsError is raised.
+
+    By default, ``corr`` converts its arguments to lists and makes three
+    passes over the data for maximum accuracy. If the keyword-only argument
+    ``onepass`` is a true value, the data is consumed lazily in a single
+    pass instead, using constant memory. This is suitable for iterators
+    with more data than will fit in memory:
+
+    >>> xydata = ((x, 2*x + (-1)**x) for x in range(1000))
+    >>> corr(xydata, onepass=True)  #doctest: +ELLIPSIS
+    0.99999849...
+
     """
     n = len(xdata)
     assert n == len(ydata)
@@ -254,6 +408,7 @@ def _corr2(xdata, ydata=None):
     #r = t.Sxy/math.sqrt(t.Sxx*t.Syy)
 
 
+@_Multivariate.onepass_option(_pcov_onepass)
 @_Multivariate.split_xydata
 def pcov(xdata, ydata=None):
     """Return the population covariance between (x, y) data.
@@ -264,6 +419,8 @@ def pcov(xdata, ydata=None):
     >>> pcov([(0.1, 2.3), (0.5, 2.7), (1.2, 3.1), (1.7, 2.9)])
     0.15125
 
+    If the keyword-only argument ``onepass`` is a true value, the data is
+    consumed lazily in a single pass. See ``corr`` for details.
     """
     n, s = _sum_prod_deviations(zip(xdata, ydata), None, None)
     if n > 0:
@@ -274,6 +431,7 @@ def pcov(xdata, ydata=None):
     #return t.Sxy/(t.n**2)
 
 
+@_Multivariate.onepass_option(_cov_onepass)
 @_Multivariate.split_xydata
 def cov(xdata, ydata):
     """Return the sample covariance between (x, y) data.
@@ -298,6 +456,8 @@ def cov(xdata, ydata):
     >>> stats.variance(data)  #doctest: +ELLIPSIS
     0.40325000000...
 
+    If the keyword-only argument ``onepass`` is a true value, the data is
+    consumed lazily in a single pass. See ``corr`` for details.
     """
     n, s = _sum_prod_deviations(zip(xdata, ydata), None, None)
     if n > 1:
@@ -360,6 +520,176 @@ def linr(xdata, ydata):
     return (a, b)
 
 
+# === Rank correlation ===
+
+def _ranks(data):
+    """Return the ranks of the items of sequence data, starting from 1.
+
+    Tied values are given the average of the ranks they would have had if
+    they had been distinct:
+
+    >>> _ranks([30, 10, 20, 10])
+    [4.0, 1.5, 3.0, 1.5]
+
+    """
+    order = sorted(range(len(data)), key=data.__getitem__)
+    ranks = [0.0]*len(data)
+    start = 0
+    for _, group in itertools.groupby(order, key=data.__getitem__):
+        group = list(group)
+        r = start + (len(group) + 1)/2
+        for i in group:
+            ranks[i] = r
+        start += len(group)
+    return ranks
+
+
+def _tied_pairs(iterable):
+    """Return the number of pairs of equal items in iterable."""
+    return sum(t*(t-1)//2 for t in collections.Counter(iterable).values())
+
+
+def _count_inversions(data, blocksize=32):
+    """Return the number of pairs i < j with data[i] > data[j].
+
+    >>> _count_inversions([3, 1, 2, 5, 4])
+    3
+
+    This uses a bottom-up merge sort, taking O(N*log N) time. Each pair of
+    sorted blocks is merged by a stable sort of their positions, which the
+    built-in sort does in linear time as it recognises the two runs. The
+    inversions between the blocks are counted from where the items of the
+    second block land in the merged order, as in Knight's algorithm.
+    """
+    bisect_right = bisect.bisect_right
+    insort = bisect.insort
+    total = 0
+    # Count the inversions within small blocks by insertion.
+    blocks = []
+    for start in range(0, len(data), blocksize):
+        block = []
+        for i, x in enumerate(data[start:start+blocksize]):
+            total += i - bisect_right(block, x)
+            insort(block, x)
+        blocks.append(block)
+    # Then merge pairs of sorted blocks until there is only one left.
+    compress, repeat = itertools.compress, itertools.repeat
+    while len(blocks) > 1:
+        merged = []
+        for i in range(0, len(blocks) - 1, 2):
+            left, right = blocks[i], blocks[i+1]
+            a, b = len(left), len(right)
+            both = left + right
+            # Equal items stay in order, so an item of left equal to one of
+            # right is placed before it, and isn't counted as inverted.
+            order = sorted(range(a + b), key=both.__getitem__)
+            # The jth item of right (counting from 0) lands at position p,
+            # after p - j items of left, so it is inverted with the other
+            # a - (p - j) items of left.
+            positions = sum(compress(range(a + b),
+                                     map(operator.ge, order, repeat(a))))
+            total += a*b - positions + b*(b - 1)//2
+            merged.append(list(map(both.__getitem__, order)))
+        if len(blocks) % 2:
+            merged.append(blocks[-1])
+        blocks = merged
+    return total
+
+
+@_Multivariate.split_xydata
+def spearman(xdata, ydata):
+    """spearman(xydata) -> float
+    spearman(xdata, ydata) -> float
+
+    Return Spearman's rank correlation coefficient rho of (x,y) data.
+
+    Arguments are the same as for ``corr``. Spearman's rho is Pearson's
+    correlation coefficient of the ranks of the x and y values, and
+    measures how well the relationship between x and y can be described by
+    a monotonic function:
+
+    >>> spearman([1, 2, 3, 4, 5], [1, 8, 27, 64, 125])
+    1.0
+    >>> spearman([(1, 2), (2, 1), (3, 4), (4, 3), (5, 5)])
+    0.8
+
+    Tied values are given the average of the ranks they would have had if
+    they were distinct.
+
+    If there are not at least two data points, or if either all the x values
+    or all the y values are equal, StatsError is raised.
+    """
+    n = len(xdata)
+    assert n == len(ydata)
+    if n < 2:
+        raise StatsError(
+            'correlation requires at least two data points, got %d' % n)
+    rx = _ranks(xdata)
+    ry = _ranks(ydata)
+    # The mean rank is exactly (n+1)/2, regardless of ties.
+    m = (n + 1)/2
+    fsum = math.fsum
+    sxx = fsum((a - m)**2 for a in rx)
+    syy = fsum((b - m)**2 for b in ry)
+    if sxx == 0:
+        raise StatsError('all x values are equal')
+    if syy == 0:
+        raise StatsError('all y values are equal')
+    sxy = fsum((a - m)*(b - m) for a, b in zip(rx, ry))
+    r = sxy/math.sqrt(sxx*syy)
+    return max(-1.0, min(1.0, r))
+
+
+@_Multivariate.split_xydata
+def kendall(xdata, ydata):
+    """kendall(xydata) -> float
+    kendall(xdata, ydata) -> float
+
+    Return Kendall's rank correlation coefficient tau-b of (x,y) data.
+
+    Arguments are the same as for ``corr``. Kendall's tau compares the
+    number of concordant pairs of points (where x and y both increase) with
+    the number of discordant pairs (where one increases and the other
+    decreases):
+
+    >>> kendall([1, 2, 3, 4, 5], [1, 8, 27, 64, 125])
+    1.0
+    >>> kendall([(1, 2), (2, 1), (3, 4), (4, 3), (5, 5)])
+    0.6
+
+    Tau-b includes an adjustment for pairs which are tied in x or y:
+
+    >>> kendall([1, 1, 2, 3], [1, 2, 2, 3])
+    0.8
+
+    This uses Knight's algorithm, taking O(N*log N) time rather than the
+    O(N**2) time needed to compare every pair of points.
+
+    If there are not at least two data points, or if either all the x values
+    or all the y values are equal, StatsError is raised.
+    """
+    n = len(xdata)
+    assert n == len(ydata)
+    if n < 2:
+        raise StatsError(
+            'correlation requires at least two data points, got %d' % n)
+    n0 = n*(n-1)//2
+    n1 = _tied_pairs(xdata)
+    n2 = _tied_pairs(ydata)
+    if n1 == n0:
+        raise StatsError('all x values are equal')
+    if n2 == n0:
+        raise StatsError('all y values are equal')
+    n3 = _tied_pairs(zip(xdata, ydata))
+    # Sort by x, breaking ties by y, so that pairs tied in x are never
+    # counted as discordant. Then every inversion of the y values is a
+    # discordant pair.
+    ys = [y for (x, y) in sorted(zip(xdata, ydata))]
+    swaps = _count_inversions(ys)
+    tau = (n0 - n1 - n2 + n3 - 2*swaps)/math.sqrt((n0 - n1)*(n0 - n2))
+    return max(-1.0, min(1.0, tau))
+
+
 # === Sums and products ===
 
 @_Multivariate.merge_xydata
@@ -552,3 +882,514 @@ def xysums(xdata, ydata=None):
         'statsums', 'n sumx sumy sumxy sumx2 sumy2 Sxx Syy Sxy')
     return statsums(*(n, sumx, sumy, sumxy, sumx2, sumy2, Sxx, Syy, Sxy))
 
+
+
+# === Covariance and correlation matrices ===
+
+class CoMoments:
+    """Running co-moments of rows of k variables.
+
+    CoMoments() -> empty running state
+    CoMoments(rows) -> running state for the given rows
+
+    ``CoMoments`` accumulates the count, the means, and the matrix of
+    co-moments (the sums of the products of deviations from the means) of
+    rows of k variables in a single pass, using Welford's numerically
+    stable update:
+
+    >>> cm = CoMoments([(1, 2, 3), (2, 4, 1), (3, 6, 2)])
+    >>> cm.n, cm.means
+    (3, [2.0, 4.0, 2.0])
+    >>> cm.cov_matrix()
+    [[1.0, 2.0, -0.5], [2.0, 4.0, -1.0], [-0.5, -1.0, 1.0]]
+
+    Rows can be added one at a time with the ``add`` method, or many at a
+    time with ``update``. Two CoMoments objects calculated from separate
+    parts of the data can be combined with ``merge``, which gives the same
+    result (up to rounding) as processing all the data in one go:
+
+    >>> a = CoMoments([(1, 2, 3), (2, 4, 1)])
+    >>> b = CoMoments([(3, 6, 2)])
+    >>> a.merge(b).cov_matrix() == cm.cov_matrix()
+    True
+
+    For wide rows (many variables), ``update`` will use numpy to process
+    the rows in blocks if it is available.
+    """
+
+    # Use the numpy kernel for rows with at least this many variables.
+    NUMPY_THRESHOLD = 16
+    # Number of rows per block for the numpy kernel.
+    BLOCKSIZE = 4096
+
+    def __init__(self, rows=None):
+        self.n = 0
+        self.means = None
+        self.comoments = None
+        if rows is not None:
+            self.update(rows)
+
+    def __repr__(self):
+        k = 0 if self.means is None else len(self.means)
+        return '<%s n=%d k=%d>' % (type(self).__name__, self.n, k)
+
+    def _start(self, k):
+        # Initialise the state for rows of k variables.
+        self.means = [0.0]*k
+        self.comoments = [[0.0]*k for _ in range(k)]
+
+    def add(self, row):
+        """Add a single row of data to the running state."""
+        row = list(row)
+        k = len(row)
+        if self.means is None:
+            self._start(k)
+        elif k != len(self.means):
+            raise ValueError(
+                'expected row with %d items but got %d' % (len(self.means), k))
+        self.n += 1
+        n = self.n
+        means = self.means
+        # Deviations from the old and the updated means respectively.
+        delta = [x - m for x, m in zip(row, means)]
+        means[:] = [m + d/n for m, d in zip(means, delta)]
+        resid = [x - m for x, m in zip(row, means)]
+        # Only the upper triangle is updated; the matrix is symmetric.
+        for i, d in enumerate(delta):
+            Ci = self.comoments[i]
+            Ci[i:] = [c + d*r for c, r in zip(Ci[i:], resid[i:])]
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Return the running state for data given as k columns.
+
+        >>> cm = CoMoments.from_columns([(1, 2, 3), (2, 4, 6), (3, 1, 2)])
+        >>> cm.n, cm.means
+        (3, [2.0, 4.0, 2.0])
+
+        The columns must all have the same length. Each column is processed
+        with high-precision sums, so this is faster than adding the rows
+        one at a time when the data for a block of rows is already in
+        memory, and the result can be merged with other CoMoments objects.
+        """
+        columns = [col if hasattr(col, '__len__') else list(col)
+                   for col in columns]
+        new = cls()
+        # Test lengths, since numpy arrays have no truth value.
+        if not len(columns) or not len(columns[0]):
+            return new
+        n = len(columns[0])
+        if any(len(col) != n for col in columns):
+            raise ValueError('columns must all have the same length')
+        fsum = math.fsum
+        means = [fsum(col)/n for col in columns]
+        devs = [[x - m for x in col] for col, m in zip(columns, means)]
+        new._start(len(columns))
+        new.n = n
+        new.means = means
+        for i, di in enumerate(devs):
+            Ci = new.comoments[i]
+            for j in range(i, len(devs)):
+                Ci[j] = fsum(map(operator.mul, di, devs[j]))
+        return new
+
+    def update(self, rows):
+        """Add an iterable of rows of data to the running state."""
+        it = iter(rows)
+        for row in it:
+            self.add(row)
+            break
+        else:
+            return
+        np = None
+        if len(self.means) >= self.NUMPY_THRESHOLD:
+            np = stats._numpy()
+        if np is None:
+            for row in it:
+                self.add(row)
+            return
+        # Numpy kernel: process blocks of rows, and merge each block into
+        # the running state.
+        while True:
+            block = list(itertools.islice(it, self.BLOCKSIZE))
+            if not block:
+                break
+            block = np.array(block, dtype=float)
+            if block.ndim != 2 or block.shape[1] != len(self.means):
+                raise ValueError('rows must all have %d items' % len(self.means))
+            means = block.mean(axis=0)
+            dev = block - means
+            other = type(self)()
+            other.n = len(block)
+            other.means = means.tolist()
+            other.comoments = dev.T.dot(dev).tolist()
+            self._merge_from(other)
+
+    def merge(self, other):
+        """Return a new CoMoments combining the data in self and other."""
+        new = type(self)()
+        if self.n:
+            new.n = self.n
+            new.means = self.means[:]
+            new.comoments = [row[:] for row in self.comoments]
+        new._merge_from(other)
+        return new
+
+    def _merge_from(self, other):
+        # Merge other into self in place, using the pairwise update
+        # formula of Chan, Golub and LeVeque.
+        if not other.n:
+            return
+        if not self.n:
+            self.n = other.n
+            self.means = other.means[:]
+            self.comoments = [row[:] for row in other.comoments]
+            return
+        k = len(self.means)
+        if len(other.means) != k:
+            raise ValueError('cannot merge states with different numbers '
+                             'of variables (%d and %d)' % (k, len(other.means)))
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = [b - a for a, b in zip(self.means, other.means)]
+        factor = na*nb/n
+        self.means = [a + d*nb/n for a, d in zip(self.means, delta)]
+        for i in range(k):
+            Ci, Di = self.comoments[i], other.comoments[i]
+            f = delta[i]*factor
+            Ci[i:] = [c + e + f*d for c, e, d in zip(Ci[i:], Di[i:], delta[i:])]
+        self.n = n
+
+    def _full(self):
+        # Return the full symmetric matrix of co-moments.
+        C = self.comoments
+        k = len(C)
+        return [[C[i][j] if j >= i else C[j][i] for j in range(k)]
+                for i in range(k)]
+
+    def cov_matrix(self, ddof=1):
+        """Return the covariance matrix with n-ddof degrees of freedom."""
+        den = self.n - ddof
+        if den <= 0:
+            raise StatsError('covariance matrix requires at least %d rows '
+                             'but got %d' % (ddof+1, self.n))
+        return [[c/den for c in row] for row in self._full()]
+
+    def corr_matrix(self):
+        """Return the matrix of Pearson's correlation coefficients.
+
+        Entries involving a variable whose values are all equal are NANs.
+        """
+        if self.n < 2:
+            raise StatsError('correlation matrix requires at least two rows '
+                             'but got %d' % self.n)
+        C = self._full()
+        k = len(C)
+        sd = [math.sqrt(C[i][i]) for i in range(k)]
+        result = []
+        for i in range(k):
+            row = []
+            for j in range(k):
+                den = sd[i]*sd[j]
+                if den == 0:
+                    r = float('nan')
+                elif i == j:
+                    r = 1.0
+                else:
+                    # Clamp tiny excursions outside [-1, 1] due to rounding.
+                    r = max(-1.0, min(1.0, C[i][j]/den))
+                row.append(r)
+            result.append(row)
+        return result
+
+
+def _comoments(rows):
+    if isinstance(rows, CoMoments):
+        return rows
+    return CoMoments(rows)
+
+
+def cov_matrix(rows):
+    """cov_matrix(rows) -> sample covariance matrix
+
+    Return the sample covariance matrix of rows of k variables, as a list
+    of k lists of k values. Entry [i][j] is the covariance between the ith
+    and jth variables, so the diagonal holds the sample variances.
+
+    >>> data = [(1, 2, 0.5), (2, 4, 0.25), (3, 6, 1.5), (4, 8, 1.0)]
+    >>> for row in cov_matrix(data):
+    ...     print(row)
+    ...
+    [1.6666666666666667, 3.3333333333333335, 0.4583333333333333]
+    [3.3333333333333335, 6.666666666666667, 0.9166666666666666]
+    [0.4583333333333333, 0.9166666666666666, 0.3072916666666667]
+
+    Every covariance is calculated in a single pass over the data, so
+    ``rows`` can be an iterator. ``rows`` can also be a ``CoMoments``
+    instance, e.g. one merged from states calculated in parallel.
+    """
+    return _comoments(rows).cov_matrix(1)
+
+
+def pcov_matrix(rows):
+    """pcov_matrix(rows) -> population covariance matrix
+
+    Return the population covariance matrix of rows of k variables. See
+    ``cov_matrix`` for details.
+
+    >>> pcov_matrix([(1, 2), (2, 4), (3, 7)])  #doctest: +ELLIPSIS
+    [[0.666666666666..., 1.666666666666...], [1.666666666666..., 4.222222222222...]]
+
+    """
+    return _comoments(rows).cov_matrix(0)
+
+
+def corr_matrix(rows):
+    """corr_matrix(rows) -> matrix of correlation coefficients
+
+    Return the matrix of sample Pearson's correlation coefficients of rows
+    of k variables, as a list of k lists of k values. Entry [i][j] is the
+    correlation between the ith and jth variables.
+
+    >>> data = [(1, 2, 0.5), (2, 4, 0.25), (3, 6, 1.5), (4, 8, 1.0)]
+    >>> for row in corr_matrix(data):
+    ...     print([round(r, 9) for r in row])
+    ...
+    [1.0, 1.0, 0.640444761]
+    [1.0, 1.0, 0.640444761]
+    [0.640444761, 0.640444761, 1.0]
+
+    Unlike ``corr``, which raises StatsError, if all the values of a
+    variable are equal, the correlations involving it are NANs.
+
+    As for ``cov_matrix``, ``rows`` can be an iterator or a ``CoMoments``
+    instance.
+    """
+    return _comoments(rows).corr_matrix()
+
+
+# === Multiple linear regression ===
+
+class Regression:
+    """Running least-squares fit of y = b0 + b1*x1 + ... + bp*xp.
+
+    Regression([intercept=True]) -> empty running fit
+
+    ``Regression`` fits a multiple linear regression incrementally, one
+    observation at a time, by updating the QR decomposition of the design
+    matrix with Givens rotations. Only the triangular factor R, the rotated
+    y values and the residual sum of squares are stored, so memory usage is
+    O(p**2) regardless of the number of observations.
+
+    >>> fit = Regression()
+    >>> fit.update([(0, 1, 3), (1, 0, 3), (1, 1, 5), (2, 1, 7)])
+    >>> [round(b, 12) for b in fit.coefficients()]
+    [1.0, 2.0, 2.0]
+
+    With ``intercept`` a true value (the default), a constant term b0 is
+    included in the model; otherwise the fitted hyperplane passes through
+    the origin.
+
+    Two fits of separate parts of the data can be combined with ``merge``,
+    e.g. to fit data which has been split over several worker processes.
+    See ``mlinr`` for details of the results.
+    """
+
+    def __init__(self, intercept=True):
+        self.intercept = bool(intercept)
+        self.n = 0
+        self.R = None  # Upper triangular factor, as a list of rows.
+        self.qty = None  # First p elements of (Q.T)y.
+        self._rss = []  # Partials for the residual sum of squares.
+        # Running mean and second moment of y, for R**2.
+        self._ymean = 0.0
+        self._yM2 = []
+
+    def __repr__(self):
+        p = 0 if self.R is None else len(self.R)
+        return '<%s n=%d p=%d>' % (type(self).__name__, self.n, p)
+
+    def _start(self, p):
+        self.R = [[0.0]*p for _ in range(p)]
+        self.qty = [0.0]*p
+
+    def _rotate(self, x, y):
+        # Rotate the observation (x, y) into R and qty, and return the part
+        # of y which is left over. Modifies x in place.
+        R = self.R
+        qty = self.qty
+        p = len(x)
+        for i in range(p):
+            xi = x[i]
+            if xi == 0:
+                continue
+            Ri = R[i]
+            rii = Ri[i]
+            if rii == 0:
+                # Row i of R is empty, so the observation fills it.
+                Ri[i:] = x[i:]
+                qty[i] = y
+                return 0.0
+            h = math.hypot(rii, xi)
+            c = rii/h
+            s = xi/h
+            Ri[i] = h
+            x[i] = 0.0
+            for j in range(i+1, p):
+                rij = Ri[j]
+                xj = x[j]
+                Ri[j] = c*rij + s*xj
+                x[j] = c*xj - s*rij
+            q = qty[i]
+            qty[i] = c*q + s*y
+            y = c*y - s*q
+        return y
+
+    def add(self, xs, y):
+        """Add the observation y with regressors xs to the running fit."""
+        x = [float(a) for a in xs]
+        if self.intercept:
+            x.insert(0, 1.0)
+        if self.R is None:
+            self._start(len(x))
+        elif len(x) != len(self.R):
+            raise ValueError('expected %d regressors but got %d'
+                             % (len(self.R) - self.intercept,
+                                len(x) - self.intercept))
+        y = float(y)
+        e = self._rotate(x, y)
+        add_partial(e*e, self._rss)
+        # Welford's update for the sum of squares of y.
+        self.n += 1
+        delta = y - self._ymean
+        self._ymean += delta/self.n
+        add_partial(delta*(y - self._ymean), self._yM2)
+
+    def update(self, rows):
+        """Add rows of data (x1, x2, ..., xp, y) to the running fit."""
+        for row in rows:
+            row = tuple(row)
+            self.add(row[:-1], row[-1])
+
+    def merge(self, other):
+        """Return a new Regression combining the data in self and other."""
+        if self.intercept != other.intercept:
+            raise ValueError('cannot merge fits with and without intercept')
+        new = type(self)(self.intercept)
+        for fit in (self, other):
+            if not fit.n:
+                continue
+            if new.R is None:
+                new._start(len(fit.R))
+            elif len(fit.R) != len(new.R):
+                raise ValueError('cannot merge fits with different numbers '
+                                 'of regressors')
+            # The rows of R, with the matching elements of qty, are
+            # equivalent to the original observations as far as the least
+            # squares fit is concerned.
+            for row, q in zip(fit.R, fit.qty):
+                e = new._rotate(row[:], q)
+                add_partial(e*e, new._rss)
+            for t in fit._rss:
+                add_partial(t, new._rss)
+            # Combine the moments of y.
+            na, nb = new.n, fit.n
+            n = na + nb
+            delta = fit._ymean - new._ymean
+            for t in fit._yM2:
+                add_partial(t, new._yM2)
+            add_partial(delta*delta*na*nb/n, new._yM2)
+            new._ymean += delta*nb/n
+            new.n = n
+        return new
+
+    def coefficients(self):
+        """Return the list of fitted coefficients [b0, b1, ..., bp].
+
+        If the fit has no intercept, b0 is omitted.
+        """
+        if self.R is None:
+            raise StatsError('regression requires at least one observation')
+        R = self.R
+        p = len(R)
+        biggest = max(abs(R[i][i]) for i in range(p))
+        b = [0.0]*p
+        for i in range(p-1, -1, -1):
+            rii = R[i][i]
+            if abs(rii) <= 1e-12*biggest:
+                raise StatsError('regressors are linearly dependent, or '
+                                 'there are too few observations')
+            t = self.qty[i] - math.fsum(R[i][j]*b[j] for j in range(i+1, p))
+            b[i] = t/rii
+        return b
+
+    def fit(self):
+        """Return the fitted coefficients and goodness-of-fit statistics.
+
+        See ``mlinr`` for details.
+        """
+        b = self.coefficients()
+        p = len(b)
+        n = self.n
+        if n <= p:
+            raise StatsError('regression with %d coefficients requires at '
+                             'least %d observations but got %d' % (p, p+1, n))
+        rss = math.fsum(self._rss)
+        if self.intercept:
+            sst = math.fsum(self._yM2)
+        else:
+            sst = math.fsum(self._yM2) + n*self._ymean**2
+        rsquared = 1 - rss/sst if sst else float('nan')
+        result = collections.namedtuple(
+            'linfit', 'coefficients residual_variance rsquared n')
+        return result(b, rss/(n-p), rsquared, n)
+
+
+def mlinr(rows, intercept=True):
+    """mlinr(rows [, intercept=True]) -> linfit
+
+    Return the multiple linear regression of y against x1, x2, ... xp,
+    where each row of data has the form (x1, x2, ..., xp, y).
+
+    The least squares hyperplane y = b0 + b1*x1 + ... + bp*xp is fitted in
+    a single pass over the rows, and the result is a named tuple with
+    fields:
+
+        Name               Description
+        =================  ================================================
+        coefficients       list of coefficients [b0, b1, ..., bp]
+        residual_variance  sum of squared residuals divided by n-(p+1)
+        rsquared           coefficient of determination R**2
+        n                  number of rows
+
+    >>> rows = [(0, 1, 3.25), (1, 0, 2.75), (1, 1, 5.0),
+    ...         (2, 1, 7.25), (3, 2, 10.75)]
+    >>> result = mlinr(rows)
+    >>> [round(b, 12) for b in result.coefficients]
+    [1.0625, 1.84375, 2.15625]
+    >>> round(result.rsquared, 4)
+    0.996
+
+    If optional argument ``intercept`` is false, the constant term b0 is
+    omitted from the model and from the coefficients, and the degrees of
+    freedom of the residual variance are n-p.
+
+    With a single regressor, ``mlinr`` fits the same line as ``linr``, and
+    the residual variance equals ``errsumsq``:
+
+    >>> xydata = [(1, 1.5), (2, 1.5), (3, 3.5), (4, 3.5)]
+    >>> result = mlinr(xydata)
+    >>> [round(b, 12) for b in result.coefficients]
+    [0.5, 0.8]
+    >>> round(result.residual_variance, 12)
+    0.4
+
+    ``rows`` may be an iterator, and only O(p**2) memory is needed however
+    many rows there are. ``rows`` can also be a ``Regression`` instance, e.g.
+    one merged from fits calculated in parallel.
+    """
+    if isinstance(rows, Regression):
+        return rows.fit()
+    state = Regression(intercept)
+    state.update(rows)
+    return state.fit()
@@ -28,15 +28,25 @@ This module provides the following order statistics and related functions:
     midrange            The midpoint of the smallest and largest values.
     minmax              Minimum and maximum of the arguments.
     percentile          The specified 100-fractile of the data.
+    qn                  Rousseeuw and Croux's Qn estimator of scale.
     quantile            An arbitrary quantile.
     quartile_skewness   Skewness of the data calculated from quartiles.
     quartiles           The 4-fractiles of the data.
     range               The largest value minus the smallest value.
+    sn                  Rousseeuw and Croux's Sn estimator of scale.
     trimean             Tukey's trimean.
 
 The ``minmax`` function is an alias to the function of the same name in
 the ``stats`` module.
 
+The functions which take data also accept a keyword-only argument
+``skipna``. If it is true, missing values (None and NANs) are skipped:
+
+>>> median([3.0, None, 1.0, float('nan'), 2.0], skipna=True)
+2.0
+
+To count the missing values, wrap the data in ``stats.dropna`` instead.
+
 
 """
 # TODO: investigate finding median and other fractiles without sorting,
@@ -50,18 +60,23 @@ the ``stats`` module.
 
 __all__ = [
     'decile', 'fivenum', 'iqr', 'mad', 'median', 'midhinge', 'midrange',
-    'minmax', 'percentile', 'quantile', 'quartile_skewness', 'quartiles',
-    'range', 'trimean',
+    'minmax', 'percentile', 'qn', 'quantile', 'quartile_skewness',
+    'quartiles', 'range', 'sn', 'trimean',
     ]
 
 
+import array
 import collections
 import functools
+import itertools
 import math
+import operator
 import types
 
 import stats
 
+from builtins import range as _range
+
 from stats import minmax
 
 
@@ -92,6 +107,77 @@ def _namespace(obj):
     return ns
 
 
+def _skipna(func):
+    """Decorator adding a keyword-only argument ``skipna`` to func. If it
+    is true, the missing values in the data are skipped.
+
+    >>> @_skipna
+    ... def f(data):
+    ...     return list(data)
+    ...
+    >>> f([1, None, 2], skipna=True)
+    [1, 2]
+
+    """
+    @functools.wraps(func)
+    def inner(data, *args, skipna=False, **kwargs):
+        if skipna:
+            data = stats.dropna(data)
+        return func(data, *args, **kwargs)
+    return inner
+
+
+# Arrays at least this long are sorted with numpy, if it is available. It is
+# faster from about a hundred items, but not worth importing for a few.
+_SORT_THRESHOLD = 1000
+
+def _sorted(data):
+    """Return the items of data in sorted order.
+
+    Large arrays and buffers of floats or 64-bit ints (typecode or format
+    'd' or 'q') are sorted by numpy, if it is available, into a compact
+    array of the same type rather than a list of boxed numbers. Otherwise
+    returns a sorted list:
+
+    >>> _sorted((3, 1, 2))
+    [1, 2, 3]
+
+    """
+    if isinstance(data, array.array):
+        fmt = data.typecode
+    elif isinstance(data, memoryview) and data.ndim == 1:
+        fmt = data.format
+    else:
+        fmt = None
+    if fmt in ('d', 'q') and len(data) >= _SORT_THRESHOLD:
+        np = stats._numpy()
+        if np is not None:
+            return _sort_array(np, data, fmt)
+    return sorted(data)
+
+
+def _sort_array(np, data, fmt):
+    # Sort a copy of the buffer in place, without boxing the items.
+    result = array.array(fmt)
+    view = memoryview(data)
+    # Only contiguous buffers can be cast to bytes; copy strided ones.
+    result.frombytes(view.cast('B') if view.c_contiguous else view.tobytes())
+    view = np.frombuffer(result, dtype=fmt)
+    view.sort()
+    if fmt == 'd':
+        # numpy's sort is not stable, and treats -0.0 and 0.0 as equal.
+        # Put the negative zeroes first, as in the order of the bit
+        # patterns of the floats.
+        lo = view.searchsorted(0.0, 'left')
+        hi = view.searchsorted(0.0, 'right')
+        if hi - lo > 1:
+            zeroes = view[lo:hi]
+            negative = int(np.signbit(zeroes).sum())
+            zeroes[:negative] = -0.0
+            zeroes[negative:] = 0.0
+    return result
+
+
 def _interpolate(data, x):
     """Return the interpolated value of data at possibly fractional
     non-negative index x.
@@ -593,7 +679,7 @@ class _Quantile:
                 # More details here:
                 # http://reference.wolfram.com/mathematica/ref/Quantile.html
                 # http://mathworld.wolfram.com/Quantile.html
-                assert isinstance(data, list)
+                assert isinstance(data, (list, array.array))
                 assert 0 <= p <= 1
                 n = len(data)
                 h = a + (n+b)*p
@@ -637,6 +723,7 @@ class _Quantile:
 
 # -- Public fractile functions --
 
+@_skipna
 @_inject_aliases(_Median)
 def median(data, scheme=1):
     """Returns the median (middle) value of an iterable of numbers.
@@ -671,13 +758,14 @@ def median(data, scheme=1):
     func = _get_scheme_func(_Median, scheme)
     if isinstance(data, str):
         raise TypeError('data argument cannot be a string')
-    data = sorted(data)
+    data = _sorted(data)
     if len(data) == 0:
         raise stats.StatsError('no median for empty iterable')
     else:
         return func(data)
 
 
+@_skipna
 @_inject_aliases(_Quartiles)
 def quartiles(data, scheme=1):
     """quartiles(data [, scheme]) -> (Q1, Q2, Q3)
@@ -720,13 +808,14 @@ def quartiles(data, scheme=1):
     func = _get_scheme_func(_Quartiles, scheme)
     if isinstance(data, str):
         raise TypeError('data argument cannot be a string')
-    data = sorted(data)
+    data = _sorted(data)
     if len(data) < 3:
         raise stats.StatsError(
         'need at least 3 items to split data into quartiles')
     return func(data)
 
 
+@_skipna
 @_inject_aliases(_Median)
 def quantile(data, p, scheme=1):
     """quantile(data, p [, scheme]) -> value
@@ -815,7 +904,7 @@ def quantile(data, p, scheme=1):
     if not 0.0 <= p <= 1.0:
         raise stats.StatsError(
         'quantile argument must be between 0.0 and 1.0')
-    data = sorted(data)
+    data = _sorted(data)
     if len(data) < 2:
         raise stats.StatsError(
         'need at least 2 items to split data into quantiles')
@@ -824,6 +913,7 @@ def quantile(data, p, scheme=1):
 
 # -- Convenience functions for fractiles --
 
+@_skipna
 def fivenum(data):
     """Return Tukey's five number summary from data.
 
@@ -860,7 +950,7 @@ def fivenum(data):
     """
     if isinstance(data, str):
         raise TypeError('data argument cannot be a string')
-    data = sorted(data)
+    data = _sorted(data)
     a, b = minmax(data)
     h1, m, h2 = quartiles(data, scheme=1)
     summary = collections.namedtuple('fivenum',
@@ -868,6 +958,7 @@ def fivenum(data):
     return summary(a, h1, m, h2, b)
 
 
+@_skipna
 def decile(data, d, scheme=1):
     """Return the dth decile of data, for integer d between 0 and 10.
 
@@ -884,6 +975,7 @@ def decile(data, d, scheme=1):
     return quantile(data, Fraction(d, 10), scheme)
 
 
+@_skipna
 def percentile(data, p, scheme=1):
     """Return the pth percentile of data, for integer p between 0 and 100.
 
@@ -904,6 +996,7 @@ def percentile(data, p, scheme=1):
 # Other measures of central tendency
 # ----------------------------------
 
+@_skipna
 def midrange(data):
     """Returns the midrange of a sequence of numbers.
 
@@ -921,6 +1014,7 @@ def midrange(data):
     return (L + H)/2
 
 
+@_skipna
 def midhinge(data):
     """Return the midhinge of a sequence of numbers.
 
@@ -935,6 +1029,7 @@ def midhinge(data):
     return (H1 + H2)/2
 
 
+@_skipna
 def trimean(data):
     """Return Tukey's trimean = (H1 + 2*M + H2)/4 of data
 
@@ -954,6 +1049,7 @@ def trimean(data):
 # Measures of spread (dispersion or variability)
 # ----------------------------------------------
 
+@_skipna
 def range(data, interval=0):
     """range(iterable [, interval=0]) -> sample range R of data
 
@@ -1013,6 +1109,7 @@ range.d2 = {
     }
 
 
+@_skipna
 def iqr(data, scheme=1):
     """Returns the Inter-Quartile Range of a sequence of numbers.
 
@@ -1029,6 +1126,7 @@ def iqr(data, scheme=1):
     return q3 - q1
 
 
+@_skipna
 def mad(data, m=None, scheme=1, scale=1):
     """mad(iterable [, m=None [, scheme=1 [, scale=1]]]) -> value
 
@@ -1088,7 +1186,9 @@ def mad(data, m=None, scheme=1, scale=1):
     elif scale is None:
         scale = 1
     if m is None:
-        if not isinstance(data, (list, tuple)):
+        # Missing values are filtered on both passes rather than copied.
+        if not (isinstance(data, (list, tuple)) or
+                isinstance(data, stats.dropna) and data.reiterable()):
             data = list(data)
         m = median(data, scheme)
     med = median((abs(x - m) for x in data), scheme)
@@ -1105,6 +1205,231 @@ mad.scaling = {
     }
 
 
+def _scale_factor(func, scale, n):
+    """Return the scale factor for qn or sn of n data points."""
+    if isinstance(scale, str):
+        name = scale.lower()
+        f = func.scaling.get(name)
+        if f is None:
+            raise stats.StatsError('unrecognised scale factor `%s`' % scale)
+        if name != 'none':
+            f *= func.correction(n)
+        return f
+    elif scale is None:
+        return 1
+    return scale
+
+
+def _sn_window(y, k):
+    """Yield max |y[i] - y[j]| over the k nearest neighbours y[j] of y[i],
+    including y[i] itself, for each item y[i] of sorted list y.
+    """
+    # The k nearest neighbours of y[i] are a window y[s:s+k] of consecutive
+    # items which contains i, and the start s of the best window never
+    # decreases as i increases. So one sweep finds all of them.
+    n = len(y)
+    s = 0
+    for i, x in enumerate(y):
+        if s < i - k + 1:
+            s = i - k + 1
+        end = min(i, n - k)
+        best = max(x - y[s], y[s+k-1] - x)
+        while s < end:
+            cost = max(x - y[s+1], y[s+k] - x)
+            if cost > best:
+                break
+            s += 1
+            best = cost
+        yield best
+
+
+@_skipna
+def sn(data, scale=1):
+    """sn(iterable [, scale=1]) -> value
+
+    Returns Rousseeuw and Croux's Sn estimator of scale for data, the low
+    median over each data point of the high median of its distances to all
+    the data points:
+
+        Sn = lomed_i( himed_j( |x[i] - x[j]| ))
+
+    >>> sn([1, 2, 3, 5, 7, 8, 20])
+    4
+
+    Like the MAD, Sn is a robust estimate of spread which ignores outliers,
+    with a breakdown point of 50%. Unlike the MAD, it doesn't assume the
+    data is symmetric about the median, and it is more efficient for
+    normally distributed data.
+
+    The optional argument ``scale`` has the same meaning as for ``mad``. The
+    names in ``sn.scaling`` also apply the small sample correction
+    ``sn.correction(n)``, so that ``sn(data, scale='normal')`` estimates
+    the standard deviation of normally distributed data:
+
+    >>> sn([1, 2, 3, 5, 7, 8, 20], scale='normal')  #doctest: +ELLIPSIS
+    5.71...
+
+    This takes O(N*log N) time for N data points.
+    """
+    if isinstance(data, str):
+        raise TypeError('data argument cannot be a string')
+    y = sorted(data)
+    n = len(y)
+    if n < 2:
+        raise stats.StatsError('need at least 2 items to calculate Sn')
+    f = _scale_factor(sn, scale, n)
+    distances = sorted(_sn_window(y, n//2 + 1))
+    return f*distances[(n + 1)//2 - 1]
+
+sn.scaling = {
+    # Croux and Rousseeuw (1992), "Time-efficient algorithms for two highly
+    # robust estimators of scale": the consistency constant for normally
+    # distributed data.
+    'normal': 1.1926,
+    'none': 1,
+    }
+
+def _sn_correction(n):
+    """Return the small sample correction factor for sn, from Croux and
+    Rousseeuw (1992)."""
+    if n <= 9:
+        return (0.743, 1.851, 0.954, 1.351, 0.993, 1.198, 1.005, 1.131)[n-2]
+    return n/(n - 0.9) if n%2 else 1.0
+
+sn.correction = _sn_correction
+
+
+def _qn_starts(y, low, high):
+    """Return the starts of each row of the pairwise differences of y
+    which are < low, and of those which are <= high.
+
+    Row i holds the differences y[i] - y[j] for j < i, which decrease as j
+    increases, so the differences within a limit are those with j from
+    the start of the row up to i.
+    """
+    starts_lt = []
+    starts_le = []
+    a = b = 0
+    # The starts never decrease from one row to the next.
+    for i, x in enumerate(y):
+        while a < i and x - y[a] >= low:
+            a += 1
+        while b < i and x - y[b] > high:
+            b += 1
+        starts_lt.append(a)
+        starts_le.append(b)
+    return starts_lt, starts_le
+
+
+def _qn_select(y, k):
+    """Return the kth smallest (counting from 1) of the differences
+    y[i] - y[j], i > j, of sorted list y.
+    """
+    import random
+    n = len(y)
+    rng = random.Random(n)
+    # The candidates in row i are the differences y[i] - y[j] with j in
+    # range(lo[i], hi[i]); below is the number of differences known to be
+    # smaller than all the candidates.
+    lo = [0]*n
+    hi = list(_range(n))
+    below = 0
+    remaining = n*(n - 1)//2
+    narrow = True
+    while remaining > n:
+        # Pick trial values from a random sample of the candidates.
+        size = min(n, 50000)
+        cumulative = list(itertools.accumulate(map(operator.sub, hi, lo)))
+        rows = rng.choices(_range(n), cum_weights=cumulative, k=size)
+        sample = sorted(y[i] - y[lo[i] + int(rng.random()*(hi[i] - lo[i]))]
+                        for i in rows)
+        r = (k - below)*size/remaining
+        if narrow:
+            spread = 2*math.sqrt(size)
+            low = sample[max(0, int(r - spread))]
+            high = sample[min(size - 1, int(r + spread))]
+        else:
+            # The last pair of trial values didn't exclude any candidates,
+            # so try a single value.
+            low = high = sample[min(size - 1, int(r))]
+        starts_lt, starts_le = _qn_starts(y, low, high)
+        total = n*(n - 1)//2
+        count_lt = total - sum(starts_lt)
+        count_le = total - sum(starts_le)
+        if k <= count_lt:
+            # The answer is less than low.
+            lo = list(map(max, lo, starts_lt))
+        elif k > count_le:
+            # The answer is greater than high.
+            hi = list(map(min, hi, starts_le))
+        elif low == high:
+            return low
+        else:
+            lo = list(map(max, lo, starts_le))
+            hi = list(map(min, hi, starts_lt))
+        below = total - sum(hi)
+        previous, remaining = remaining, sum(hi) - sum(lo)
+        narrow = remaining < previous
+    candidates = sorted(y[i] - y[j] for i in _range(n)
+                        for j in _range(lo[i], hi[i]))
+    return candidates[k - below - 1]
+
+
+@_skipna
+def qn(data, scale=1):
+    """qn(iterable [, scale=1]) -> value
+
+    Returns Rousseeuw and Croux's Qn estimator of scale for data, the kth
+    smallest of the distances between pairs of data points, where
+    k = h*(h-1)/2 and h = N//2 + 1 for N data points. For large N this is
+    approximately the first quartile of the distances:
+
+    >>> qn([1, 2, 3, 5, 7, 8, 20])
+    2
+
+    Like the MAD, Qn is a robust estimate of spread which ignores outliers,
+    with a breakdown point of 50%. Unlike the MAD, it doesn't assume the
+    data is symmetric about the median, and it is much more efficient for
+    normally distributed data.
+
+    The optional argument ``scale`` has the same meaning as for ``mad``. The
+    names in ``qn.scaling`` also apply the small sample correction
+    ``qn.correction(n)``, so that ``qn(data, scale='normal')`` estimates
+    the standard deviation of normally distributed data:
+
+    >>> qn([1, 2, 3, 5, 7, 8, 20], scale='normal')  #doctest: +ELLIPSIS
+    3.80...
+
+    This takes O(N*log N) expected time for N data points, rather than the
+    O(N**2) time needed to list all the distances.
+    """
+    if isinstance(data, str):
+        raise TypeError('data argument cannot be a string')
+    y = sorted(data)
+    n = len(y)
+    if n < 2:
+        raise stats.StatsError('need at least 2 items to calculate Qn')
+    f = _scale_factor(qn, scale, n)
+    h = n//2 + 1
+    return f*_qn_select(y, h*(h - 1)//2)
+
+qn.scaling = {
+    # Croux and Rousseeuw (1992): the consistency constant for normally
+    # distributed data.
+    'normal': 2.2219,
+    'none': 1,
+    }
+
+def _qn_correction(n):
+    """Return the small sample correction factor for qn, from Croux and
+    Rousseeuw (1992)."""
+    if n <= 9:
+        return (0.399, 0.994, 0.512, 0.844, 0.611, 0.857, 0.669, 0.872)[n-2]
+    return n/(n + 1.4) if n%2 else n/(n + 3.8)
+
+qn.correction = _qn_correction
+
+
 # Other moments of the data
 # -------------------------
 
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file __init__.py for the licence terms for this software.
+
+"""
+Bootstrap and jackknife resampling.
+
+This module provides the following functions:
+
+    Function            Description
+    ==================  ===============================================
+    bootstrap           Bootstrap confidence intervals of a statistic.
+    jackknife           Jackknife (leave-some-out) replicates.
+
+Any statistic of a single sample can be used, including the functions of
+the ``stats`` package, or of (x, y) pairs, such as ``stats.multivar.corr``:
+
+>>> import stats
+>>> data = [2.5, 3.25, 4.0, 4.5, 5.0, 5.5, 6.75, 9.0]
+>>> result = bootstrap(data, stats.mean, resamples=200, seed=42)
+>>> result.estimate
+5.0625
+>>> result.percentile.low < 5.0625 < result.percentile.high
+True
+
+Results are reproducible: each resample is drawn from its own random
+number generator, seeded from ``seed`` and the number of the resample, so
+the same seed gives the same replicates however many processes are used.
+"""
+
+__all__ = ['bootstrap', 'Bootstrap', 'Interval', 'jackknife']
+
+
+import collections
+import itertools
+import math
+import operator
+import random
+
+import stats
+import stats.order
+
+
+Interval = collections.namedtuple('Interval', 'low high')
+
+Bootstrap = collections.namedtuple(
+    'Bootstrap', 'estimate percentile bca replicates seed')
+Bootstrap.__doc__ = """Result of ``bootstrap``.
+
+    estimate    the statistic of the original data
+    percentile  percentile confidence Interval
+    bca         bias-corrected and accelerated confidence Interval, or
+                None if not calculated
+    replicates  sorted list of the statistic of each resample
+    seed        the seed used, to reproduce the resamples
+    """
+
+
+# === Resampling ===
+
+def _base(data):
+    # Return the data as a list, sorted if possible. Every resample of
+    # sorted data is drawn already sorted, so that order statistics such
+    # as stats.order.median only take linear time to re-sort it.
+    try:
+        base = sorted(data)
+    except TypeError:
+        base = list(data)
+    if not base:
+        raise stats.StatsError('cannot resample empty data')
+    return base
+
+
+def _sorted_indices(n, rng):
+    """Return a sorted list of n random indices below n, with replacement.
+
+    >>> indices = _sorted_indices(1000, random.Random(1))
+    >>> indices == sorted(indices) and 0 <= indices[0] <= indices[-1] < 1000
+    True
+
+    """
+    # The partial sums of n+1 exponential variates, divided by their total,
+    # are distributed like the order statistics of n uniform variates, so
+    # the indices are generated in order without sorting them. Everything
+    # runs in C except drawing the random numbers.
+    repeat = itertools.repeat
+    sums = list(itertools.accumulate(map(math.log, map(
+        operator.sub, repeat(1.0),
+        itertools.islice(iter(rng.random, None), n + 1)))))
+    total = sums.pop()
+    indices = list(map(int, map(operator.mul, sums, repeat(n/total))))
+    # Rounding can push the last few indices up to n.
+    i = n - 1
+    while i >= 0 and indices[i] >= n:
+        indices[i] = n - 1
+        i -= 1
+    return indices
+
+
+def _rng(seed, i):
+    # The random number generator for resample i.
+    return random.Random('%s:%d' % (seed, i))
+
+
+def _replicates(base, statistic, seed, start, stop):
+    # Return the statistic of resamples start...stop-1 of base.
+    n = len(base)
+    getitem = base.__getitem__
+    return [statistic(list(map(getitem, _sorted_indices(n, _rng(seed, i)))))
+            for i in range(start, stop)]
+
+
+def _leave_out(base, statistic, groups, start, stop):
+    # Return the statistic of base without each of groups start...stop-1,
+    # where group j holds items j, j+groups, j+2*groups, ...
+    result = []
+    for j in range(start, stop):
+        sample = base[:]
+        del sample[j::groups]
+        result.append(statistic(sample))
+    return result
+
+
+# === Process pool ===
+
+# The data and statistic of a worker process, sent once by _initialise
+# rather than with every task.
+_worker = None
+
+def _initialise(base, statistic):
+    global _worker
+    _worker = (base, statistic)
+
+
+def _call(func, args):
+    return func(*(_worker + args))
+
+
+def _run(func, base, statistic, count, args, processes):
+    """Return the concatenated results of func(base, statistic, *args,
+    start, stop) for chunks start...stop of range(count).
+
+    If processes is 1, run in this process; otherwise in a pool of that
+    many processes, or one per CPU if processes is None.
+    """
+    if processes is None:
+        import os
+        processes = os.cpu_count() or 1
+    if processes < 1:
+        raise ValueError('processes must be at least 1')
+    if processes == 1 or count < 2:
+        return func(base, statistic, *(args + (0, count)))
+    # Several chunks per process balance the load if some are slower.
+    size = -(-count//(4*processes))
+    chunks = [args + (start, min(start + size, count))
+              for start in range(0, count, size)]
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(
+            processes, initializer=_initialise,
+            initargs=(base, statistic)) as pool:
+        results = pool.map(_call, itertools.repeat(func), chunks)
+        return list(itertools.chain.from_iterable(results))
+
+
+# === Normal distribution ===
+
+def _ndtr(x):
+    """Return the cumulative distribution function of the standard normal
+    distribution at x.
+
+    >>> _ndtr(0.0)
+    0.5
+
+    """
+    return 0.5*math.erfc(-x/math.sqrt(2))
+
+
+# Coefficients of Acklam's rational approximations to _ndtri.
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01, 1.0)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00, 1.0)
+
+def _poly(coefficients, x):
+    result = 0.0
+    for c in coefficients:
+        result = result*x + c
+    return result
+
+
+def _ndtri(p):
+    """Return the inverse of _ndtr, for 0 < p < 1.
+
+    >>> round(_ndtri(0.975), 12)
+    1.95996398454
+
+    """
+    if not 0 < p < 1:
+        raise ValueError('p must be between 0 and 1')
+    if p > 0.5:
+        # 1 - p is exact, and the lower tail is more accurate.
+        return -_ndtri(1.0 - p)
+    if p < 0.02425:
+        q = math.sqrt(-2*math.log(p))
+        x = _poly(_C, q)/_poly(_D, q)
+    else:
+        q = p - 0.5
+        r = q*q
+        x = _poly(_A, r)*q/_poly(_B, r)
+    # One step of Halley's method refines the approximation (relative error
+    # about 1e-9) to full precision.
+    e = _ndtr(x) - p
+    u = e*math.sqrt(2*math.pi)*math.exp(x*x/2)
+    return x - u/(1 + x*u/2)
+
+
+# === Public functions ===
+
+def jackknife(data, statistic, groups=None, processes=1):
+    """Return the jackknife replicates of statistic of data.
+
+    With the default ``groups=None``, each replicate is the statistic of
+    the data with one item left out, as long as there are no more than 200
+    items. For more data, calculating that many replicates is too slow, and
+    the data is divided into 200 groups instead: replicate j leaves out
+    items j, j+200, j+400, ... of the sorted data. Pass ``groups`` to
+    choose a different number of groups.
+
+    >>> import stats
+    >>> jackknife([1, 2, 3, 6], stats.mean)
+    [3.6666666666666665, 3.3333333333333335, 3.0, 2.0]
+
+    ``processes`` is as for ``bootstrap``.
+    """
+    base = _base(data)
+    n = len(base)
+    if groups is None:
+        groups = min(n, 200)
+    if not 1 < groups <= n:
+        raise ValueError('groups must be between 2 and the number of items')
+    return _run(_leave_out, base, statistic, groups, (groups,), processes)
+
+
+def bootstrap(data, statistic, resamples=1000, confidence=0.95, bca=True,
+              seed=None, processes=1, groups=None):
+    """Return bootstrap confidence intervals of statistic of data.
+
+    ``statistic`` is a function which takes a list of data points and
+    returns a number, such as ``stats.mean`` or ``stats.order.median``.
+    The data points may be numbers, or tuples such as (x, y) pairs. The
+    result is a ``Bootstrap`` named tuple, with the percentile interval
+    and, if ``bca`` is true (the default), the bias-corrected and
+    accelerated (BCa) interval, at the given ``confidence`` level:
+
+    >>> import stats.order
+    >>> data = [1.5, 2.0, 2.25, 3.0, 3.5, 4.0, 5.25, 6.0, 8.5, 12.0]
+    >>> result = bootstrap(data, stats.order.median, resamples=500, seed=1)
+    >>> result.estimate
+    3.75
+    >>> result.bca
+    Interval(low=2.25, high=7.25)
+
+    The BCa interval corrects for bias and skewness in the distribution of
+    the statistic, and is usually more accurate. It needs the ``jackknife``
+    replicates of the statistic as well, with the given number of
+    ``groups``.
+
+    Each resample is drawn from a random number generator seeded from
+    ``seed`` (a random seed is chosen if it is None) and the number of the
+    resample. The resample indices are generated in bulk and already in
+    order, and the data is sorted once beforehand (if it can be), so each
+    resample is also sorted and order statistics don't need to sort it.
+
+    If ``processes`` is greater than 1, the resamples are shared between
+    a pool of that many worker processes; if it is None, one per CPU. The
+    statistic must then be a module-level function, so that it can be sent
+    to the workers. The results are the same whatever the number of
+    processes.
+    """
+    if resamples < 2:
+        raise ValueError('at least two resamples are required')
+    if not 0 < confidence < 1:
+        raise ValueError('confidence must be between 0 and 1')
+    if seed is None:
+        seed = random.randrange(2**64)
+    base = _base(data)
+    estimate = statistic(base)
+    replicates = _run(_replicates, base, statistic, resamples, (seed,),
+                      processes)
+    replicates.sort()
+    alpha = (1 - confidence)/2
+    def quantile(p):
+        return stats.order.quantile(replicates, p, scheme=7)
+    percentile = Interval(quantile(alpha), quantile(1 - alpha))
+    if bca:
+        # Bias correction, counting replicates equal to the estimate as
+        # half below it, and keeping away from 0 and 1.
+        below = sum(map(operator.lt, replicates, itertools.repeat(estimate)))
+        equal = sum(map(operator.eq, replicates, itertools.repeat(estimate)))
+        p = (below + equal/2)/resamples
+        p = min(max(p, 0.5/resamples), 1 - 0.5/resamples)
+        z0 = _ndtri(p)
+        # Acceleration, from the skewness of the jackknife replicates.
+        jack = jackknife(base, statistic, groups, processes)
+        m = math.fsum(jack)/len(jack)
+        d = [m - t for t in jack]
+        ss = math.fsum(x*x for x in d)
+        a = math.fsum(x**3 for x in d)/(6*ss**1.5) if ss else 0.0
+        limits = []
+        for q in (alpha, 1 - alpha):
+            z = z0 + _ndtri(q)
+            limits.append(quantile(_ndtr(z0 + z/(1 - a*z))))
+        bca = Interval(*limits)
+    else:
+        bca = None
+    return Bootstrap(estimate, percentile, bca, replicates, seed)
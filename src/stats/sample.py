@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+##  Copyright (c) 2011 Steven D'Aprano.
+##  See the file __init__.py for the licence terms for this software.
+
+"""
+Sample objects, for calculating many statistics from the same data.
+
+Each statistics function in the ``stats`` package starts from scratch,
+so calculating the mean, standard deviation, median, quartiles and
+skewness of one data set sums the data, sorts it and calculates the
+deviations from the mean several times over. A ``Sample`` holds a copy
+of the data and remembers those intermediate results the first time they
+are needed, so that later statistics can reuse them:
+
+>>> from stats.sample import Sample
+>>> s = Sample([1.25, 1.5, 1.5, 1.75, 1.75, 2.5, 2.75, 4.5])
+>>> s.mean()
+2.1875
+>>> s.median()
+1.75
+>>> s.skewness()  #doctest: +ELLIPSIS
+1.71461013539878...
+
+The methods of ``Sample`` have the same names and optional arguments as
+the module-level functions, and return identical results.
+
+The data cannot be changed after the ``Sample`` is created. Floats are
+stored in an ``array.array('d')``, which uses less memory and is faster
+to process than a list; other data is stored in a tuple.
+"""
+
+__all__ = ['Sample']
+
+
+import array
+
+import stats
+import stats.order
+import stats.univar
+import stats.vectorize as v
+
+
+class Sample:
+    """Sample(iterable_of_numbers) -> immutable sample of data
+
+    A single variable sample which calculates statistics on demand and
+    caches the intermediate results (the count, sum, mean, sums of powers
+    of deviations from the mean, sorted data and frequency table) shared
+    between them:
+
+    >>> s = Sample([2, 4, 4, 4, 5, 5, 7, 9])
+    >>> len(s)
+    8
+    >>> s.pstdev()
+    2.0
+    >>> s.quartiles()
+    (4.0, 4.5, 6.0)
+    >>> s.mode()
+    4
+
+    Methods which take optional values estimated from the data, such as
+    ``m`` for ``variance``, only use the cache if those values are not
+    given.
+    """
+    __slots__ = ('_data', '_cache')
+
+    def __init__(self, data):
+        if isinstance(data, str):
+            raise TypeError('data argument cannot be a string')
+        if isinstance(data, Sample):
+            data = data._data
+        elif isinstance(data, array.array):
+            data = array.array(data.typecode, data)  # Take a copy.
+        else:
+            data = tuple(data)
+            if data and all(type(x) is float for x in data):
+                data = array.array('d', data)
+        self._data = data
+        self._cache = {}
+
+    def _get(self, key, func, *args):
+        # Return the cached value for key, calculating it if needed.
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = func(*args)
+            return value
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self._data[index])
+        return self._data[index]
+
+    def __repr__(self):
+        return '<%s of %d items>' % (type(self).__name__, len(self._data))
+
+    # === Intermediate results ===
+
+    def _len_sum(self):
+        return self._get('len_sum', stats._len_sum, self._data)
+
+    def _moment(self, r):
+        # The length and sum of the r-th powers of the deviations from the
+        # mean, standardised by the population standard deviation if r > 2.
+        if r == 2:
+            return self._get(2, stats._std_moment, self._data, self.mean(),
+                             1, 2)
+        return self._get(r, stats._std_moment, self._data, self.mean(),
+                         self.pstdev(), r)
+
+    def _sorted(self):
+        return self._get('sorted', sorted, self._data)
+
+    def _freq_table(self):
+        return self._get('freq', stats.univar.make_freq_table, self._data)
+
+    def freq_table(self):
+        """Return a frequency table of the data, like ``make_freq_table``.
+
+        >>> sorted(Sample([1.5, 2.5, 1.5]).freq_table().items())
+        [(1.5, 2), (2.5, 1)]
+
+        """
+        return dict(self._freq_table())
+
+    # === Sums and means ===
+
+    def sum(self, start=0):
+        """Return the high-precision sum of the data, like ``stats.sum``."""
+        n, total = self._len_sum()
+        if not n:
+            return start
+        return v.add(total, start)
+
+    def mean(self):
+        """Return the arithmetic mean of the data, like ``stats.mean``."""
+        n, total = self._len_sum()
+        if not n:
+            raise stats.StatsError('mean of empty sequence is not defined')
+        return v.div(total, n)
+
+    def mode(self):
+        """Return the most common item, like ``stats.univar.mode``."""
+        return stats.univar._mode_from(self._freq_table())
+
+    # === Spread ===
+
+    def variance(self, m=None):
+        """Return the sample variance, like ``stats.variance``."""
+        if m is not None:
+            return stats.variance(self._data, m)
+        n, ss = self._moment(2)
+        return stats._variance_from(n, ss, 1)
+
+    def pvariance(self, m=None):
+        """Return the population variance, like ``stats.pvariance``."""
+        if m is not None:
+            return stats.pvariance(self._data, m)
+        n, ss = self._moment(2)
+        return stats._variance_from(n, ss, 0)
+
+    def stdev(self, m=None):
+        """Return the sample standard deviation, like ``stats.stdev``."""
+        return v.sqrt(self.variance(m))
+
+    def pstdev(self, m=None):
+        """Return the population standard deviation, like ``stats.pstdev``."""
+        return v.sqrt(self.pvariance(m))
+
+    # === Shape ===
+
+    def skewness(self, m=None, s=None):
+        """Return the sample skewness, like ``stats.univar.skewness``."""
+        if m is s is None:
+            return stats.univar._skewness_from(*self._moment(3))
+        return stats.univar.skewness(self._data, m, s)
+
+    def pskewness(self, m=None, s=None):
+        """Return the population skewness, like ``stats.univar.pskewness``."""
+        if m is s is None:
+            return stats.univar._pskewness_from(*self._moment(3))
+        return stats.univar.pskewness(self._data, m, s)
+
+    def kurtosis(self, m=None, s=None):
+        """Return the sample excess kurtosis, like ``stats.univar.kurtosis``."""
+        if m is s is None:
+            return stats.univar._kurtosis_from(*self._moment(4))
+        return stats.univar.kurtosis(self._data, m, s)
+
+    def pkurtosis(self, m=None, s=None):
+        """Return the population kurtosis, like ``stats.univar.pkurtosis``."""
+        if m is s is None:
+            return stats.univar._pkurtosis_from(*self._moment(4))
+        return stats.univar.pkurtosis(self._data, m, s)
+
+    # === Order statistics ===
+    # The order functions sort their data again, but sorting data which is
+    # already sorted only takes linear time.
+
+    def median(self, scheme=1):
+        """Return the median, like ``stats.order.median``."""
+        return stats.order.median(self._sorted(), scheme)
+
+    def quartiles(self, scheme=1):
+        """Return the quartiles, like ``stats.order.quartiles``."""
+        return stats.order.quartiles(self._sorted(), scheme)
+
+    def quantile(self, p, scheme=1):
+        """Return the p-th quantile, like ``stats.order.quantile``."""
+        return stats.order.quantile(self._sorted(), p, scheme)
+
+    def iqr(self, scheme=1):
+        """Return the inter-quartile range, like ``stats.order.iqr``."""
+        return stats.order.iqr(self._sorted(), scheme)
+
+    def mad(self, m=None, scheme=1, scale=1):
+        """Return the median absolute deviation, like ``stats.order.mad``."""
+        if m is None:
+            m = self.median(scheme)
+        return stats.order.mad(self._sorted(), m, scheme, scale)
+
+    def qn(self, scale=1):
+        """Return the Qn estimator of scale, like ``stats.order.qn``."""
+        return stats.order.qn(self._sorted(), scale)
+
+    def sn(self, scale=1):
+        """Return the Sn estimator of scale, like ``stats.order.sn``."""
+        return stats.order.sn(self._sorted(), scale)
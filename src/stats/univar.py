@@ -14,23 +14,27 @@ univariate (single-variable) data. For additional functions, see the main
 
 This module provides the following univariate statistics functions:
 
-    Function            Description
-    ==================  ===============================================
-    average_deviation   Average deviation from a central location.
-    circular_mean       Mean (average) of circular quantities.
-    geometric_mean*     Mean of exponential growth rates.
-    harmonic_mean*      Mean of rates or speeds.
-    kurtosis*           Measure of shape of the data.
-    mode                Most frequent value.
-    moving_average      Simple moving average iterator.
-    pearson_skewness    Measure of symmetry of the data.
-    pkurtosis*          Population kurtosis.
-    pskewness*          Population skewness.
-    quadratic_mean*     Root-mean-square average.
-    skewness*           Measure of the symmetry of the data
-    sterrkurtosis       Standard error of the kurtosis.
-    sterrmean           Standard error of the mean.
-    sterrskewness       Standard error of the skewness.
+    Function              Description
+    ====================  ===============================================
+    average_deviation     Average deviation from a central location.
+    circular_mean         Mean (average) of circular quantities.
+    circular_summary      Mean, spread and resultant of circular data.
+    geometric_mean*       Mean of exponential growth rates.
+    harmonic_mean*        Mean of rates or speeds.
+    kurtosis*             Measure of shape of the data.
+    mode                  Most frequent value.
+    moving_average        Simple moving average iterator.
+    pearson_skewness      Measure of symmetry of the data.
+    pkurtosis*            Population kurtosis.
+    pskewness*            Population skewness.
+    quadratic_mean*       Root-mean-square average.
+    skewness*             Measure of the symmetry of the data
+    sterrkurtosis         Standard error of the kurtosis.
+    sterrmean             Standard error of the mean.
+    sterrskewness         Standard error of the skewness.
+    trimmed_mean*         Mean of the data with the extremes cut off.
+    winsorized_mean*      Mean of the data with the extremes clamped.
+    winsorized_variance*  Sample variance of the winsorized data.
 
 Functions marked with * can operate on columnar data. See the documentation
 for the ``stats`` module, or the indiviual function, for further details.
@@ -38,18 +42,20 @@ for the ``stats`` module, or the indiviual function, for further details.
 """
 
 __all__ = [
-    'average_deviation', 'circular_mean', 'geometric_mean', 'harmonic_mean',
-    'kurtosis', 'mode', 'moving_average', 'pearson_skewness',
-    'quadratic_mean', 'skewness', 'sterrkurtosis', 'sterrmean',
-    'sterrskewness',
+    'average_deviation', 'circular_mean', 'circular_summary',
+    'CircularSummary', 'geometric_mean', 'harmonic_mean', 'kurtosis', 'mode',
+    'moving_average', 'pearson_skewness', 'quadratic_mean', 'skewness',
+    'sterrkurtosis', 'sterrmean', 'sterrskewness', 'trimmed_mean',
+    'winsorized_mean', 'winsorized_variance',
     ]
 
-import decimal
 import math
 import operator
 import functools
 import itertools
+import array
 import collections
+import sys
 
 import stats
 import stats.utils
@@ -85,28 +91,35 @@ def _divide(num, den):
     """
     try:
         return num/den
-    except (decimal.DivisionByZero, decimal.InvalidOperation):
-        # num and den could be NANs, INFs, or den == 0. The easiest way
-        # to handle all the cases is just do the division again.
-        with decimal.localcontext() as ctx:
-            ctx.traps[decimal.DivisionByZero] = 0
-            ctx.traps[decimal.InvalidOperation] = 0
-            return num/den
-    except ZeroDivisionError:
-        assert den == 0  # Division by NAN or INF is handled okay.
-        assert not math.isnan(num)  # NAN/x will not raise Zero
-        if num == 0:
-            return float('nan')
-        else:
-            result = math.copysign(float('inf'), den)  # Support signed zero.
-            if num < 0:
-                result = -result
-            return result
+    except ArithmeticError as err:
+        # Only Decimals raise decimal exceptions, in which case the decimal
+        # module is already loaded; don't import it just to check.
+        decimal = sys.modules.get('decimal')
+        if decimal is not None and isinstance(
+                err, (decimal.DivisionByZero, decimal.InvalidOperation)):
+            # num and den could be NANs, INFs, or den == 0. The easiest way
+            # to handle all the cases is just do the division again.
+            with decimal.localcontext() as ctx:
+                ctx.traps[decimal.DivisionByZero] = 0
+                ctx.traps[decimal.InvalidOperation] = 0
+                return num/den
+        if not isinstance(err, ZeroDivisionError):
+            raise
+    assert den == 0  # Division by NAN or INF is handled okay.
+    assert not math.isnan(num)  # NAN/x will not raise Zero
+    if num == 0:
+        return float('nan')
+    else:
+        result = math.copysign(float('inf'), den)  # Support signed zero.
+        if num < 0:
+            result = -result
+        return result
 
 
 # Measures of central tendency (means and averages)
 # -------------------------------------------------
 
+@v.columnar
 def harmonic_mean(data):
     """harmonic_mean(iterable_of_numbers) -> harmonic mean of numbers
     harmonic_mean(iterable_of_rows) -> harmonic means of columns
@@ -137,14 +150,49 @@ def harmonic_mean(data):
     """
     # FIXME harmonic_mean([x]) should equal x exactly, but due to rounding
     # errors in the 1/(1/x) round trip, sometimes it doesn't.
-    invert = functools.partial(_divide, 1)
-    n, total = stats._len_sum(v.apply(invert, x) for x in data)
+    if isinstance(data, (list, tuple, array.array)):
+        blocks = iter([data])
+    else:
+        blocks = stats._blocks(data)
+    first = next(blocks, [])
+    if isinstance(first, array.array) or set(map(type, first)) <= {float, int}:
+        n, total = _reciprocal_sum(itertools.chain([first], blocks))
+    else:
+        invert = functools.partial(_divide, 1)
+        data = itertools.chain(first, itertools.chain.from_iterable(blocks))
+        n, total = stats._len_sum(v.apply(invert, x) for x in data)
     if not n:
         raise stats.StatsError(
         'harmonic mean of empty sequence is not defined')
     return v.div(n, total)
 
 
+def _reciprocal_sum(blocks):
+    """Return the number of items in blocks (an iterable of sequences of
+    numbers) and the high-precision sum of their reciprocals.
+
+    >>> _reciprocal_sum([[1, 2.0], [4.0, -0.0]])
+    (4, -inf)
+
+    """
+    # Reciprocals of plain ints and floats are taken in bulk with map and
+    # summed with fsum, without _divide's exception handling. A block holding
+    # a zero, an int too big for a float, or anything else unusual takes the
+    # careful path instead, which gives signed zeroes their signed INFs.
+    invert = (1.0).__truediv__
+    n = 0
+    totals = []
+    for block in blocks:
+        n += len(block)
+        try:
+            totals.append(math.fsum(map(invert, block)))
+        except (ArithmeticError, TypeError, ValueError):
+            careful = functools.partial(_divide, 1)
+            totals.append(stats._fsum(map(careful, block)).value())
+    return (n, stats._fsum(totals).value())
+
+
+@v.columnar
 def geometric_mean(data):
     """Return the sample geometric mean of a sequence of non-negative numbers.
 
@@ -166,28 +214,48 @@ def geometric_mean(data):
     [1.81712059283..., 3.0]
 
     """
+    blocks = stats._blocks(data, 1000)
+    first = next(blocks, [])
+    if set(map(type, first)) <= {float, int}:
+        # Multiply plain numbers with the mantissas and exponents kept
+        # apart, so that long products don't overflow or underflow.
+        n, m, e = stats._scaled_product(
+            itertools.chain([first], blocks), signed=False)
+        if not n:
+            raise stats.StatsError(
+            'geometric mean of empty sequence is not defined')
+        return _scaled_root(m, e, n)
+    data = itertools.chain(first, itertools.chain.from_iterable(blocks))
     # Calculate the length and product of data.
     def safe_mul(a, b):
         x = a*b
         if x < 0: return float('nan')
         return x
     mul = functools.partial(v.apply_op, safe_mul)
-
-    # Special case for speed.
-    if isinstance(data, list):
-        n = len(data)
-    else:
-        n = None
-        data = stats._countiter(data)
+    data = stats._countiter(data)
     prod = functools.reduce(mul, data)
-    if n is None:
-        n = data.count
-    if not n:
-        raise stats.StatsError(
-        'geometric mean of empty sequence is not defined')
-    return v.pow(prod, 1.0/n)
+    return v.pow(prod, 1.0/data.count)
 
 
+def _scaled_root(m, e, n):
+    """Return the nth root of m*2**e, for non-negative m.
+
+    >>> _scaled_root(0.5, 3001, 1000)
+    8.0
+
+    """
+    if not (m and math.isfinite(m)):
+        # Zero, INF or NAN.
+        return m
+    if -1000 < e < 1000:
+        # The same result as before the exponent was kept apart.
+        return math.ldexp(m, e)**(1.0/n)
+    # Split off the whole powers of two in the root to keep precision.
+    q, r = divmod(e, n)
+    return math.ldexp(2.0**((r + math.log2(m))/n), q)
+
+
+@v.columnar
 def quadratic_mean(data):
     """quadratic_mean(iterable_of_numbers) -> quadratic mean of numbers
     quadratic_mean(iterable_of_rows) -> quadratic means of columns
@@ -244,9 +312,12 @@ def mode(data):
 
     If your data is continuous, see functions .... FIXME
     """
+    return _mode_from(make_freq_table(data))
+
+
+def _mode_from(table):
     L = sorted(
-        [(count, value) for (value, count) in
-         make_freq_table(data).items()],
+        [(count, value) for (value, count) in table.items()],
          reverse=True)
     if len(L) == 0:
         raise stats.StatsError('no mode is defined for empty iterables')
@@ -279,9 +350,182 @@ def moving_average(data, window=3):
         yield s/window
 
 
+def _columns(data):
+    # Return the columns of data if it is a sequence of rows, else None.
+    if data and isinstance(data[0], (list, tuple)):
+        if len(set(len(row) for row in data)) != 1:
+            raise ValueError('rows must all have the same number of columns')
+        return list(zip(*data))
+    return None
+
+
+_Trim = collections.namedtuple(
+    '_Trim', 'low high k_low k_high low_tail high_tail floats')
+
+
+def _trim(data, proportion):
+    """Return the number of items g to cut from each end of sequence data,
+    and a _Trim describing the cut.
+
+    low and high are the g-th smallest and largest items, k_low and k_high
+    are the numbers of items equal to low and high which are kept, and
+    low_tail and high_tail are sequences which contain every item <= low
+    and >= high respectively. floats is true if data holds only floats.
+
+    Short data is sorted once. Otherwise, rather than sorting the data,
+    the cut points are bracketed using a sorted sample, and then selected
+    from copies of the (usually short) tails.
+    """
+    if not 0 <= proportion < 0.5:
+        raise stats.StatsError('proportion must be at least 0 and below 0.5')
+    n = len(data)
+    if not n:
+        raise stats.StatsError('trimming an empty sequence is not defined')
+    g = int(proportion*n)
+    floats = _all_floats(data)
+    low_tail = high_tail = data
+    if n <= 600:
+        ordered = sorted(data)
+        low, high = ordered[g], ordered[n - g - 1]
+    else:
+        sample = sorted(data[::n//int(n**(2/3))])
+        size = len(sample)
+        gap = int(2*math.sqrt(size)) + 1
+        low_cut = sample[min(g*size//n + gap, size - 1)]
+        high_cut = sample[max((n - g - 1)*size//n - gap, 0)]
+        if low_cut < high_cut:
+            low_tail = [x for x in data if x <= low_cut]
+            high_tail = [x for x in data if x >= high_cut]
+            if len(low_tail) <= g or len(high_tail) <= g:
+                low_tail = high_tail = data  # The sample missed.
+        select = stats.utils._select
+        low = select(low_tail, g)
+        high = select(high_tail, len(high_tail) - g - 1)
+    if low == high:
+        return g, _Trim(low, high, n - 2*g, 0, (), (), floats)
+    k_low = sum(map(operator.le, low_tail, itertools.repeat(low))) - g
+    k_high = sum(map(operator.ge, high_tail, itertools.repeat(high))) - g
+    return g, _Trim(low, high, k_low, k_high, low_tail, high_tail, floats)
+
+
+def _clipped_sum(data, trim, func=None):
+    """Return the high-precision sum of the items of data strictly between
+    trim.low and trim.high, plus trim.k_low copies of low and trim.k_high
+    copies of high.
+
+    If func is given, it takes an iterator and returns an iterator of the
+    values to sum, e.g. the squared deviations of the items.
+    """
+    if func is None:
+        func = iter
+    low, high = trim.low, trim.high
+    repeat = itertools.repeat
+    if trim.floats and type(low) is type(high) is float:
+        # Filter the data with C code only: add everything and subtract the
+        # tails, which math.fsum does exactly.
+        if low == high:
+            return math.fsum(func(repeat(low, trim.k_low + trim.k_high)))
+        neg = operator.neg
+        try:
+            return math.fsum(itertools.chain(
+                func(data), func(repeat(low, trim.k_low)),
+                func(repeat(high, trim.k_high)),
+                map(neg, func(filter(low.__ge__, trim.low_tail))),
+                map(neg, func(filter(high.__le__, trim.high_tail)))))
+        except (ValueError, OverflowError):
+            pass  # Infinities; let the general case handle them.
+    return stats._len_sum(func(itertools.chain(
+        repeat(low, trim.k_low), (x for x in data if low < x < high),
+        repeat(high, trim.k_high))))[1]
+
+
+def _all_floats(data):
+    if isinstance(data, array.array):
+        return data.typecode in 'fd'
+    return all(type(x) is float for x in data)
+
+
+@v.columnar
+def trimmed_mean(data, proportion):
+    """trimmed_mean(iterable_of_numbers, proportion) -> trimmed mean
+    trimmed_mean(iterable_of_rows, proportion) -> trimmed means of columns
+
+    Return the mean of the data after cutting the given proportion of the
+    items from each end of the sorted data. ``proportion`` must be at least
+    0 and less than 0.5; the number of items cut from each end is
+    ``int(proportion*len(data))``.
+
+    >>> trimmed_mean([1, 2, 3, 4, 5, 6, 7, 8, 9, 100], 0.1)
+    5.5
+
+    The trimmed mean is a robust estimator of location: it is less affected
+    by outliers than the mean, but uses more of the data than the median.
+
+    For more than 600 items, the cut points are found by selection in
+    linear time on average, and the retained items are summed in one pass,
+    so only the items in the two tails beyond estimates of the cut points
+    are copied, rather than all of the data being sorted. Shorter data is
+    sorted.
+
+    When passed an iterable of sequences, each inner sequence represents a
+    row of data, and ``trimmed_mean`` operates on each column. All rows
+    must have the same number of columns, or ValueError is raised.
+
+    >>> data = [[1, 5], [2, 6], [3, 7], [40, 8]]
+    >>> trimmed_mean(data, 0.25)
+    [2.5, 6.5]
+
+    """
+    if not isinstance(data, (list, tuple, array.array)):
+        data = list(data)
+    columns = _columns(data)
+    if columns is not None:
+        return [trimmed_mean(column, proportion) for column in columns]
+    g, trim = _trim(data, proportion)
+    return v.div(_clipped_sum(data, trim), len(data) - 2*g)
+
+
+def _winsorize(data, proportion):
+    # Return a _Trim describing the winsorized data.
+    g, trim = _trim(data, proportion)
+    return trim._replace(k_low=trim.k_low + g, k_high=trim.k_high + g)
+
+
+@v.columnar
+def winsorized_mean(data, proportion):
+    """winsorized_mean(iterable_of_numbers, proportion) -> winsorized mean
+    winsorized_mean(iterable_of_rows, proportion) -> winsorized means
+
+    Return the mean of the data after replacing the given proportion of the
+    items at each end of the sorted data by the nearest remaining item.
+    ``proportion`` must be at least 0 and less than 0.5; the number of
+    items replaced at each end is ``int(proportion*len(data))``.
+
+    >>> winsorized_mean([1, 2, 3, 4, 5, 6, 7, 8, 9, 100], 0.1)
+    5.5
+
+    Like ``trimmed_mean``, only the tails of long data are copied, and
+    short data is sorted. When passed an iterable of sequences, each inner
+    sequence represents a row of data, and ``winsorized_mean`` operates on
+    each column.
+
+    >>> data = [[1, 5], [2, 6], [3, 7], [40, 8]]
+    >>> winsorized_mean(data, 0.25)
+    [2.5, 6.5]
+
+    """
+    if not isinstance(data, (list, tuple, array.array)):
+        data = list(data)
+    columns = _columns(data)
+    if columns is not None:
+        return [winsorized_mean(column, proportion) for column in columns]
+    return v.div(_clipped_sum(data, _winsorize(data, proportion)), len(data))
+
+
 # Measures of spread (dispersion or variability)
 # ----------------------------------------------
 
+@v.columnar
 def average_deviation(data, m=None):
     """average_deviation(data [, m]) -> average absolute deviation of data.
 
@@ -316,7 +560,7 @@ def average_deviation(data, m=None):
 
     """
     if m is None:
-        if not isinstance(data, list):
+        if not isinstance(data, (list, array.array)):
             data = list(data)
         m = stats.mean(data)
     f = lambda x, m: abs(x-m)
@@ -327,6 +571,40 @@ def average_deviation(data, m=None):
     return v.div(total, count)
 
 
+@v.columnar
+def winsorized_variance(data, proportion):
+    """winsorized_variance(iterable_of_numbers, proportion) -> variance
+    winsorized_variance(iterable_of_rows, proportion) -> variances
+
+    Return the sample variance of the winsorized data, that is, after
+    replacing the given proportion of the items at each end of the sorted
+    data by the nearest remaining item. See ``winsorized_mean``.
+
+    >>> winsorized_variance([1, 2, 3, 4, 5, 6, 7, 8, 9, 100], 0.1)
+    7.388888888888889
+
+    When passed an iterable of sequences, each inner sequence represents a
+    row of data, and ``winsorized_variance`` operates on each column.
+
+    >>> data = [[1, 5], [2, 6], [3, 7], [40, 8]]
+    >>> winsorized_variance(data, 0.25)
+    [0.3333333333333333, 0.3333333333333333]
+
+    """
+    if not isinstance(data, (list, tuple, array.array)):
+        data = list(data)
+    columns = _columns(data)
+    if columns is not None:
+        return [winsorized_variance(column, proportion) for column in columns]
+    trim = _winsorize(data, proportion)
+    n = len(data)
+    m = v.div(_clipped_sum(data, trim), n)
+    def sq_dev(it):
+        return map(pow, map(operator.sub, it, itertools.repeat(m)),
+                   itertools.repeat(2))
+    return stats._variance_from(n, _clipped_sum(data, trim, sq_dev), 1)
+
+
 # Other moments of the data
 # -------------------------
 
@@ -348,6 +626,7 @@ def pearson_skewness(mean, mode, stdev):
         raise stats.StatsError("standard deviation cannot be negative")
 
 
+@v.columnar
 def pskewness(data, m=None, s=None):
     """pskewness(data [,m [,s]]) -> population skewness of data.
 
@@ -361,12 +640,17 @@ def pskewness(data, m=None, s=None):
 
     """
     n, total = stats._std_moment(data, m, s, 3)
+    return _pskewness_from(n, total)
+
+
+def _pskewness_from(n, total):
     assert n >= 0
     if n <= 1:
         raise StatsError('no skewness is defined for empty data')
     return v.div(total, n)
 
 
+@v.columnar
 def skewness(data, m=None, s=None):
     """skewness(data [,m [,s]]) -> sample skewness of data.
 
@@ -434,6 +718,10 @@ def skewness(data, m=None, s=None):
 
     """
     n, total = stats._std_moment(data, m, s, 3)
+    return _skewness_from(n, total)
+
+
+def _skewness_from(n, total):
     assert n >= 0
     if n < 3:
         raise StatsError('sample skewness requires at least three items')
@@ -442,6 +730,7 @@ def skewness(data, m=None, s=None):
     return v.mul(k, skew)
 
 
+@v.columnar
 def pkurtosis(data, m=None, s=None):
     """pkurtosis(data [,m [,s]]) -> population kurtosis of data.
 
@@ -459,6 +748,10 @@ def pkurtosis(data, m=None, s=None):
 
     """
     n, total = stats._std_moment(data, m, s, 4)
+    return _pkurtosis_from(n, total)
+
+
+def _pkurtosis_from(n, total):
     assert n >= 0
     assert total >= 1
     if n <= 1:
@@ -467,6 +760,7 @@ def pkurtosis(data, m=None, s=None):
     return v.sub(kurt, 3)
 
 
+@v.columnar
 def kurtosis(data, m=None, s=None):
     """kurtosis(data [,m [,s]]) -> sample excess kurtosis of data.
 
@@ -534,6 +828,12 @@ def kurtosis(data, m=None, s=None):
 
     """
     n, total = stats._std_moment(data, m, s, 4)
+    return _kurtosis_from(n, total, m is s is None)
+
+
+def _kurtosis_from(n, total, estimated=True):
+    # If estimated is true, the mean and standard deviation used for total
+    # were calculated from the data rather than supplied by the caller.
     assert n >= 0
     v.assert_(lambda x: x >= 1, total)
     if n < 4:
@@ -550,7 +850,7 @@ def kurtosis(data, m=None, s=None):
     kurt = v.mul(q, kurt)
     if v.isiterable(kurt): out_of_range = any(x < -2 for x in kurt)
     else: out_of_range = kurt < -2
-    if m is s is None:
+    if estimated:
         assert not out_of_range, 'kurtosis failed: %r' % kurt
         # This is a "should never happen" condition, hence an assertion.
     else:
@@ -645,6 +945,62 @@ def sterrkurtosis(n):
 
 # === Statistics of circular quantities ===
 
+CircularSummary = collections.namedtuple(
+    'CircularSummary', 'mean length variance stdev')
+CircularSummary.__doc__ = """Summary statistics of circular quantities.
+
+    mean        the mean direction
+    length      the mean resultant length R, between 0 (no preferred
+                direction) and 1 (all values the same)
+    variance    the circular variance 1 - R
+    stdev       the circular standard deviation sqrt(-2*ln R)
+    """
+
+
+def _circular_sums(data, deg, blocksize=4096):
+    """Return the number of items of data and the sums of their cosines
+    and sines.
+
+    >>> n, c, s = _circular_sums([0, 90, 180], True)
+    >>> n, round(c, 12), round(s, 12)
+    (3, 0.0, 1.0)
+
+    """
+    # The trig functions are applied in bulk with map, and the results
+    # summed with fsum, keeping the loop over the data in C. Iterators are
+    # read a block at a time. Sequences are read twice, rather than copied.
+    cos, sin, rad = math.cos, math.sin, math.radians
+    if isinstance(data, (list, tuple, array.array)):
+        blocks = [data]
+    else:
+        blocks = stats._blocks(data, blocksize)
+    n = 0
+    cosines, sines = [], []
+    for block in blocks:
+        n += len(block)
+        if deg:
+            c = math.fsum(map(cos, map(rad, block)))
+            s = math.fsum(map(sin, map(rad, block)))
+        else:
+            c = math.fsum(map(cos, block))
+            s = math.fsum(map(sin, block))
+        stats.add_partial(c, cosines)
+        stats.add_partial(s, sines)
+    return (n, math.fsum(cosines), math.fsum(sines))
+
+
+def _circular_summary(n, c, s, deg):
+    # Return the CircularSummary of n angles with sum of cosines c and sum
+    # of sines s.
+    r = min(math.hypot(c, s)/n, 1.0)  # Rounding may give r slightly > 1.
+    theta = math.atan2(s, c)  # Note the order is swapped.
+    sd = math.sqrt(2*math.log(1/r)) if r else float('inf')
+    if deg:
+        theta = math.degrees(theta)
+        sd = math.degrees(sd)
+    return CircularSummary(theta, r, 1 - r, sd)
+
+
 def circular_mean(data, deg=True):
     """Return the mean of circular quantities such as angles.
 
@@ -666,21 +1022,44 @@ def circular_mean(data, deg=True):
     ... circular_mean([pi/3, 2*pi-pi/6], False)  #doctest: +ELLIPSIS
     0.261799387799...
 
+    See also ``circular_summary``.
     """
-    ap = stats.add_partial
-    if deg:
-        data = (math.radians(theta) for theta in data)
-    n, cosines, sines = 0, [], []
-    for n, theta in enumerate(data, 1):
-        ap(math.cos(theta), cosines)
-        ap(math.sin(theta), sines)
+    n, c, s = _circular_sums(data, deg)
     if n == 0:
         raise stats.StatsError(
         'circular mean of empty sequence is not defined')
-    x = math.fsum(cosines)/n
-    y = math.fsum(sines)/n
-    theta = math.atan2(y, x)  # Note the order is swapped.
+    theta = math.atan2(s, c)  # Note the order is swapped.
     if deg:
         theta = math.degrees(theta)
     return theta
 
+
+def circular_summary(data, deg=True):
+    """Return the mean direction and spread of circular quantities.
+
+    The result is a ``CircularSummary`` of the mean direction, the mean
+    resultant length R, the circular variance 1 - R and the circular
+    standard deviation sqrt(-2*ln R), all calculated from the same sums of
+    the cosines and sines in a single pass over the data:
+
+    >>> result = circular_summary([350, 10, 20, 340])
+    >>> round(result.mean, 9), round(result.length, 3)
+    (0.0, 0.962)
+    >>> round(result.stdev, 2)
+    15.89
+
+    Optional argument deg is as for ``circular_mean``. If it is true (the
+    default), the mean and standard deviation are in degrees, otherwise in
+    radians. R is 1 if all the values are the same, and close to 0 if they
+    are spread evenly around the circle; the mean direction is then
+    meaningless, and the standard deviation infinite if R is 0.
+
+    The trigonometric functions are applied in bulk, so sequences and
+    arrays are processed at C speed. Iterators are read in blocks.
+    """
+    n, c, s = _circular_sums(data, deg)
+    if n == 0:
+        raise stats.StatsError(
+        'circular summary of empty sequence is not defined')
+    return _circular_summary(n, c, s, deg)
+
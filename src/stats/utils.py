@@ -15,6 +15,7 @@ import collections
 import functools
 import itertools
 import math
+import operator
 
 
 # === Exceptions ===
@@ -116,6 +117,48 @@ def _sum_prod_deviations(xydata, mx, my):
     return _generalised_sum(xydata, lambda t: (t[0]-mx)*(t[1]-my))
 
 
+def _select(data, k):
+    """Return the k-th smallest item of sequence data, counting from zero.
+
+    >>> _select([50, 10, 40, 20, 30], 1)
+    20
+
+    Selection takes linear time on average, rather than the O(N log N) of
+    sorting: pivots which bracket the k-th item are taken from a sorted
+    sample of the data, and only the items between them are copied for the
+    next round (Floyd and Rivest, 1975). Once 600 or fewer items remain,
+    they are sorted. The data itself is not modified.
+    """
+    n = len(data)
+    if not 0 <= k < n:
+        raise IndexError('selection index out of range')
+    while n > 600:
+        # Take an evenly spaced sample of about n**(2/3) items.
+        sample = sorted(data[::n//int(n**(2/3))])
+        size = len(sample)
+        rank = k*size//n
+        gap = int(2*math.sqrt(size)) + 1
+        lo = sample[max(rank - gap, 0)]
+        hi = sample[min(rank + gap, size - 1)]
+        # Count first, so that only the part holding the k-th item is copied.
+        below = sum(map(operator.lt, data, itertools.repeat(lo)))
+        upto = sum(map(operator.le, data, itertools.repeat(hi)))
+        if k < below:
+            data = [x for x in data if x < lo]
+        elif k < upto:
+            if lo == hi:
+                return lo
+            data = [x for x in data if lo <= x <= hi]
+            k -= below
+        else:
+            data = [x for x in data if x > hi]
+            k -= upto
+        if len(data) == n:
+            break  # No progress, e.g. because of NANs.
+        n = len(data)
+    return sorted(data)[k]
+
+
 def _validate_int(n):
     # This will raise TypeError, OverflowError (for infinities) or
     # ValueError (for NANs or non-integer numbers).
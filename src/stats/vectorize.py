@@ -5,11 +5,17 @@
 """Vectorized operations and functions.
 """
 
+import array
 import functools
 import itertools
 import math
 import operator
 
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 3.2 and older.
+    from collections import Mapping
+
 _abs = abs
 
 
@@ -26,6 +32,12 @@ def _is_numeric(obj):
         return True
 
 
+# Whether or not an object is iterable depends only on its type, so cache
+# the answer for each type seen. Numbers and strings are pre-loaded, as they
+# are by far the most common.
+_iterable_types = {int: False, float: False, complex: False, str: True,
+                   list: True, tuple: True, array.array: True}
+
 def isiterable(obj):
     """Return True if obj is an iterable, otherwise False.
 
@@ -35,12 +47,19 @@ def isiterable(obj):
     False
 
     """
+    t = type(obj)
+    try:
+        return _iterable_types[t]
+    except KeyError:
+        pass
     try:
         iter(obj)
     except TypeError:
-        return False
+        flag = False
     else:
-        return True
+        flag = True
+    _iterable_types[t] = flag
+    return flag
 
 
 def map_longest(func, *iterables, fillvalue=None):
@@ -97,6 +116,21 @@ def map_strict(func, *iterables, exception=None):
         yield func(*t)
 
 
+# Sequence types whose length is known in advance.
+_SIZED = (list, tuple, array.array)
+
+def _map_sized(func, *sequences):
+    """Return list(map_strict(func, *sequences)) for sequences of known size.
+
+    Checking the lengths up front lets the fast built-in map do the work.
+    """
+    n = len(sequences[0])
+    if any(len(seq) != n for seq in sequences):
+        # Let map_strict raise the appropriate exception.
+        return list(map_strict(func, *sequences))
+    return list(map(func, *sequences))
+
+
 def assert_(assertion, obj, message=None):
     if __debug__:
         if message is None:
@@ -157,13 +191,18 @@ def apply(func, x, *args, assertion=None, **kwargs):
     Note: if func also takes a keyword argument ``assertion``, it is shadowed
     by the keyword argument of the same name and cannot be supplied.
     """
-    f = functools.partial(func, **kwargs)
     if isiterable(x):
         # Vectorized function call.
-        x = tuple(x)
-        n = len(x)
-        args = [list(a) if isiterable(a) else [a]*n for a in args]
-        result = list(map_strict(f, x, *args))
+        f = functools.partial(func, **kwargs) if kwargs else func
+        if not args:
+            # Special case for speed: no arguments to broadcast or check.
+            result = list(map(f, x))
+        else:
+            if not isinstance(x, _SIZED):
+                x = tuple(x)
+            n = len(x)
+            args = [list(a) if isiterable(a) else [a]*n for a in args]
+            result = _map_sized(f, x, *args)
     else:
         # Scalar function call.
         result = func(x, *args, **kwargs)
@@ -176,6 +215,8 @@ def apply_op(op, x, y):
     """Return vectorized ``x op y``."""
     if isiterable(x):
         if isiterable(y):
+            if isinstance(x, _SIZED) and isinstance(y, _SIZED):
+                return _map_sized(op, x, y)
             result = map_strict(op, x, y)
         else:
             result = map(op, x, itertools.repeat(y))
@@ -202,6 +243,85 @@ sqr = lambda x: apply(lambda x: x*x, x)
 sqrt = lambda x: apply(math.sqrt, x)
 
 
+# === Column-major data ===
+
+
+class Columns(list):
+    """List of columns of data, for column-major input to the columnar
+    statistics functions.
+
+    Most statistics functions which operate on columns of data expect the
+    data to be given in rows. If the data is already stored by column, wrap
+    the list of columns in ``Columns`` and pass it instead:
+
+    >>> import stats
+    >>> stats.mean(Columns([[1, 2, 3], [4, 6, 8]]))
+    [2.0, 6.0]
+
+    Each column is processed in turn without transposing the data, and a
+    list of results is returned, the same as for the row-major data
+    [[1, 4], [2, 6], [3, 8]]. Columns need not all have the same length.
+
+    For named columns, use ``NamedColumns`` instead.
+    """
+    __slots__ = ()
+
+
+class NamedColumns(dict):
+    """Mapping of column names to columns of data, for column-major input
+    to the columnar statistics functions.
+
+    Like ``Columns``, but the columns are named, and a dict of results is
+    returned:
+
+    >>> import stats
+    >>> data = NamedColumns(a=[1, 2, 3], b=[4, 6, 8])
+    >>> stats.mean(data) == {'a': 2.0, 'b': 6.0}
+    True
+
+    Other mappings are not treated as columns of data.
+    """
+    __slots__ = ()
+
+
+def _column_arg(arg, key, i):
+    # Return the extra argument arg which applies to column key or i.
+    if isinstance(arg, Mapping):
+        return arg[key]
+    if isinstance(arg, (str, bytes)) or not isiterable(arg):
+        return arg
+    return arg[i]
+
+
+def columnar(func):
+    """Decorator adding column-major input to statistics function func.
+
+    func must take the data as the first argument. If the data is a
+    ``Columns`` or ``NamedColumns`` instance, func is called once for each
+    column, with any extra arguments which are sequences (or mappings)
+    replaced by their item for that column. Otherwise, func is called
+    unchanged.
+    """
+    @functools.wraps(func)
+    def inner(data, *args, **kwargs):
+        if isinstance(data, NamedColumns):
+            keys = list(data)
+        elif isinstance(data, Columns):
+            keys = range(len(data))
+        else:
+            return func(data, *args, **kwargs)
+        results = []
+        for i, key in enumerate(keys):
+            a = [_column_arg(arg, key, i) for arg in args]
+            kw = dict((name, _column_arg(arg, key, i))
+                      for name, arg in kwargs.items())
+            results.append(func(data[key], *a, **kw))
+        if isinstance(data, NamedColumns):
+            return dict(zip(keys, results))
+        return results
+    return inner
+
+
 # Low precision sum, but should work on anything that supports + operator.
 def sum(x, start=0):
     return functools.reduce(add, x, start)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+# Time the rank correlation functions over increasing numbers of (x,y)
+# pairs, to show that they scale as O(N*log N).
+#
+# Usage: python3 bench_rank_corr.py [MAXSIZE]
+#
+# Run from the src directory (or with src on PYTHONPATH). MAXSIZE defaults
+# to 10**7; each size is ten times the previous one, starting from 1000.
+
+import random
+import sys
+import time
+
+import stats.multivar
+
+
+def bench(func, xdata, ydata):
+    t = time.perf_counter()
+    func(xdata, ydata)
+    return time.perf_counter() - t
+
+
+def main(maxsize=10**7):
+    random.seed(20)
+    print('%10s %12s %12s %12s' % ('N', 'spearman', 'kendall', 'kendall/NlogN'))
+    n = 1000
+    while n <= maxsize:
+        xdata = [random.random() for _ in range(n)]
+        # Correlated y values, with some ties.
+        ydata = [round(x + random.gauss(0, 0.5), 3) for x in xdata]
+        ts = bench(stats.multivar.spearman, xdata, ydata)
+        tk = bench(stats.multivar.kendall, xdata, ydata)
+        # Time per N*log2(N) in nanoseconds; roughly constant if O(N*log N).
+        per = tk/(n*n.bit_length())*1e9
+        print('%10d %11.3fs %11.3fs %10.1fns' % (n, ts, tk, per))
+        n *= 10
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
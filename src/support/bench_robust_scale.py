@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+# Time the robust scale estimators qn, sn and mad over increasing numbers
+# of data points, to show that qn and sn scale as O(N*log N) and remain
+# practical for a million points.
+#
+# Usage: python3 bench_robust_scale.py [MAXSIZE]
+#
+# Run from the src directory (or with src on PYTHONPATH). MAXSIZE defaults
+# to 10**6; each size is ten times the previous one, starting from 1000.
+
+import random
+import sys
+import time
+
+import stats.order
+
+
+def bench(func, data):
+    t = time.perf_counter()
+    func(data)
+    return time.perf_counter() - t
+
+
+def main(maxsize=10**6):
+    random.seed(39)
+    print('%10s %10s %10s %10s %14s' % ('N', 'mad', 'sn', 'qn', 'qn/NlogN'))
+    n = 1000
+    while n <= maxsize:
+        data = [random.gauss(0, 1) for _ in range(n)]
+        tm = bench(stats.order.mad, data)
+        ts = bench(stats.order.sn, data)
+        tq = bench(stats.order.qn, data)
+        # Time per N*log2(N) in nanoseconds; roughly constant if O(N*log N).
+        per = tq/(n*n.bit_length())*1e9
+        print('%10d %9.3fs %9.3fs %9.3fs %12.1fns' % (n, tm, ts, tq, per))
+        n *= 10
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+# Micro-benchmarks for the vectorized operators in stats.vectorize.
+#
+# Usage: python3 bench_vectorize.py [SIZE [REPEAT]]
+#
+# Run from the src directory (or with src on PYTHONPATH). For each operator,
+# prints the best time per call (in microseconds) for scalar operands, and
+# for vectors of SIZE items (default 1000) held in lists and in arrays of
+# floats, both vector-vector and vector-scalar.
+
+import array
+import random
+import sys
+import timeit
+
+import stats.vectorize as v
+
+
+BINARY = ('add', 'sub', 'mul', 'div', 'pow')
+UNARY = ('abs', 'sqr', 'sqrt')
+
+
+def best(stmt, repeat, number):
+    t = min(timeit.repeat(stmt, repeat=repeat, number=number))
+    return t/number*1e6
+
+
+def main(size=1000, repeat=5):
+    random.seed(32)
+    xs = [random.uniform(0.5, 2.0) for _ in range(size)]
+    ys = [random.uniform(0.5, 2.0) for _ in range(size)]
+    xa = array.array('d', xs)
+    ya = array.array('d', ys)
+    number = max(1, 100000//size)
+    print('%-6s %10s %12s %12s %12s %12s' % (
+          'op', 'scalar', 'list,list', 'list,scalar',
+          'array,array', 'array,scalar'))
+    for name in BINARY:
+        op = getattr(v, name)
+        row = [best(lambda: op(1.5, 0.5), repeat, 10000),
+               best(lambda: op(xs, ys), repeat, number),
+               best(lambda: op(xs, 0.5), repeat, number),
+               best(lambda: op(xa, ya), repeat, number),
+               best(lambda: op(xa, 0.5), repeat, number),
+               ]
+        print('%-6s' % name + ''.join('%11.2fus' % t for t in row))
+    print()
+    print('%-6s %10s %12s %12s' % ('op', 'scalar', 'list', 'array'))
+    for name in UNARY:
+        op = getattr(v, name)
+        row = [best(lambda: op(1.5), repeat, 10000),
+               best(lambda: op(xs), repeat, number),
+               best(lambda: op(xa), repeat, number),
+               ]
+        print('%-6s' % name + ''.join('%11.2fus' % t for t in row))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])